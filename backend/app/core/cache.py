@@ -0,0 +1,281 @@
+import asyncio
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Tuple
+
+import orjson
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.schemas.ai_insights_schema import AIWeeklyInsights
+from app.utils.logger import logger
+
+# Pydantic models that survive a round trip through the cache as models
+# rather than plain dicts
+CACHEABLE_MODELS = {model.__name__: model for model in (AIWeeklyInsights,)}
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+
+def _encode_default(value):
+    if isinstance(value, BaseModel) and type(value).__name__ in CACHEABLE_MODELS:
+        return {"__model__": type(value).__name__, "data": value.model_dump(mode="json")}
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def _decode(value):
+    if isinstance(value, dict):
+        if "__model__" in value:
+            return CACHEABLE_MODELS[value["__model__"]](**value["data"])
+        return {key: _decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+def serialize(value: Any) -> bytes:
+    """
+    JSON-encodes a cache value. Dates and datetimes come back as ISO
+    strings; registered models (AIWeeklyInsights) come back as models.
+    """
+    return orjson.dumps(value, default=_encode_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def deserialize(raw: bytes) -> Any:
+    return _decode(orjson.loads(raw))
+
+
+class MemoryCache:
+    """
+    LRU with per-entry TTL in this process. Each worker has its own copy
+    and deletes are not seen by other workers.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        self.clear()
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_raw(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, raw = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return raw
+
+    def set_raw(self, key: str, raw: bytes, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, raw)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete_raw(self, key: str):
+        self._entries.pop(key, None)
+
+    async def get(self, key: str) -> Any:
+        raw = self.get_raw(key)
+        return None if raw is None else deserialize(raw)
+
+    async def set(self, key: str, value: Any, ttl: float):
+        self.set_raw(key, serialize(value), ttl)
+
+    async def delete(self, key: str):
+        self.delete_raw(key)
+
+
+class SharedMemoryCache:
+    """
+    Cache shared by the workers of one node: a SQLite file on a tmpfs
+    path (/dev/shm by default), so every process reads and writes the
+    same pages in memory. Deletes are immediately visible to all workers.
+
+    SQLite calls can wait up to a second on another worker's write lock,
+    so they run on a dedicated thread, one at a time, off the event loop.
+    """
+
+    PRUNE_EVERY = 500  # writes between expiry/size sweeps
+
+    def __init__(self, path: str, max_entries: int = 10_000):
+        self.path = path
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shm-cache")
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=1, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def start(self):
+        await self._run(lambda: self.conn)
+
+    async def close(self):
+        await self._run(self._close)
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _get(self, key: str) -> Optional[bytes]:
+        row = self.conn.execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def _set(self, key: str, raw: bytes, ttl: float):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, raw, time.time() + ttl)
+        )
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self._prune()
+
+    def _delete(self, key: str):
+        self.conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    async def get(self, key: str) -> Any:
+        raw = await self._run(self._get, key)
+        return None if raw is None else deserialize(raw)
+
+    async def set(self, key: str, value: Any, ttl: float):
+        await self._run(self._set, key, serialize(value), ttl)
+
+    async def delete(self, key: str):
+        await self._run(self._delete, key)
+
+    def _prune(self):
+        self.conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        self.conn.execute(
+            "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+
+class RedisCache:
+    """
+    Cache in a Redis-protocol server, shared by every worker and node.
+    Reads go through a short-lived local copy; deletes are published on
+    INVALIDATION_CHANNEL so the other workers drop their local copies
+    right away instead of waiting for CACHE_LOCAL_TTL_SECONDS.
+    """
+
+    def __init__(self, client, prefix: str = "cache:", local_ttl: float = 5, max_local_entries: int = 10_000):
+        self.client = client
+        self.prefix = prefix
+        self.local_ttl = local_ttl
+        self.local = MemoryCache(max_local_entries)
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self.local_ttl and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def close(self):
+        if self._listener:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        await self.local.close()
+
+    async def _listen(self):
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.local.delete_raw(message["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Local copies may be stale until we resubscribe; drop them
+                logger.warning(f"Cache invalidation listener failed: {e}")
+                self.local.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def get(self, key: str) -> Any:
+        raw = self.local.get_raw(key) if self.local_ttl else None
+        if raw is None:
+            raw = await self.client.get(self.prefix + key)
+            if raw is None:
+                return None
+            if self.local_ttl:
+                self.local.set_raw(key, raw, self.local_ttl)
+        return deserialize(raw)
+
+    async def set(self, key: str, value: Any, ttl: float):
+        raw = serialize(value)
+        await self.client.set(self.prefix + key, raw, px=max(1, int(ttl * 1000)))
+        if self.local_ttl:
+            self.local.set_raw(key, raw, min(ttl, self.local_ttl))
+
+    async def delete(self, key: str):
+        self.local.delete_raw(key)
+        await self.client.delete(self.prefix + key)
+        await self.client.publish(INVALIDATION_CHANNEL, key)
+
+
+def create_cache():
+    if settings.CACHE_BACKEND == "redis":
+        from app.core.redis import get_redis
+        return RedisCache(
+            get_redis(),
+            local_ttl=settings.CACHE_LOCAL_TTL_SECONDS,
+            max_local_entries=settings.CACHE_MAX_ENTRIES,
+        )
+    if settings.CACHE_BACKEND == "shm":
+        return SharedMemoryCache(settings.CACHE_SHM_PATH, settings.CACHE_MAX_ENTRIES)
+    return MemoryCache(settings.CACHE_MAX_ENTRIES)
+
+
+_cache = None
+
+
+def get_cache():
+    """
+    Process-wide cache for services and routers, created on first use.
+    Keys are plain strings; by convention "<namespace>:<user_id>:...".
+    """
+    global _cache
+    if _cache is None:
+        _cache = create_cache()
+    return _cache
+
+
+async def close_cache():
+    global _cache
+    if _cache is not None:
+        await _cache.close()
+        _cache = None
@@ -12,6 +12,95 @@ class Settings(BaseSettings):
     VERTEX_LOCATION: str = "us-central1"
     VERTEX_MODEL_NAME: str = "gemini-2.5-flash-lite"
 
+    # Startup warm-up (opt-in); /ready reports 503 until it finishes
+    WARMUP_ENABLED: bool = False
+    WARMUP_DB_CONNECTIONS: int = 5  # keep <= pool_size + max_overflow (15)
+    WARMUP_TIMEOUT_SECONDS: int = 60
+
+    # SQL instrumentation
+    SQL_ECHO: bool = True  # log every statement (very verbose)
+    SQL_SLOW_QUERY_MS: float = 200
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5  # identical statements per request before warning
+    SERVER_TIMING_ENABLED: bool = False  # dev only: exposes DB timings to clients
+
+    # Event-loop lag monitor (/metrics/event-loop)
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_MS: float = 50
+    LOOP_STALL_THRESHOLD_MS: float = 100
+
+    # On-demand request profiling (X-Profile: 1 + X-Profile-Token, or sampling)
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: str | None = None
+    PROFILING_SAMPLE_RATE: float = 0.0  # fraction of requests profiled automatically
+    PROFILING_INTERVAL_MS: float = 5
+    PROFILING_TRACEMALLOC_FRAMES: int = 25
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_PROFILES: int = 100
+
+    # Background account deletion
+    ACCOUNT_DELETION_BATCH_SIZE: int = 1000
+    ACCOUNT_DELETION_LEASE_SECONDS: int = 300  # a running job not renewed for this long is taken over
+    ACCOUNT_DELETION_MAX_ATTEMPTS: int = 5
+    ACCOUNT_DELETION_RETRY_BASE_SECONDS: int = 60  # doubled after every failed attempt
+    ACCOUNT_DELETION_SWEEP_SECONDS: int = 60
+
+    # Rows fetched per server-side cursor batch in /export
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Rows validated and inserted per transaction by CSV imports
+    IMPORT_CHUNK_SIZE: int = 500
+
+    # Shared Redis-protocol server for multi-worker deployments
+    REDIS_URL: str | None = None
+
+    # AI admission control: per-user token buckets + per-worker concurrency cap
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" or "redis"
+    AI_CHAT_RATE_BURST: int = 10
+    AI_CHAT_RATE_PER_MINUTE: float = 10
+    AI_INSIGHTS_RATE_BURST: int = 3
+    AI_INSIGHTS_RATE_PER_MINUTE: float = 1
+    AI_MAX_CONCURRENCY: int = 32
+
+    # Shared cache for trends, summaries and AI results
+    CACHE_BACKEND: str = "memory"  # "memory" (per process), "shm" (per node) or "redis"
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_SHM_PATH: str = "/dev/shm/myhealthsense-cache.sqlite3"
+    CACHE_LOCAL_TTL_SECONDS: float = 5  # per-worker copy of Redis entries
+    SUMMARY_CACHE_TTL_SECONDS: int = 300
+    AI_INSIGHTS_CACHE_TTL_SECONDS: int = 21600
+
+    # Weekly insights: Gemini JSON mode + targeted repair of missing fields
+    AI_STRUCTURED_OUTPUT: bool = True
+    AI_REPAIR_ATTEMPTS: int = 1
+
+    # Semantic cache of /ai/chat replies (per process)
+    CHAT_CACHE_ENABLED: bool = True
+    CHAT_CACHE_SIMILARITY: float = 0.85  # cosine similarity needed for a hit
+    CHAT_CACHE_TTL_SECONDS: int = 86400
+    CHAT_CACHE_MAX_ENTRIES: int = 5000
+
+    # /ai/chat/ws sessions
+    CHAT_WS_AUTH_TIMEOUT_SECONDS: float = 10
+    CHAT_WS_IDLE_TIMEOUT_SECONDS: float = 900
+    CHAT_WS_ACCOUNT_CHECK_SECONDS: float = 30  # how often a session re-checks that the account still exists
+
+    # chat_messages retention: monthly partitions + compressed archive
+    CHAT_RETENTION_ENABLED: bool = True
+    CHAT_RETENTION_INTERVAL_SECONDS: int = 21600
+    CHAT_RETENTION_DAYS: int = 180  # older months are archived; 0 keeps everything
+    CHAT_MAX_MESSAGES_PER_USER: int = 5000  # newest rows kept per user; 0 = no limit
+    CHAT_ARCHIVE_RETENTION_DAYS: int = 0  # 0 keeps archives forever
+    CHAT_ARCHIVE_CHUNK_MESSAGES: int = 1000  # messages per archive row
+    CHAT_PARTITION_MONTHS_AHEAD: int = 3
+
+    # Background AI insight jobs (/ai/weekly-summary/jobs)
+    AI_JOB_BACKEND: str = "memory"  # "memory" (in-process) or "redis"
+    AI_JOB_WORKERS: int = 4
+    AI_JOB_MAX_PENDING: int = 1000
+    AI_JOB_TTL_SECONDS: int = 3600  # how long job records and results are kept
+    AI_JOB_LEASE_SECONDS: int = 60  # Redis backend: a running job not renewed for this long is requeued
+
     model_config = {
         "env_file": ".env",
         "env_file_encoding": "utf-8"
@@ -7,7 +7,7 @@ DATABASE_URL = settings.DATABASE_URL
 # Create async engine
 engine = create_async_engine(
     DATABASE_URL,
-    echo=True,
+    echo=settings.SQL_ECHO,
     future=True
 )
 
@@ -1,4 +1,4 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -6,10 +6,23 @@ from sqlalchemy import select
 from app.core.database import get_db
 from app.core.security import decode_access_token
 from app.models.user_model import User
+from app.services.ai_service import AIService
 
 security = HTTPBearer()
 
 
+async def get_active_user(db: AsyncSession, user_id: int) -> User | None:
+    """The user, unless the account does not exist or is being deleted"""
+    result = await db.execute(
+        select(User).where(User.id == user_id)
+    )
+    user = result.scalar_one_or_none()
+
+    if not user or user.deleted_at is not None:
+        return None
+    return user
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
@@ -24,11 +37,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    result = await db.execute(
-        select(User).where(User.id == int(user_id))
-    )
-    user = result.scalar_one_or_none()
-
+    user = await get_active_user(db, int(user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -37,3 +46,14 @@ async def get_current_user(
         )
 
     return user
+
+
+def get_ai_service(request: Request) -> AIService:
+    """
+    Shared AI client stored on the app. Created by the lifespan hook;
+    created here on demand when the app runs without lifespan events.
+    """
+    service = getattr(request.app.state, "ai_service", None)
+    if service is None:
+        service = request.app.state.ai_service = AIService()
+    return service
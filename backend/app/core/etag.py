@@ -0,0 +1,42 @@
+from typing import Optional
+from fastapi import Request, Response
+from app.models.user_model import User
+
+
+def user_etag(user: User, scope: str, *extra) -> str:
+    """
+    Weak ETag derived from the user's change counter. `data_version` is
+    loaded with the user during authentication, so building the tag costs
+    no extra query.
+    """
+    parts = [scope, str(user.id), str(user.data_version or 0), *map(str, extra)]
+    return f'W/"{"-".join(parts)}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(_opaque(candidate) == _opaque(etag) for candidate in header.split(","))
+
+
+def check_not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    Returns a 304 response when the client already has `etag`,
+    otherwise None and the route builds the full response.
+    """
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=etag_headers(etag))
+    return None
+
+
+def etag_headers(etag: str) -> dict:
+    # no-cache: browsers may store the body but must revalidate each time
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
@@ -0,0 +1,131 @@
+import asyncio
+import bisect
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from app.utils.logger import logger
+
+# Histogram upper bounds (ms); the last bucket is +Inf
+LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LoopMonitor:
+    """
+    Measures event-loop lag continuously: a task sleeps for `interval_ms`
+    and records how late it wakes up. A watchdog thread notices when the
+    loop stops ticking and grabs the loop thread's stack and the task
+    that is running, so a stall over `threshold_ms` is recorded with the
+    code that caused it (a blocking call such as bcrypt or a synchronous
+    model request).
+    """
+
+    def __init__(self, interval_ms: float = 50, threshold_ms: float = 100, max_stalls: int = 50):
+        self.interval = interval_ms / 1000
+        self.threshold_ms = threshold_ms
+        self.counts = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self.samples = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.stall_count = 0
+        self.stalls: deque = deque(maxlen=max_stalls)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._beat = time.monotonic()
+        self._captured: Optional[Dict] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = self._loop.create_task(self._measure(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        if self._watchdog:
+            self._watchdog.join()
+
+    async def _measure(self):
+        while True:
+            started = self._loop.time()
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (self._loop.time() - started - self.interval) * 1000)
+            self._beat = time.monotonic()
+            self._record(lag_ms)
+
+    def _record(self, lag_ms: float):
+        self.samples += 1
+        self.total_ms += lag_ms
+        self.max_ms = max(self.max_ms, lag_ms)
+        self.counts[bisect.bisect_left(LAG_BUCKETS_MS, lag_ms)] += 1
+
+        captured, self._captured = self._captured, None
+        if lag_ms < self.threshold_ms:
+            return
+
+        stall = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(lag_ms, 1),
+            **(captured or {"task": None, "coroutine": None, "stack": []}),
+        }
+        self.stall_count += 1
+        self.stalls.append(stall)
+        logger.warning(
+            f"Event loop blocked for {lag_ms:.0f}ms in task {stall['task']} "
+            f"({stall['coroutine']}):\n" + "".join(stall["stack"][-8:])
+        )
+
+    def _watch(self):
+        # Runs in its own thread, so it keeps going while the loop is stuck
+        while not self._stop.wait(self.interval / 2):
+            behind_ms = (time.monotonic() - self._beat - self.interval) * 1000
+            if behind_ms < self.threshold_ms or self._captured is not None:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread)
+            task = asyncio.current_task(self._loop)
+            coro = task.get_coro() if task else None
+            self._captured = {
+                "task": task.get_name() if task else None,
+                "coroutine": getattr(coro, "__qualname__", None),
+                "stack": traceback.format_stack(frame) if frame else [],
+            }
+
+    def snapshot(self, include_stacks: bool = True) -> Dict:
+        """
+        Lag histogram (cumulative, Prometheus-style `le` buckets) plus
+        summary numbers and the most recent stalls.
+        """
+        histogram, running = {}, 0
+        for bound, count in zip(LAG_BUCKETS_MS + ("+Inf",), self.counts):
+            running += count
+            histogram[str(bound)] = running
+
+        stalls = list(self.stalls)
+        if not include_stacks:
+            stalls = [{k: v for k, v in stall.items() if k != "stack"} for stall in stalls]
+
+        return {
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold_ms,
+            "samples": self.samples,
+            "mean_lag_ms": round(self.total_ms / self.samples, 3) if self.samples else 0.0,
+            "max_lag_ms": round(self.max_ms, 3),
+            "histogram_ms": histogram,
+            "stall_count": self.stall_count,
+            "stalls": stalls,
+        }
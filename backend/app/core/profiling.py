@@ -0,0 +1,176 @@
+import hmac
+import json
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+from fastapi import Header, HTTPException, Request, status
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.config import settings
+from app.utils.logger import logger
+
+PROFILE_KINDS = {"cpu": "cpu.folded", "mem": "mem.folded", "meta": "json"}
+
+# tracemalloc and the sampler are process-wide: one profile at a time
+_profile_lock = threading.Lock()
+
+
+def profiling_token_valid(token: Optional[str]) -> bool:
+    return bool(settings.PROFILING_TOKEN and token) and hmac.compare_digest(token, settings.PROFILING_TOKEN)
+
+
+async def require_profiling_token(x_profile_token: Optional[str] = Header(None)):
+    if not profiling_token_valid(x_profile_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid profiling token")
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack every `interval` seconds from a
+    background thread and counts identical stacks. The event loop thread
+    serves every in-flight request, so concurrent requests show up too.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+
+def _folded(counts) -> str:
+    """
+    Collapsed-stack lines ("root;child;leaf weight"), the input format of
+    flamegraph.pl, inferno and speedscope.
+    """
+    return "".join(f"{stack} {weight}\n" for stack, weight in counts.most_common())
+
+
+def _allocation_stacks(snapshot: tracemalloc.Snapshot) -> Counter:
+    stacks: Counter = Counter()
+    for stat in snapshot.statistics("traceback"):
+        # Traceback frames are ordered oldest first
+        stack = ";".join(f"{os.path.basename(f.filename)}:{f.lineno}" for f in stat.traceback)
+        stacks[stack] += stat.size
+    return stacks
+
+
+def profile_path(profile_id: str, kind: str) -> Path:
+    return Path(settings.PROFILING_DIR) / f"{profile_id}.{PROFILE_KINDS[kind]}"
+
+
+def _prune_profiles():
+    metas = sorted(Path(settings.PROFILING_DIR).glob("*.json"), key=lambda p: p.stat().st_mtime)
+    for meta in metas[:max(0, len(metas) - settings.PROFILING_MAX_PROFILES)]:
+        profile_id = meta.name[:-len(".json")]
+        for kind in PROFILE_KINDS:
+            profile_path(profile_id, kind).unlink(missing_ok=True)
+
+
+def list_profiles() -> list:
+    directory = Path(settings.PROFILING_DIR)
+    if not directory.exists():
+        return []
+    metas = sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    return [json.loads(meta.read_text()) for meta in metas]
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """
+    Profiles a request when it carries `X-Profile: 1` with a valid
+    `X-Profile-Token`, or when it falls in the PROFILING_SAMPLE_RATE
+    sample. Writes a CPU flamegraph (sampled stacks of the event loop
+    thread), an allocation flamegraph (live tracemalloc blocks allocated
+    during the request, weighted by bytes) and a metadata file, and
+    returns the id in `X-Profile-Id`.
+
+    Only installed when PROFILING_ENABLED is set, so there is no cost
+    otherwise.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        requested = request.headers.get("x-profile") == "1" and profiling_token_valid(
+            request.headers.get("x-profile-token")
+        )
+        sampled = settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE
+
+        if not (requested or sampled) or not _profile_lock.acquire(blocking=False):
+            return await call_next(request)
+
+        try:
+            return await self._profile(request, call_next, "header" if requested else "sample")
+        finally:
+            _profile_lock.release()
+
+    async def _profile(self, request: Request, call_next, trigger: str):
+        profile_id = uuid.uuid4().hex
+        sampler = StackSampler(threading.get_ident(), settings.PROFILING_INTERVAL_MS / 1000)
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(settings.PROFILING_TRACEMALLOC_FRAMES)
+
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            response = await call_next(request)
+        finally:
+            sampler.stop()
+            duration_ms = (time.perf_counter() - started) * 1000
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+
+        try:
+            os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+            profile_path(profile_id, "cpu").write_text(_folded(sampler.stacks))
+            profile_path(profile_id, "mem").write_text(_folded(_allocation_stacks(snapshot)))
+            profile_path(profile_id, "meta").write_text(json.dumps({
+                "id": profile_id,
+                "method": request.method,
+                "path": request.url.path,
+                "status_code": response.status_code,
+                "trigger": trigger,
+                "duration_ms": round(duration_ms, 2),
+                "cpu_samples": sum(sampler.stacks.values()),
+                "peak_traced_bytes": peak,
+                "created_at": time.time(),
+            }))
+            _prune_profiles()
+        except OSError as e:
+            logger.warning(f"Could not store profile {profile_id}: {e}")
+            return response
+
+        logger.info(f"Profiled {request.method} {request.url.path} ({trigger}) → {profile_id}")
+        response.headers["X-Profile-Id"] = profile_id
+        return response
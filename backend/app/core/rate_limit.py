@@ -0,0 +1,162 @@
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+
+from app.core.config import settings
+from app.core.dependencies import get_current_user
+from app.models.user_model import User
+
+# Per-endpoint bucket settings: (burst capacity, refill tokens per minute)
+RATE_LIMITS = {
+    "ai_chat": (settings.AI_CHAT_RATE_BURST, settings.AI_CHAT_RATE_PER_MINUTE),
+    "ai_insights": (settings.AI_INSIGHTS_RATE_BURST, settings.AI_INSIGHTS_RATE_PER_MINUTE),
+}
+
+
+class InMemoryRateLimiter:
+    """
+    Token buckets kept in this process. Fine for a single worker; with
+    several workers each one enforces its own limits.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def acquire(self, key: str, capacity: int, per_second: float) -> Tuple[bool, float]:
+        """
+        Takes one token from `key`'s bucket. Returns (allowed, retry_after
+        seconds until a token is available).
+        """
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * per_second)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        return allowed, 0.0 if allowed else (1 - tokens) / per_second
+
+
+# Refill, take and store atomically; time comes from the Redis server so
+# workers with skewed clocks share one view of the bucket.
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(data[1]) or capacity
+local ts = tonumber(data[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local allowed = 0
+local retry = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return {allowed, tostring(retry)}
+"""
+
+
+class RedisRateLimiter:
+    """
+    Token buckets stored in Redis, shared by every worker and node.
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.prefix = prefix
+        self._script = client.register_script(TOKEN_BUCKET_LUA)
+
+    async def acquire(self, key: str, capacity: int, per_second: float) -> Tuple[bool, float]:
+        allowed, retry_after = await self._script(keys=[self.prefix + key], args=[capacity, per_second])
+        return bool(allowed), float(retry_after)
+
+
+def create_rate_limiter():
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        from app.core.redis import get_redis
+        return RedisRateLimiter(get_redis())
+    return InMemoryRateLimiter()
+
+
+def get_rate_limiter(request: Request):
+    limiter = getattr(request.app.state, "rate_limiter", None)
+    if limiter is None:
+        limiter = request.app.state.rate_limiter = create_rate_limiter()
+    return limiter
+
+
+def rate_limit(endpoint: str):
+    """
+    Dependency enforcing the per-user token bucket for `endpoint`.
+    Rejected requests get 429 with a Retry-After header.
+    """
+    capacity, per_minute = RATE_LIMITS[endpoint]
+
+    async def dependency(
+        request: Request,
+        current_user: User = Depends(get_current_user)
+    ):
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        limiter = get_rate_limiter(request)
+        allowed, retry_after = await limiter.acquire(
+            f"{endpoint}:{current_user.id}", capacity, per_minute / 60
+        )
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please slow down",
+                headers={"Retry-After": str(max(1, round(retry_after)))},
+            )
+
+    return dependency
+
+
+_in_flight = 0
+
+
+def try_acquire_ai_slot() -> bool:
+    global _in_flight
+    if _in_flight >= settings.AI_MAX_CONCURRENCY:
+        return False
+    _in_flight += 1
+    return True
+
+
+def release_ai_slot():
+    global _in_flight
+    _in_flight -= 1
+
+
+async def ai_concurrency_slot():
+    """
+    Global cap on concurrent AI requests in this worker. Over the cap the
+    request is shed with 503 right away instead of queueing behind slow
+    model calls.
+    """
+    if not try_acquire_ai_slot():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI service is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    try:
+        yield
+    finally:
+        release_ai_slot()
@@ -0,0 +1,33 @@
+from app.core.config import settings
+
+_client = None
+
+
+def get_redis():
+    """
+    Shared async Redis client for REDIS_URL, created on first use.
+    Any Redis-protocol server works (Redis, Valkey, KeyDB, ...). The
+    `redis` package is only needed when a Redis backend is configured.
+    """
+    global _client
+    if _client is None:
+        if not settings.REDIS_URL:
+            raise RuntimeError("REDIS_URL must be set to use a Redis backend")
+        if settings.REDIS_URL.startswith("fakeredis://"):
+            # In-process stand-in for tests and local runs (pip install fakeredis[lua])
+            import fakeredis
+            _client = fakeredis.FakeAsyncRedis()
+            return _client
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("The 'redis' package is required for Redis backends") from e
+        _client = redis.from_url(settings.REDIS_URL)
+    return _client
+
+
+async def close_redis():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,26 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONModelResponse(JSONResponse):
+    """
+    Pre-built orjson response for data that would otherwise go through a
+    `response_model`. Produces the same bytes FastAPI does: compact JSON,
+    UTF-8 text and UTC datetimes rendered with a "Z" suffix (Pydantic v2).
+    """
+
+    orjson_option = orjson.OPT_UTC_Z
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=self.orjson_option)
+
+
+class ORJSONEncodedResponse(ORJSONModelResponse):
+    """
+    Same as ORJSONModelResponse, but matches `jsonable_encoder` output for
+    routes without a response model: datetimes use `isoformat()` ("+00:00").
+    """
+
+    orjson_option = 0
@@ -24,17 +24,21 @@ def create_access_token(subject: str) -> str:
     )
 
 
-def decode_access_token(token: str) -> str | None:
+def decode_access_claims(token: str) -> dict | None:
     try:
-        payload = jwt.decode(
+        return jwt.decode(
             token,
             settings.SECRET_KEY,
             algorithms=[settings.ALGORITHM]
         )
-        return payload.get("sub")
     except JWTError:
         return None
 
+
+def decode_access_token(token: str) -> str | None:
+    payload = decode_access_claims(token)
+    return payload.get("sub") if payload else None
+
 pwd_context = CryptContext(
     schemes=["bcrypt"],
     deprecated="auto"
@@ -74,7 +78,7 @@ async def get_current_user(
     result = await db.execute(select(User).where(User.id == int(user_id)))
     user = result.scalar_one_or_none()
 
-    if not user:
+    if not user or user.deleted_at is not None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
@@ -0,0 +1,119 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.config import settings
+from app.utils.logger import logger
+
+
+class RequestSQLStats:
+    """
+    SQL statements executed while serving one request.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list:
+        """
+        (statement, times) for statements run at least `threshold` times,
+        the usual signature of an N+1 query pattern.
+        """
+        return [(stmt, n) for stmt, n in self.statements.most_common() if n >= threshold]
+
+
+_current_stats: ContextVar[Optional[RequestSQLStats]] = ContextVar("sql_stats", default=None)
+
+
+def redact_parameters(parameters, executemany: bool = False) -> str:
+    """
+    Parameter shapes without values: names (or positions) and types only,
+    so slow-query logs never contain user data.
+    """
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: <{type(value).__name__}>" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(f"<{type(value).__name__}>" for value in parameters) + ")"
+    return "<redacted>"
+
+
+def _one_line(statement: str, limit: int = 500) -> str:
+    text = " ".join(statement.split())
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def instrument_engine(engine):
+    """
+    Hooks cursor execution on `engine` to time every statement, add it to
+    the current request's stats and log slow ones.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._sql_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - context._sql_started) * 1000
+
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed_ms)
+
+        if elapsed_ms >= settings.SQL_SLOW_QUERY_MS:
+            logger.warning(
+                f"Slow SQL ({elapsed_ms:.1f}ms): {_one_line(statement)} "
+                f"params={redact_parameters(parameters, executemany)}"
+            )
+
+
+class SQLStatsMiddleware(BaseHTTPMiddleware):
+    """
+    Attributes query count and DB time to each request, logs them, warns
+    about repeated identical statements and, when enabled (dev), reports
+    them in a Server-Timing header.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        stats = RequestSQLStats()
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            _current_stats.reset(token)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        if stats.count:
+            logger.info(
+                f"{request.method} {request.url.path} - {stats.count} queries, "
+                f"{stats.total_ms:.1f}ms DB / {total_ms:.1f}ms total"
+            )
+            for statement, times in stats.repeated(settings.SQL_N_PLUS_ONE_THRESHOLD):
+                logger.warning(
+                    f"Possible N+1 in {request.method} {request.url.path}: "
+                    f"{times}x {_one_line(statement, 200)}"
+                )
+
+        if settings.SERVER_TIMING_ENABLED:
+            response.headers["Server-Timing"] = (
+                f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries", '
+                f"app;dur={total_ms:.1f}"
+            )
+
+        return response
@@ -0,0 +1,84 @@
+import asyncio
+import time
+from fastapi import FastAPI
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import engine
+from app.models.user_model import User
+from app.models.diet_model import Diet
+from app.models.symptom_model import Symptom
+from app.models.medication_model import Medication
+from app.models.lifestyle_model import Lifestyle
+from app.schemas.diet_schema import DietResponse
+from app.schemas.symptom_schema import SymptomResponse
+from app.schemas.medication_schema import MedicationResponse
+from app.schemas.lifestyle_schema import LifestyleResponse
+from app.repository.repository import fetch_user_rows
+from app.routers.health_router import weekly_summary
+from app.services.chat_memory_service import get_recent_messages
+from app.utils.logger import logger
+
+# No real user has this id; queries return nothing but get prepared
+WARMUP_USER_ID = -1
+
+
+async def _prime_connection(ready: asyncio.Event, opened: list, target: int):
+    """
+    Opens one pool connection and runs every hot query on it once so
+    asyncpg caches the prepared statements for that connection. The
+    connection is held until all `target` connections are open, which
+    forces the pool to create distinct connections instead of reusing one.
+    """
+    try:
+        async with engine.connect() as conn:
+            async with AsyncSession(bind=conn) as db:
+                await db.execute(select(User).where(User.id == WARMUP_USER_ID))
+                await fetch_user_rows(db, Diet, DietResponse, WARMUP_USER_ID)
+                await fetch_user_rows(db, Symptom, SymptomResponse, WARMUP_USER_ID)
+                await fetch_user_rows(db, Medication, MedicationResponse, WARMUP_USER_ID)
+                await fetch_user_rows(db, Lifestyle, LifestyleResponse, WARMUP_USER_ID)
+                await weekly_summary(db=db, current_user=User(id=WARMUP_USER_ID))
+                await get_recent_messages(db, WARMUP_USER_ID)
+
+            opened.append(conn)
+            if len(opened) >= target:
+                ready.set()
+            await ready.wait()
+    except Exception:
+        # Release the connections already held instead of waiting forever
+        ready.set()
+        raise
+
+
+async def warm_up_database(connections: int):
+    ready, opened = asyncio.Event(), []
+    await asyncio.gather(*(
+        _prime_connection(ready, opened, connections) for _ in range(connections)
+    ))
+
+
+async def warm_up(app: FastAPI):
+    """
+    Pre-opens pool connections (waking the Neon compute), primes the hot
+    queries on each and initializes the AI client. Failures are logged and
+    do not block readiness; the first requests then pay the cost instead.
+    """
+    start = time.perf_counter()
+
+    try:
+        await asyncio.wait_for(
+            warm_up_database(settings.WARMUP_DB_CONNECTIONS),
+            timeout=settings.WARMUP_TIMEOUT_SECONDS
+        )
+    except Exception as e:
+        logger.warning(f"Database warm-up failed: {e}")
+
+    try:
+        # Imports the Vertex SDK and builds the model; blocking, so off the loop
+        await asyncio.to_thread(lambda: app.state.ai_service.model)
+    except Exception as e:
+        logger.warning(f"AI client warm-up failed: {e}")
+
+    app.state.ready = True
+    logger.info(f"Warm-up finished in {(time.perf_counter() - start) * 1000:.0f}ms")
@@ -6,6 +6,9 @@ from app.models.diet_model import Diet
 from app.models.lifestyle_model import Lifestyle
 from app.models.user_model import User
 from app.models.chat_message_model import ChatMessage
+from app.models.chat_message_archive_model import ChatMessageArchive
+from app.models.account_deletion_job_model import AccountDeletionJob
+from app.migrate import migrate
 
 async def create_tables():
     print("🔄 Dropping existing tables...")
@@ -18,5 +21,8 @@ async def create_tables():
 
     print("✅ Tables created successfully!")
 
+    # Indexes and extensions that live outside the models
+    await migrate()
+
 if __name__ == "__main__":
     asyncio.run(create_tables())
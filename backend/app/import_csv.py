@@ -0,0 +1,33 @@
+import argparse
+import asyncio
+import json
+from sqlalchemy import select
+from app.core.database import AsyncSessionLocal
+from app.models.user_model import User
+from app.services.import_service import IMPORT_TYPES, import_csv
+
+
+async def run_import(email: str, kind: str, path: str, column_map: dict | None):
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User.id).where(User.email == email))
+        user_id = result.scalar_one_or_none()
+        if user_id is None:
+            raise SystemExit(f"❌ No user with email {email}")
+
+        with open(path, encoding="utf-8-sig", newline="") as source:
+            report = await import_csv(db, user_id, kind, source, column_map)
+
+    print(f"✅ Imported {report['imported']} {kind} rows ({report['failed']} failed)")
+    for error in report["errors"]:
+        print(f"  line {error['line']}: {error['error']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import historical health logs from CSV")
+    parser.add_argument("email")
+    parser.add_argument("kind", choices=sorted(IMPORT_TYPES))
+    parser.add_argument("path")
+    parser.add_argument("--column-map", default=None, help="JSON object mapping CSV headers to fields")
+    args = parser.parse_args()
+
+    mapping = json.loads(args.column_map) if args.column_map else None
+    asyncio.run(run_import(args.email, args.kind, args.path, mapping))
@@ -1,12 +1,73 @@
-from fastapi import FastAPI, Depends
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, Depends, Header
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from app.routers import symptom_router, medication_router, diet_router, lifestyle_router, auth_router, health_router, insights_router, ai_insights_router, ai_chat_router
-from app.core.database import get_db
+from app.routers import symptom_router, medication_router, diet_router, lifestyle_router, auth_router, health_router, insights_router, ai_insights_router, ai_chat_router, sync_router, export_router, import_router, search_router, profiling_router
+from app.core.config import settings
+from app.core.database import get_db, engine
+from app.core.warmup import warm_up
+from app.core.sql_instrumentation import instrument_engine, SQLStatsMiddleware
+from app.core.profiling import ProfilingMiddleware, profiling_token_valid
+from app.core.loop_monitor import LoopMonitor
+from app.core.rate_limit import create_rate_limiter
+from app.core.redis import close_redis
+from app.core.cache import get_cache, close_cache
+from app.services.account_deletion_service import run_deletion_sweeper
+from app.services.chat_retention_service import run_retention_loop
+from app.services.ai_job_service import create_job_queue
+from app.services.chat_cache_service import get_chat_cache
+from app.services.ai_service import AIService
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Single shared AI client; the model itself is created on first use
+    if getattr(app.state, "ai_service", None) is None:
+        app.state.ai_service = AIService()
+    app.state.rate_limiter = create_rate_limiter()
+    await get_cache().start()
+
+    app.state.loop_monitor = None
+    if settings.LOOP_MONITOR_ENABLED:
+        app.state.loop_monitor = LoopMonitor(settings.LOOP_MONITOR_INTERVAL_MS, settings.LOOP_STALL_THRESHOLD_MS)
+        app.state.loop_monitor.start()
+    app.state.ai_jobs = create_job_queue()
+    app.state.ai_jobs.start(app.state.ai_service, settings.AI_JOB_WORKERS)
+
+    # Serve /health right away; /ready flips once warm-up is done
+    app.state.ready = not settings.WARMUP_ENABLED
+    warmup_task = asyncio.create_task(warm_up(app)) if settings.WARMUP_ENABLED else None
+
+    deletion_task = asyncio.create_task(run_deletion_sweeper())
+    retention_task = asyncio.create_task(run_retention_loop()) if settings.CHAT_RETENTION_ENABLED else None
+
+    yield
+
+    if warmup_task:
+        warmup_task.cancel()
+    deletion_task.cancel()
+    if retention_task:
+        retention_task.cancel()
+    await app.state.ai_jobs.stop()
+    if app.state.loop_monitor:
+        await app.state.loop_monitor.stop()
+    await close_cache()
+    await close_redis()
+    await engine.dispose()
 
 # Initialize FastAPI app
-app = FastAPI(title="EMBRACE")
+app = FastAPI(title="EMBRACE", lifespan=lifespan)
+
+instrument_engine(engine)
+app.add_middleware(SQLStatsMiddleware)
+
+# Not installed at all unless enabled, so it costs nothing by default
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
 
 # Add CORS middleware
 app.add_middleware(
@@ -15,6 +76,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing", "X-Profile-Id"],
 )
 
 # Include your routers
@@ -27,11 +89,45 @@ app.include_router(health_router.router)
 app.include_router(insights_router.router)
 app.include_router(ai_insights_router.router)
 app.include_router(ai_chat_router.router)
+app.include_router(sync_router.router)
+app.include_router(export_router.router)
+app.include_router(import_router.router)
+app.include_router(search_router.router)
+
+if settings.PROFILING_ENABLED:
+    app.include_router(profiling_router.router)
 
 @app.get("/health")
 def root():
     return {"message": "MyHealthSense backend is running 🚀"}
 
+@app.get("/ready")
+def ready():
+    """
+    Readiness probe for the load balancer. Returns 503 until the
+    startup warm-up (when enabled) has finished.
+    """
+    if not getattr(app.state, "ready", True):
+        return JSONResponse(status_code=503, content={"status": "warming up"})
+    return {"status": "ready"}
+
+@app.get("/metrics/event-loop")
+def event_loop_metrics(x_profile_token: Optional[str] = Header(None)):
+    """
+    Event-loop lag histogram and recent stalls for this worker. The
+    blocking stacks are only included with a valid X-Profile-Token, as
+    for /debug/profiles; they are always in the logs.
+    """
+    monitor = getattr(app.state, "loop_monitor", None)
+    if monitor is None:
+        return JSONResponse(status_code=404, content={"detail": "Loop monitor is disabled"})
+    return monitor.snapshot(include_stacks=profiling_token_valid(x_profile_token))
+
+@app.get("/metrics/chat-cache")
+def chat_cache_metrics():
+    """Hit rate and size of this worker's semantic chat cache"""
+    return get_chat_cache().stats()
+
 @app.get("/ping-db")
 async def ping_db(db: AsyncSession = Depends(get_db)):
     """
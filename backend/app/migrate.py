@@ -0,0 +1,73 @@
+import asyncio
+from sqlalchemy import text
+from app.core.database import Base, engine
+from app.models.account_deletion_job_model import AccountDeletionJob
+from app.models.chat_message_model import ChatMessage
+from app.models.chat_message_archive_model import ChatMessageArchive
+from app.services.chat_retention_service import PRE_PARTITIONING_SQL, partition_statements
+from app.services.search_service import search_index_statements
+
+# Idempotent schema changes for databases created before the matching
+# model change. New databases get everything from create_tables.py.
+MIGRATIONS = [
+    # Per-user change counter used for ETags
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS data_version INTEGER NOT NULL DEFAULT 0",
+
+    # Delta sync: updated_at, tombstones and per-row change counter
+    "ALTER TABLE diets ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT now()",
+    "ALTER TABLE diets ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ",
+    "ALTER TABLE diets ADD COLUMN IF NOT EXISTS change_version INTEGER NOT NULL DEFAULT 0",
+    "CREATE INDEX IF NOT EXISTS ix_diets_user_change_version ON diets (user_id, change_version)",
+    "ALTER TABLE symptoms ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT now()",
+    "ALTER TABLE symptoms ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ",
+    "ALTER TABLE symptoms ADD COLUMN IF NOT EXISTS change_version INTEGER NOT NULL DEFAULT 0",
+    "CREATE INDEX IF NOT EXISTS ix_symptoms_user_change_version ON symptoms (user_id, change_version)",
+    "ALTER TABLE medications ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT now()",
+    "ALTER TABLE medications ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ",
+    "ALTER TABLE medications ADD COLUMN IF NOT EXISTS change_version INTEGER NOT NULL DEFAULT 0",
+    "CREATE INDEX IF NOT EXISTS ix_medications_user_change_version ON medications (user_id, change_version)",
+    "ALTER TABLE lifestyles ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT now()",
+    "ALTER TABLE lifestyles ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ",
+    "ALTER TABLE lifestyles ADD COLUMN IF NOT EXISTS change_version INTEGER NOT NULL DEFAULT 0",
+    "CREATE INDEX IF NOT EXISTS ix_lifestyles_user_change_version ON lifestyles (user_id, change_version)",
+
+    # Background account deletion
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ",
+    "ALTER TABLE account_deletion_jobs ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMPTZ",
+    "ALTER TABLE account_deletion_jobs ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE account_deletion_jobs ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMPTZ",
+
+    # Monthly partitions of chat_messages; copies an unpartitioned table over
+    *partition_statements(),
+
+    # Full-text (tsvector) and trigram indexes for /search
+    *search_index_statements(),
+]
+
+# Run before NEW_TABLES are created
+PRE_MIGRATIONS = [
+    # Moves an unpartitioned chat_messages aside for the partitioned one
+    PRE_PARTITIONING_SQL,
+]
+
+# Tables added (or recreated) after the first release; created if missing
+NEW_TABLES = [
+    AccountDeletionJob.__table__,
+    ChatMessage.__table__,
+    ChatMessageArchive.__table__,
+]
+
+
+async def migrate():
+    print("🔄 Applying migrations...")
+    async with engine.begin() as conn:
+        for statement in PRE_MIGRATIONS:
+            await conn.execute(text(statement))
+        await conn.run_sync(Base.metadata.create_all, tables=NEW_TABLES)
+        for statement in MIGRATIONS:
+            await conn.execute(text(statement))
+
+    print(f"✅ {len(MIGRATIONS)} migrations applied")
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
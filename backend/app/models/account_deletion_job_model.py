@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, DateTime, func
+from app.core.database import Base
+
+class AccountDeletionJob(Base):
+    __tablename__ = "account_deletion_jobs"
+
+    id = Column(String, primary_key=True)  # uuid4 hex, returned to the client
+    # No foreign key: the user row is the last thing the job deletes
+    user_id = Column(Integer, nullable=False, index=True)
+
+    status = Column(String, nullable=False, default="pending")  # pending, running, completed, failed
+    current_table = Column(String, nullable=True)
+    rows_deleted = Column(Integer, nullable=False, default=0, server_default="0")
+    error = Column(String, nullable=True)
+
+    # Lease of the worker running the job, renewed after every batch
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime(timezone=True), nullable=True)  # retry of a failed job
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    completed_at = Column(DateTime(timezone=True), nullable=True)
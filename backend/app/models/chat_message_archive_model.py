@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Index, Integer, LargeBinary, DateTime, ForeignKey, func
+from app.core.database import Base
+
+class ChatMessageArchive(Base):
+    """
+    A run of one user's chat messages moved out of chat_messages by the
+    retention job, stored compressed and still returned by /export.
+    """
+    __tablename__ = "chat_message_archives"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    first_message_at = Column(DateTime(timezone=True), nullable=False)
+    last_message_at = Column(DateTime(timezone=True), nullable=False)
+    message_count = Column(Integer, nullable=False)
+    # zlib-compressed NDJSON, one message (id, role, content, created_at) per line
+    payload = Column(LargeBinary, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_chat_message_archives_user_first", "user_id", "first_message_at"),
+    )
@@ -1,14 +1,23 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import BigInteger, Column, Index, Integer, String, DateTime, ForeignKey
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
 
-    id = Column(Integer, primary_key=True, index=True)
+    # Range-partitioned by month on created_at (see
+    # app/services/chat_retention_service.py), so created_at is part of
+    # the primary key
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     role = Column(String, nullable=False)  # "user" or "assistant"
     content = Column(String, nullable=False)
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), primary_key=True, nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        # "Latest N for user": a short backward scan, newest partition first
+        Index("ix_chat_messages_user_created", "user_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
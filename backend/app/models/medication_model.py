@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func
+from sqlalchemy import Column, Index, Integer, String, DateTime, ForeignKey, func
 from app.core.database import Base
 
 class Medication(Base):
@@ -12,3 +12,12 @@ class Medication(Base):
     frequency = Column(String, nullable=True)
     notes = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    deleted_at = Column(DateTime(timezone=True), nullable=True)  # tombstone for /sync
+
+    # users.data_version at the time of the last write; the /sync cursor
+    change_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("ix_medications_user_change_version", "user_id", "change_version"),
+    )
@@ -28,3 +28,9 @@ class User(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Bumped on every write to the user's data; drives ETags
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Set when the user deletes the account; rows are purged in the background
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
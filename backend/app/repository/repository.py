@@ -0,0 +1,162 @@
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user_model import User
+
+
+# Bookkeeping columns for /sync; never part of API payloads
+SYNC_COLUMNS = {"updated_at", "deleted_at", "change_version"}
+
+
+def data_columns(model) -> list:
+    """
+    All table columns except the /sync bookkeeping ones, in table order.
+    """
+    return [column for column in model.__table__.columns if column.name not in SYNC_COLUMNS]
+
+
+def response_columns(model, schema: Type[BaseModel]) -> list:
+    """
+    Model columns needed for `schema`, in the schema's field order so
+    rows serialize to the same key order as the Pydantic model.
+    """
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+async def fetch_user_rows(
+    db: AsyncSession,
+    model,
+    schema: Type[BaseModel],
+    user_id: int
+) -> List[Dict[str, Any]]:
+    """
+    Lightweight read path for `/me` list endpoints. Selects only the
+    columns of the response schema and returns plain dicts, newest first,
+    skipping ORM instance construction and Pydantic validation.
+    """
+    result = await db.execute(
+        select(*response_columns(model, schema))
+        .where(model.user_id == user_id, model.deleted_at.is_(None))
+        .order_by(model.created_at.desc())
+    )
+    return [row._asdict() for row in result]
+
+
+async def bump_data_version(db: AsyncSession, user_id: int) -> int:
+    """
+    Increments the user's change counter in the current transaction and
+    returns the new value. Call before committing any write to user data.
+    """
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+        .returning(User.data_version)
+    )
+    return result.scalar_one()
+
+
+def _bumped_data_version(user_id: int):
+    """
+    `(SELECT data_version FROM bump)`, where `bump` is a data-modifying
+    CTE that increments the user's counter. Postgres runs it once as part
+    of the enclosing INSERT/UPDATE, so the bump and the write share one
+    statement and one round trip.
+    """
+    bump = (
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+        .returning(User.data_version)
+        .cte("bump")
+    )
+    return select(bump.c.data_version).scalar_subquery()
+
+
+async def insert_user_row(
+    db: AsyncSession,
+    model,
+    schema: Type[BaseModel],
+    user_id: int,
+    values: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    INSERT ... RETURNING the response columns, bumping the user's
+    data_version in the same statement. Returns the new row as a dict.
+    """
+    result = await db.execute(
+        insert(model)
+        .values(user_id=user_id, change_version=_bumped_data_version(user_id), **values)
+        .returning(*response_columns(model, schema))
+    )
+    return result.one()._asdict()
+
+
+async def update_user_row(
+    db: AsyncSession,
+    model,
+    schema: Type[BaseModel],
+    user_id: int,
+    row_id: int,
+    values: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    UPDATE ... WHERE id AND user_id RETURNING the response columns, for
+    live rows only. `values` may hold any subset of columns (PATCH).
+    Returns None when the row does not exist or belongs to someone else;
+    the caller must then not commit, so the counter bump is rolled back.
+    """
+    result = await db.execute(
+        update(model)
+        .where(model.id == row_id, model.user_id == user_id, model.deleted_at.is_(None))
+        .values(change_version=_bumped_data_version(user_id), **values)
+        .returning(*response_columns(model, schema))
+        .execution_options(synchronize_session=False)
+    )
+    row = result.one_or_none()
+    return row._asdict() if row else None
+
+
+async def soft_delete_user_row(
+    db: AsyncSession,
+    model,
+    schema: Type[BaseModel],
+    user_id: int,
+    row_id: int
+) -> Optional[Dict[str, Any]]:
+    """
+    Marks a live row deleted (the tombstone /sync needs) and returns it,
+    in one statement. Returns None when there is no such row.
+    """
+    return await update_user_row(db, model, schema, user_id, row_id, {"deleted_at": func.now()})
+
+
+async def fetch_user_changes(
+    db: AsyncSession,
+    model,
+    schema: Type[BaseModel],
+    user_id: int,
+    since: int
+) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """
+    Rows written after change counter `since`, split into live rows
+    (shaped like `schema`) and ids of soft-deleted rows. `since == 0`
+    is a full snapshot and skips tombstones.
+    """
+    query = select(*response_columns(model, schema), model.deleted_at).where(model.user_id == user_id)
+    if since:
+        query = query.where(model.change_version > since)
+    else:
+        query = query.where(model.deleted_at.is_(None))
+
+    upserted, deleted = [], []
+    for row in await db.execute(query.order_by(model.change_version)):
+        data = row._asdict()
+        if data.pop("deleted_at") is None:
+            upserted.append(data)
+        else:
+            deleted.append(data["id"])
+    return upserted, deleted
@@ -1,65 +1,262 @@
-from fastapi import APIRouter, Depends
+import asyncio
+
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.database import get_db, AsyncSessionLocal
+from app.core.dependencies import get_current_user, get_ai_service, get_active_user
+from app.core.rate_limit import (
+    RATE_LIMITS,
+    rate_limit,
+    ai_concurrency_slot,
+    get_rate_limiter,
+    try_acquire_ai_slot,
+    release_ai_slot,
+)
+from app.core.security import decode_access_claims
 from app.models.user_model import User
 from app.schemas.chat_schema import ChatRequest
-from app.routers.health_router import weekly_summary
-from app.services.insights_service import generate_rule_based_insights
 from app.services.ai_service import AIService
+from app.core.config import settings
+from app.services.chat_cache_service import get_chat_cache, chat_cache_bucket
+from app.services.chat_intent_service import classify_intent, template_reply, needs_health_context
 from app.services.chat_memory_service import (
     save_message,
+    save_exchange,
     get_recent_messages
 )
+from app.services.chat_session_service import AccountGone, ChatSession, SessionExpired, build_health_context
+from app.utils.async_iter import iterate_in_thread
+from app.utils.logger import logger
 
 router = APIRouter(
     prefix="/ai",
     tags=["AI Chat"]
 )
 
-ai_service = AIService()
-
-@router.post("/chat")
+@router.post("/chat", dependencies=[Depends(rate_limit("ai_chat")), Depends(ai_concurrency_slot)])
 async def health_chat(
     payload: ChatRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    ai_service: AIService = Depends(get_ai_service)
 ):
-    # 1️⃣ Fetch recent chat memory
-    history = await get_recent_messages(db, current_user.id)
+    # 0️⃣ Small talk ("hi", "thanks", "ok") → template, no context or LLM
+    intent = classify_intent(payload.message)
+    if intent:
+        reply = template_reply(intent, current_user.full_name)
+        await save_exchange(db, current_user.id, payload.message, reply)
+        return {
+            "reply": reply,
+            "confidence": "template"
+        }
 
-    memory_text = "\n".join(
-        f"{m.role}: {m.content}" for m in history
-    )
+    # 1️⃣ Weekly health context, only when the message is about the user's own data
+    risk_level = None
+    if needs_health_context(payload.message):
+        context, risk_level = await build_health_context(db, current_user)
+    else:
+        context = "Not needed for this general question."
 
-    # 2️⃣ Weekly health context
-    summary = await weekly_summary(db=db, current_user=current_user)
-    rules = generate_rule_based_insights(summary)
+    # 2️⃣ Near-duplicate question with the same risk level → cached reply, no LLM
+    cache = get_chat_cache()
+    cache_bucket = chat_cache_bucket(risk_level, current_user.id)
+    use_cache = settings.CHAT_CACHE_ENABLED and cache.cacheable(payload.message)
+    cached_reply = cache.lookup(payload.message, cache_bucket) if use_cache else None
+    if cached_reply:
+        await save_exchange(db, current_user.id, payload.message, cached_reply)
+        return {
+            "reply": cached_reply,
+            "confidence": "ai-assisted (cached)"
+        }
 
-    context = f"""
-Risk level: {rules['risk_level']}
-Signals: {rules['signals']}
-Observations: {rules['insights']}
-"""
+    # 3️⃣ Fetch recent chat memory; standalone (cacheable) questions are
+    # answered without it, so their replies can be reused
+    if use_cache:
+        memory_text = ""
+    else:
+        history = await get_recent_messages(db, current_user.id)
+        memory_text = "\n".join(
+            f"{m.role}: {m.content}" for m in history
+        )
 
-    # 3️⃣ Save user message
+    # 4️⃣ Save user message
     await save_message(
         db, current_user.id, "user", payload.message
     )
 
-    # 4️⃣ AI reply with memory
+    # 5️⃣ AI reply with memory
     reply = ai_service.chat_about_health(
         user_message=payload.message,
         context=context,
         memory=memory_text
     )
+    if use_cache:
+        cache.store(payload.message, cache_bucket, reply)
 
-    # 5️⃣ Save AI reply
+    # 6️⃣ Save AI reply
     await save_message(
         db, current_user.id, "assistant", reply
     )
 
     return {
         "reply": reply,
-        "confidence": "ai-assisted with memory"
+        "confidence": "ai-assisted" if use_cache else "ai-assisted with memory"
     }
+
+
+async def _receive(websocket: WebSocket, timeout: float):
+    """Next JSON object from the client, or None when it is not one"""
+    try:
+        data = await asyncio.wait_for(websocket.receive_json(), timeout)
+    except (KeyError, ValueError):
+        # Invalid JSON, or a binary frame (no "text" in the message)
+        return None
+    return data if isinstance(data, dict) else None
+
+
+async def _authenticate(websocket: WebSocket):
+    """
+    The first frame must be {"token": "<access token>"}; browsers cannot
+    set an Authorization header on a WebSocket, and a token in the URL
+    would end up in access logs.
+    """
+    try:
+        data = await _receive(websocket, settings.CHAT_WS_AUTH_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        return None
+
+    claims = decode_access_claims(data.get("token") or "") if data else None
+    if not claims or not claims.get("sub"):
+        return None
+
+    async with AsyncSessionLocal() as db:
+        user = await get_active_user(db, int(claims["sub"]))
+        if user:
+            session = ChatSession(user, expires_at=claims.get("exp"))
+            await session.start(db)
+            return session
+    return None
+
+
+async def _answer(websocket: WebSocket, session: ChatSession, ai_service: AIService, message: str):
+    intent = classify_intent(message)
+    personal = intent is None and needs_health_context(message)
+    # health_context() checks the account itself; otherwise a periodic check
+    if not personal:
+        await session.ensure_active()
+
+    # Small talk → template, no context or LLM
+    if intent:
+        reply = template_reply(intent, session.full_name)
+        session.record("user", message)
+        session.record("assistant", reply)
+        await websocket.send_json({"type": "done", "reply": reply, "confidence": "template"})
+        return
+
+    # Health context from the session, rebuilt only after new logs
+    risk_level = None
+    if personal:
+        context, risk_level = await session.health_context()
+    else:
+        context = "Not needed for this general question."
+
+    cache = get_chat_cache()
+    cache_bucket = chat_cache_bucket(risk_level, session.user_id)
+    use_cache = settings.CHAT_CACHE_ENABLED and cache.cacheable(message)
+    cached_reply = cache.lookup(message, cache_bucket) if use_cache else None
+    if cached_reply:
+        session.record("user", message)
+        session.record("assistant", cached_reply)
+        await websocket.send_json({"type": "done", "reply": cached_reply, "confidence": "ai-assisted (cached)"})
+        return
+
+    if not try_acquire_ai_slot():
+        await websocket.send_json({"type": "error", "detail": "AI service is busy, please retry shortly", "retry_after": 1})
+        return
+
+    # Standalone (cacheable) questions are answered without memory, so the reply can be reused
+    memory_text = "" if use_cache else session.memory_text()
+    session.record("user", message)
+
+    parts = []
+    try:
+        async for chunk in iterate_in_thread(
+            lambda: ai_service.stream_chat_about_health(user_message=message, context=context, memory=memory_text)
+        ):
+            parts.append(chunk)
+            await websocket.send_json({"type": "delta", "text": chunk})
+    except WebSocketDisconnect:
+        raise
+    except Exception as e:
+        logger.error(f"Chat stream failed for user {session.user_id}: {e}")
+        await websocket.send_json({"type": "error", "detail": "Could not generate a reply, please retry"})
+        return
+    finally:
+        release_ai_slot()
+
+    reply = "".join(parts)
+    if use_cache:
+        cache.store(message, cache_bucket, reply)
+    session.record("assistant", reply)
+    await websocket.send_json({
+        "type": "done",
+        "reply": reply,
+        "confidence": "ai-assisted" if use_cache else "ai-assisted with memory",
+    })
+
+
+@router.websocket("/chat/ws")
+async def health_chat_ws(websocket: WebSocket):
+    """
+    Chat over one connection: authenticate once with {"token": ...}, then
+    send {"message": ...} frames. Replies stream as {"type": "delta"}
+    frames and end with {"type": "done", "reply": ..., "confidence": ...}.
+    Memory and health context live in the session, and messages are
+    saved in the background.
+    """
+    await websocket.accept()
+
+    try:
+        session = await _authenticate(websocket)
+    except WebSocketDisconnect:
+        return
+    if session is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid or expired token")
+        return
+
+    ai_service = get_ai_service(websocket)
+    limiter = get_rate_limiter(websocket)
+    capacity, per_minute = RATE_LIMITS["ai_chat"]
+    await websocket.send_json({"type": "ready"})
+
+    try:
+        while True:
+            data = await _receive(websocket, settings.CHAT_WS_IDLE_TIMEOUT_SECONDS)
+            message = data.get("message") if data else None
+            if not isinstance(message, str) or not message.strip():
+                await websocket.send_json({"type": "error", "detail": 'Expected {"message": "..."}'})
+                continue
+
+            if settings.RATE_LIMIT_ENABLED:
+                allowed, retry_after = await limiter.acquire(
+                    f"ai_chat:{session.user_id}", capacity, per_minute / 60
+                )
+                if not allowed:
+                    await websocket.send_json({
+                        "type": "error",
+                        "detail": "Too many requests, please slow down",
+                        "retry_after": max(1, round(retry_after)),
+                    })
+                    continue
+
+            await _answer(websocket, session, ai_service, message)
+    except asyncio.TimeoutError:
+        await websocket.close(code=status.WS_1000_NORMAL_CLOSURE, reason="Idle timeout")
+    except AccountGone:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="User not found")
+    except SessionExpired:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Token expired")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await session.close()
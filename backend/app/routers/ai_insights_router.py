@@ -1,64 +1,141 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime, timezone
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_ai_service
+from app.core.rate_limit import rate_limit, ai_concurrency_slot
 from app.models.user_model import User
-from app.routers.health_router import weekly_summary
-from app.services.insights_service import generate_rule_based_insights
 from app.services.ai_service import AIService
-from app.utils.ai_parser import parse_ai_json
+from app.services.ai_job_service import (
+    AIJob,
+    JobQueueFull,
+    PRIORITIES,
+    PRIORITY_NAMES,
+    build_weekly_ai_insights,
+    get_job_queue,
+    stream_ai_insights,
+    weekly_insights_context,
+)
 
 router = APIRouter(
     prefix="/ai",
     tags=["AI Insights"]
 )
 
-ai_service = AIService()
 
-
-@router.get("/weekly-summary")
+@router.get(
+    "/weekly-summary",
+    dependencies=[Depends(rate_limit("ai_insights")), Depends(ai_concurrency_slot)]
+)
 async def get_ai_weekly_insights(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    ai_service: AIService = Depends(get_ai_service)
 ):
     """
     Returns AI-powered weekly health insights
     grounded on rule-based analysis.
     """
+    return await build_weekly_ai_insights(db, current_user, ai_service)
 
-    # 1️⃣ Aggregate weekly data
-    summary = await weekly_summary(
-        db=db,
-        current_user=current_user
-    )
 
-    # 2️⃣ Rule-based insights (ground truth)
-    rule_insights = generate_rule_based_insights(summary)
+@router.get(
+    "/weekly-summary/stream",
+    dependencies=[Depends(rate_limit("ai_insights")), Depends(ai_concurrency_slot)]
+)
+async def stream_ai_weekly_insights(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    ai_service: AIService = Depends(get_ai_service)
+):
+    """
+    Same insights as `/ai/weekly-summary`, streamed as NDJSON events: the
+    rule-based layer first, then each AI field as soon as it is complete
+    and valid (`summary` first), then a final `done` event.
+    """
+    payload, prompt_inputs = await weekly_insights_context(db, current_user)
 
-    # 3️⃣ AI-powered explanation (raw)
-    ai_raw = ai_service.generate_weekly_health_insights(
-        signals=rule_insights["signals"],
-        observations=rule_insights["insights"],
-        risk_level=rule_insights["risk_level"]
-    )
+    async def events():
+        yield orjson.dumps({"type": "rules", **payload}) + b"\n"
 
-    # 4️⃣ Safe JSON parsing
-    parsed_ai = parse_ai_json(ai_raw["raw_response"])
+        result = None
+        async for name, value in stream_ai_insights(ai_service, **prompt_inputs):
+            if name == "result":
+                result = value
+                continue
+            yield orjson.dumps({"type": "field", "field": name, "value": value}) + b"\n"
 
-    return {
-        "period": summary["period"],
-        "user_id": current_user.id,
+        yield orjson.dumps({
+            "type": "done",
+            "ai_fallback": result is None,
+            "confidence": "rule-based + ai-assisted",
+        }) + b"\n"
 
-        # Rule-based layer
-        "signals": rule_insights["signals"],
-        "observations": rule_insights["insights"],
-        "risk_level": rule_insights["risk_level"],
-        "risk_points": rule_insights["risk_points"],
+    return StreamingResponse(events(), media_type="application/x-ndjson")
 
-        # AI layer (safe + structured)
-        "ai_insights": parsed_ai.dict() if parsed_ai else None,
-        "ai_fallback": parsed_ai is None,
 
-        "confidence": "rule-based + ai-assisted"
+def _job_response(job: AIJob) -> dict:
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "priority": PRIORITY_NAMES[job.priority],
+        "created_at": datetime.fromtimestamp(job.created_at, timezone.utc),
+        "completed_at": (
+            datetime.fromtimestamp(job.completed_at, timezone.utc) if job.completed_at else None
+        ),
+        "result": job.result,
+        "error": job.error,
     }
+
+
+@router.post(
+    "/weekly-summary/jobs",
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(rate_limit("ai_insights"))]
+)
+async def create_ai_weekly_insights_job(
+    priority: str = Query("normal", pattern="^(high|normal|low)$"),
+    current_user: User = Depends(get_current_user),
+    queue=Depends(get_job_queue)
+):
+    """
+    Queues weekly insight generation and returns right away with a job
+    id. An identical job still pending or running for the same data is
+    returned instead of queueing a new one. Poll
+    `/ai/weekly-summary/jobs/{job_id}` for the result.
+    """
+    try:
+        job, created = await queue.submit(
+            current_user.id, current_user.data_version or 0, PRIORITIES[priority]
+        )
+    except JobQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI job queue is full, please retry shortly",
+            headers={"Retry-After": "5"},
+        )
+
+    return {**_job_response(job), "deduplicated": not created}
+
+
+@router.get("/weekly-summary/jobs/{job_id}")
+async def get_ai_weekly_insights_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=30, description="long-poll up to this many seconds"),
+    current_user: User = Depends(get_current_user),
+    queue=Depends(get_job_queue)
+):
+    """
+    Status and, once completed, the result of an insights job. With
+    `wait`, the request is held until the job finishes or the wait ends.
+    """
+    job = await queue.wait(job_id, wait)
+
+    if not job or job.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return _job_response(job)
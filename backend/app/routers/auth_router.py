@@ -1,15 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select
 from app.core.database import get_db
 from app.models.user_model import User
-from app.models.chat_message_model import ChatMessage
-from app.models.diet_model import Diet
-from app.models.lifestyle_model import Lifestyle
-from app.models.medication_model import Medication
-from app.models.symptom_model import Symptom
+from app.models.account_deletion_job_model import AccountDeletionJob
 from app.schemas.user_schema import UserCreate, UserLogin, TokenResponse, UserProfile, UserProfileUpdate
 from app.core.security import hash_password, verify_password, create_access_token, get_current_user
+from app.core.etag import user_etag, check_not_modified, etag_headers
+from app.repository.repository import bump_data_version
+from app.services.account_deletion_service import mark_account_deleted, schedule_deletion_job
 from app.utils.logger import logger
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
@@ -48,7 +47,7 @@ async def login(user: UserLogin, db: AsyncSession = Depends(get_db)):
     )
     db_user = result.scalar_one_or_none()
 
-    if not db_user or not verify_password(
+    if not db_user or db_user.deleted_at is not None or not verify_password(
         user.password, db_user.hashed_password
     ):
         raise HTTPException(
@@ -62,8 +61,18 @@ async def login(user: UserLogin, db: AsyncSession = Depends(get_db)):
     return TokenResponse(access_token=token)
 
 @router.get("/profile", response_model=UserProfile)
-async def get_user_profile(current_user: User = Depends(get_current_user)):
+async def get_user_profile(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user)
+):
     """Get current user's profile information"""
+    etag = user_etag(current_user, "profile")
+    not_modified = check_not_modified(request, etag)
+    if not_modified:
+        return not_modified
+
+    response.headers.update(etag_headers(etag))
     return UserProfile(
         id=current_user.id,
         email=current_user.email,
@@ -93,6 +102,7 @@ async def update_user_profile(
     for field, value in profile_data.dict(exclude_unset=True).items():
         setattr(current_user, field, value)
 
+    await bump_data_version(db, current_user.id)
     await db.commit()
     await db.refresh(current_user)
 
@@ -116,26 +126,39 @@ async def update_user_profile(
         created_at=current_user.created_at.isoformat() if current_user.created_at else None
     )
 
-@router.delete("/profile")
+@router.delete("/profile", status_code=status.HTTP_202_ACCEPTED)
 async def delete_user_account(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Delete the current user's account and all associated data"""
-    user_id = current_user.id
-
-    # Delete all related data first
-    await db.execute(delete(ChatMessage).where(ChatMessage.user_id == user_id))
-    await db.execute(delete(Diet).where(Diet.user_id == user_id))
-    await db.execute(delete(Lifestyle).where(Lifestyle.user_id == user_id))
-    await db.execute(delete(Medication).where(Medication.user_id == user_id))
-    await db.execute(delete(Symptom).where(Symptom.user_id == user_id))
-
-    # Delete the user
-    await db.execute(delete(User).where(User.id == user_id))
-
-    await db.commit()
-
-    logger.info(f"User account deleted: {current_user.email}")
-
-    return {"message": "Account deleted successfully"}
+    """
+    Delete the current user's account and all associated data.
+
+    The account is disabled immediately; related rows are purged in
+    batches by a background job whose progress is available at
+    `/auth/deletion-jobs/{job_id}`.
+    """
+    email = current_user.email
+    job = await mark_account_deleted(db, current_user)
+    schedule_deletion_job(job.id)
+
+    logger.info(f"User account marked for deletion: {email} (job {job.id})")
+
+    return {"message": "Account deletion started", "job_id": job.id}
+
+@router.get("/deletion-jobs/{job_id}")
+async def get_deletion_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    """Progress of an account deletion job (the job id is an unguessable token)"""
+    job = await db.get(AccountDeletionJob, job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Deletion job not found")
+
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "current_table": job.current_table,
+        "rows_deleted": job.rows_deleted,
+        "created_at": job.created_at,
+        "completed_at": job.completed_at,
+    }
@@ -1,14 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from typing import List
 
 from app.core.database import get_db
 from app.models.diet_model import Diet
-from app.schemas.diet_schema import DietCreate, DietResponse
+from app.schemas.diet_schema import DietCreate, DietUpdate, DietResponse
 from app.utils.logger import logger
 from app.core.dependencies import get_current_user
+from app.core.etag import user_etag, check_not_modified, etag_headers
+from app.core.responses import ORJSONModelResponse
 from app.models.user_model import User
+from app.repository.repository import fetch_user_rows
+from app.services.services import create_entry, update_entry, delete_entry
 
 router = APIRouter(prefix="/diets", tags=["Diets"])
 
@@ -18,26 +21,21 @@ async def create_diet(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    new_entry = Diet(
-        user_id=current_user.id,
-        **entry.dict()
-    )
-    db.add(new_entry)
-    await db.commit()
-    await db.refresh(new_entry)
-    return new_entry
+    return await create_entry(db, Diet, DietResponse, current_user.id, entry)
 
 @router.get("/me", response_model=list[DietResponse])
 async def get_my_diets(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(
-        select(Diet)
-        .where(Diet.user_id == current_user.id)
-        .order_by(Diet.created_at.desc())
-    )
-    return result.scalars().all()
+    etag = user_etag(current_user, "diets")
+    not_modified = check_not_modified(request, etag)
+    if not_modified:
+        return not_modified
+
+    rows = await fetch_user_rows(db, Diet, DietResponse, current_user.id)
+    return ORJSONModelResponse(rows, headers=etag_headers(etag))
 
 @router.put("/{diet_id}", response_model=DietResponse)
 async def update_diet(
@@ -46,22 +44,25 @@ async def update_diet(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(
-        select(Diet).where(
-            Diet.id == diet_id,
-            Diet.user_id == current_user.id
-        )
-    )
-    entry = result.scalar_one_or_none()
+    entry = await update_entry(db, Diet, DietResponse, current_user.id, diet_id, updated)
 
     if not entry:
         raise HTTPException(status_code=404, detail="Diet not found")
 
-    for k, v in updated.dict().items():
-        setattr(entry, k, v)
+    return entry
+
+@router.patch("/{diet_id}", response_model=DietResponse)
+async def patch_diet(
+    diet_id: int,
+    updated: DietUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    entry = await update_entry(db, Diet, DietResponse, current_user.id, diet_id, updated, partial=True)
+
+    if not entry:
+        raise HTTPException(status_code=404, detail="Diet not found")
 
-    await db.commit()
-    await db.refresh(entry)
     return entry
 
 @router.delete("/{diet_id}")
@@ -70,17 +71,10 @@ async def delete_diet(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(
-        select(Diet).where(
-            Diet.id == diet_id,
-            Diet.user_id == current_user.id
-        )
-    )
-    entry = result.scalar_one_or_none()
+    # soft delete keeps a tombstone for /sync
+    entry = await delete_entry(db, Diet, DietResponse, current_user.id, diet_id)
 
     if not entry:
         raise HTTPException(status_code=404, detail="Diet not found")
 
-    await db.delete(entry)
-    await db.commit()
     return {"message": "Diet entry deleted"}
@@ -0,0 +1,40 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from app.core.dependencies import get_current_user
+from app.models.user_model import User
+from app.services.export_service import export_user_data
+from app.utils.logger import logger
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+@router.get("")
+async def export_my_data(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    gzip: bool = Query(False, description="Compress the export as a .gz file"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Streams the user's full history (diets, symptoms, medications,
+    lifestyle entries and chat messages) as NDJSON or CSV. Every row
+    carries a `type` field naming its source.
+    """
+    filename = f"myhealthsense-export-{datetime.utcnow():%Y%m%d}.{format}"
+    media_type = MEDIA_TYPES[format]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    logger.info(f"Export started for user {current_user.id} ({format}, gzip={gzip})")
+
+    return StreamingResponse(
+        export_user_data(current_user.id, format, gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
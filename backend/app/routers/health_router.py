@@ -1,60 +1,53 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from typing import Dict
+from app.core.cache import get_cache
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.responses import ORJSONEncodedResponse
 from app.models.user_model import User
 from app.models.diet_model import Diet
 from app.models.symptom_model import Symptom
 from app.models.medication_model import Medication
 from app.models.lifestyle_model import Lifestyle
+from app.repository.repository import data_columns
+from app.services.summary_service import BUCKETS, bucket_range, bucketed_summary
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
-@router.get("/weekly-summary")
-async def weekly_summary(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    now = datetime.utcnow()
-    start_date = now - timedelta(days=7)
+MAX_SUMMARY_BUCKETS = 1000
 
-    # Diet
-    diet_result = await db.execute(
-        select(Diet).where(
-            Diet.user_id == current_user.id,
-            Diet.created_at >= start_date
-        )
-    )
-    diets = diet_result.scalars().all()
 
-    # Symptoms
-    symptom_result = await db.execute(
-        select(Symptom).where(
-            Symptom.user_id == current_user.id,
-            Symptom.created_at >= start_date
+async def _rows_since(db: AsyncSession, model, user_id: int, start_date: datetime):
+    # Plain rows (attribute access, no ORM identity map) in table column order
+    result = await db.execute(
+        select(*data_columns(model)).where(
+            model.user_id == user_id,
+            model.created_at >= start_date,
+            model.deleted_at.is_(None)
         )
     )
-    symptoms = symptom_result.scalars().all()
+    return result.all()
 
-    # Medications
-    medication_result = await db.execute(
-        select(Medication).where(
-            Medication.user_id == current_user.id,
-            Medication.created_at >= start_date
-        )
-    )
-    medications = medication_result.scalars().all()
 
-    # Lifestyle
-    lifestyle_result = await db.execute(
-        select(Lifestyle).where(
-            Lifestyle.user_id == current_user.id,
-            Lifestyle.created_at >= start_date
-        )
-    )
-    lifestyle = lifestyle_result.scalars().all()
+async def weekly_summary(
+    db: AsyncSession,
+    current_user: User
+) -> Dict:
+    """
+    Aggregates the last 7 days of the user's logs. Entries are
+    lightweight rows; used by the insights, AI and chat routers.
+    """
+    now = datetime.utcnow()
+    start_date = now - timedelta(days=7)
+
+    diets = await _rows_since(db, Diet, current_user.id, start_date)
+    symptoms = await _rows_since(db, Symptom, current_user.id, start_date)
+    medications = await _rows_since(db, Medication, current_user.id, start_date)
+    lifestyle = await _rows_since(db, Lifestyle, current_user.id, start_date)
 
     return {
         "period": "last_7_days",
@@ -72,3 +65,60 @@ async def weekly_summary(
             "lifestyle": len(lifestyle),
         }
     }
+
+
+@router.get("/weekly-summary")
+async def get_weekly_summary(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    summary = await weekly_summary(db=db, current_user=current_user)
+
+    for key in ("diet_entries", "symptoms", "medications", "lifestyle"):
+        summary[key] = [row._asdict() for row in summary[key]]
+
+    return ORJSONEncodedResponse(summary)
+
+
+@router.get("/summary")
+async def get_health_summary(
+    start: date = Query(None, alias="from", description="First day (UTC), defaults to 30 days ago"),
+    end: date = Query(None, alias="to", description="Last day (UTC), defaults to today"),
+    bucket: str = Query("day", description="day, week or month"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Time-bucketed aggregates (calories, meal counts, average sleep,
+    stress and water, exercise minutes, symptom counts) for any window,
+    computed in the database so long-range charts stay small.
+    """
+    if bucket not in BUCKETS:
+        raise HTTPException(status_code=400, detail="bucket must be day, week or month")
+
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=29)
+
+    if start > end:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    if len(bucket_range(start, end, bucket)) > MAX_SUMMARY_BUCKETS:
+        raise HTTPException(status_code=400, detail="Too many buckets; use a larger bucket or a shorter window")
+
+    # Versioned by data_version, so new entries are visible immediately
+    cache = get_cache()
+    cache_key = f"summary:{current_user.id}:{current_user.data_version or 0}:{start}:{end}:{bucket}"
+    payload = await cache.get(cache_key)
+    if payload is not None:
+        return payload
+
+    buckets = await bucketed_summary(db, current_user.id, start, end, bucket)
+
+    payload = {
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "bucket": bucket,
+        "user_id": current_user.id,
+        "buckets": buckets,
+    }
+    await cache.set(cache_key, payload, settings.SUMMARY_CACHE_TTL_SECONDS)
+    return payload
@@ -0,0 +1,54 @@
+import io
+import json
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.core.dependencies import get_current_user
+from app.models.user_model import User
+from app.services.import_service import IMPORT_TYPES, ImportFormatError, import_csv
+from app.utils.logger import logger
+
+router = APIRouter(prefix="/import", tags=["Import"])
+
+
+@router.post("/{kind}")
+async def import_history(
+    kind: str,
+    file: UploadFile = File(...),
+    column_map: str = Form(None, description='JSON object mapping CSV headers to fields, e.g. {"Sleep (h)": "sleep_hours"}'),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Imports historical logs from a CSV upload into diets, symptoms,
+    medications or lifestyles. Headers are matched to the fields of the
+    matching create schema (with common aliases); an optional date column
+    keeps the original timestamps. Returns counts and per-line errors.
+    """
+    if kind not in IMPORT_TYPES:
+        raise HTTPException(status_code=404, detail=f"Unknown import type '{kind}'")
+
+    bad_mapping = HTTPException(status_code=400, detail="column_map must be a JSON object of header → field names")
+    try:
+        mapping = json.loads(column_map) if column_map else None
+    except json.JSONDecodeError:
+        raise bad_mapping
+    if mapping is not None and not (
+        isinstance(mapping, dict) and all(isinstance(field, str) for field in mapping.values())
+    ):
+        raise bad_mapping
+
+    # The upload is spooled to disk by Starlette; import_csv reads it in blocks in a thread
+    source = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = await import_csv(db, current_user.id, kind, source, mapping)
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        source.detach()
+
+    logger.info(
+        f"Imported {report['imported']} {kind} rows for user {current_user.id} "
+        f"({report['failed']} failed)"
+    )
+    return report
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.etag import user_etag, check_not_modified, etag_headers
 from app.models.user_model import User
 from app.routers.health_router import weekly_summary
 from app.services.insights_service import generate_rule_based_insights
+from app.services.trend_service import get_user_trends, describe_trends
 
 router = APIRouter(
     prefix="/insights",
@@ -13,6 +16,8 @@ router = APIRouter(
 
 @router.get("/weekly")
 async def get_weekly_rule_insights(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -20,6 +25,13 @@ async def get_weekly_rule_insights(
     Returns rule-based weekly health insights for the logged-in user.
     """
 
+    # The 7-day window slides, so the tag also changes every hour
+    etag = user_etag(current_user, "insights", datetime.utcnow().strftime("%Y%m%d%H"))
+    not_modified = check_not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    response.headers.update(etag_headers(etag))
+
     # 1️⃣ Get aggregated weekly data
     summary = await weekly_summary(
         db=db,
@@ -38,3 +50,31 @@ async def get_weekly_rule_insights(
         "risk_points": insights["risk_points"],
         "confidence": insights["confidence"]
     }
+
+
+@router.get("/trends")
+async def get_trend_insights(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Rolling 7/30-day means, slopes and variability of sleep, stress,
+    exercise, water intake and calories for the logged-in user.
+    """
+    etag = user_etag(current_user, "trends", datetime.utcnow().strftime("%Y%m%d"))
+    not_modified = check_not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    response.headers.update(etag_headers(etag))
+
+    trends = await get_user_trends(db, current_user)
+
+    return {
+        "user_id": current_user.id,
+        "window_end": trends["window_end"],
+        "metrics": trends["metrics"],
+        "observations": describe_trends(trends["metrics"]),
+        "confidence": "statistical"
+    }
@@ -1,40 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from typing import List
 from app.core.database import get_db
 from app.models.lifestyle_model import Lifestyle
-from app.schemas.lifestyle_schema import LifestyleCreate, LifestyleResponse
+from app.schemas.lifestyle_schema import LifestyleCreate, LifestyleUpdate, LifestyleResponse
 from app.utils.logger import logger
 from app.core.dependencies import get_current_user
+from app.core.etag import user_etag, check_not_modified, etag_headers
+from app.core.responses import ORJSONModelResponse
 from app.models.user_model import User
+from app.repository.repository import fetch_user_rows
+from app.services.services import create_entry, update_entry, delete_entry
 
 router = APIRouter(prefix="/lifestyles", tags=["Lifestyle"])
 
 
 @router.post("/", response_model=LifestyleResponse)
 async def create_lifestyle(entry: LifestyleCreate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    new_entry = Lifestyle(
-        user_id=current_user.id,
-        **entry.dict()
-    )
-    db.add(new_entry)
-    await db.commit()
-    await db.refresh(new_entry)
+    new_entry = await create_entry(db, Lifestyle, LifestyleResponse, current_user.id, entry)
 
     logger.info("New lifestyle entry created.")
     return new_entry
 
 
 @router.get("/me", response_model=List[LifestyleResponse])
-async def get_my_lifestyles(db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    result = await db.execute(select(Lifestyle)
-        .where(Lifestyle.user_id == current_user.id)
-        .order_by(Lifestyle.created_at.desc()))
-    items = result.scalars().all()
+async def get_my_lifestyles(request: Request, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+    etag = user_etag(current_user, "lifestyles")
+    not_modified = check_not_modified(request, etag)
+    if not_modified:
+        return not_modified
+
+    items = await fetch_user_rows(db, Lifestyle, LifestyleResponse, current_user.id)
 
     logger.info(f"Fetched {len(items)} lifestyle entries.")
-    return items
+    return ORJSONModelResponse(items, headers=etag_headers(etag))
 
 
 @router.put("/{lifestyle_id}", response_model=LifestyleResponse)
@@ -44,40 +43,40 @@ async def update_lifestyle(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(select(Lifestyle).where(
-        Lifestyle.id == lifestyle_id,
-        Lifestyle.user_id == current_user.id
-    ))
-    entry = result.scalar_one_or_none()
+    entry = await update_entry(db, Lifestyle, LifestyleResponse, current_user.id, lifestyle_id, updated)
 
     if not entry:
         logger.warning(f"Update failed — Lifestyle ID {lifestyle_id} not found.")
         raise HTTPException(status_code=404, detail="Lifestyle entry not found")
 
-    for k, v in updated.dict().items():
-        setattr(entry, k, v)
+    logger.info(f"Updated Lifestyle ID {entry['id']}")
+    return entry
 
-    await db.commit()
-    await db.refresh(entry)
 
-    logger.info(f"Updated Lifestyle ID {entry.id}")
+@router.patch("/{lifestyle_id}", response_model=LifestyleResponse)
+async def patch_lifestyle(
+    lifestyle_id: int,
+    updated: LifestyleUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    entry = await update_entry(db, Lifestyle, LifestyleResponse, current_user.id, lifestyle_id, updated, partial=True)
+
+    if not entry:
+        logger.warning(f"Patch failed — Lifestyle ID {lifestyle_id} not found.")
+        raise HTTPException(status_code=404, detail="Lifestyle entry not found")
+
+    logger.info(f"Patched Lifestyle ID {entry['id']}")
     return entry
 
 
 @router.delete("/{lifestyle_id}")
 async def delete_lifestyle(lifestyle_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    result = await db.execute(select(Lifestyle).where(
-        Lifestyle.id == lifestyle_id,
-        Lifestyle.user_id == current_user.id
-    ))
-    entry = result.scalar_one_or_none()
+    entry = await delete_entry(db, Lifestyle, LifestyleResponse, current_user.id, lifestyle_id)
 
     if not entry:
         logger.warning(f"Delete failed — Lifestyle ID {lifestyle_id} not found.")
         raise HTTPException(status_code=404, detail="Lifestyle entry not found")
 
-    await db.delete(entry)
-    await db.commit()
-
-    logger.info(f"Deleted Lifestyle ID {entry.id}")
+    logger.info(f"Deleted Lifestyle ID {entry['id']}")
     return {"message": "Lifestyle entry deleted successfully."}
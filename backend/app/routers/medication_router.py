@@ -1,88 +1,77 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from typing import List
 
 from app.core.database import get_db
 from app.models.medication_model import Medication
-from app.schemas.medication_schema import MedicationCreate, MedicationResponse
+from app.schemas.medication_schema import MedicationCreate, MedicationUpdate, MedicationResponse
 from app.utils.logger import logger
 from app.core.dependencies import get_current_user
+from app.core.etag import user_etag, check_not_modified, etag_headers
+from app.core.responses import ORJSONModelResponse
 from app.models.user_model import User
+from app.repository.repository import fetch_user_rows
+from app.services.services import create_entry, update_entry, delete_entry
 
 router = APIRouter(prefix="/medications", tags=["Medications"])
 
 # POST → Add new medication
 @router.post("/", response_model=MedicationResponse)
 async def create_medication(medication: MedicationCreate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    new_med = Medication(
-        user_id=current_user.id,
-        **medication.dict()
-    )
-    db.add(new_med)
-    await db.commit()
-    await db.refresh(new_med)
-
-    logger.info(f"New medication added: {new_med.medicine_name} ({new_med.dosage})")
+    new_med = await create_entry(db, Medication, MedicationResponse, current_user.id, medication)
+
+    logger.info(f"New medication added: {new_med['medicine_name']} ({new_med['dosage']})")
     return new_med
 
 
 # GET → Fetch all medications
 @router.get("/me", response_model=List[MedicationResponse])
-async def get_my_medications(db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    result = await db.execute(
-        select(Medication)
-        .where(Medication.user_id == current_user.id)
-        .order_by(Medication.created_at.desc())
-    )
-    meds = result.scalars().all()
+async def get_my_medications(request: Request, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+    etag = user_etag(current_user, "medications")
+    not_modified = check_not_modified(request, etag)
+    if not_modified:
+        return not_modified
+
+    meds = await fetch_user_rows(db, Medication, MedicationResponse, current_user.id)
 
     logger.info(f"Fetched {len(meds)} medications from database.")
-    return meds
+    return ORJSONModelResponse(meds, headers=etag_headers(etag))
 
 
 # PUT → Update medication by ID
 @router.put("/{med_id}", response_model=MedicationResponse)
 async def update_medication(med_id: int, updated_data: MedicationCreate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    result = await db.execute(
-        select(Medication).where(
-            Medication.id == med_id,
-            Medication.user_id == current_user.id
-        )
-    )
-    med = result.scalar_one_or_none()
+    med = await update_entry(db, Medication, MedicationResponse, current_user.id, med_id, updated_data)
 
     if not med:
         logger.warning(f"Update failed — Medication ID {med_id} not found.")
         raise HTTPException(status_code=404, detail="Medication not found")
 
-    for key, value in updated_data.dict().items():
-        setattr(med, key, value)
+    logger.info(f"Updated Medication ID {med['id']}: {med['medicine_name']}")
+    return med
+
 
-    await db.commit()
-    await db.refresh(med)
+# PATCH → Update only the given fields of a medication
+@router.patch("/{med_id}", response_model=MedicationResponse)
+async def patch_medication(med_id: int, updated_data: MedicationUpdate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+    med = await update_entry(db, Medication, MedicationResponse, current_user.id, med_id, updated_data, partial=True)
 
-    logger.info(f"Updated Medication ID {med.id}: {med.medicine_name}")
+    if not med:
+        logger.warning(f"Patch failed — Medication ID {med_id} not found.")
+        raise HTTPException(status_code=404, detail="Medication not found")
+
+    logger.info(f"Patched Medication ID {med['id']}: {med['medicine_name']}")
     return med
 
 
 # DELETE → Remove medication by ID
 @router.delete("/{med_id}")
 async def delete_medication(med_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    result = await db.execute(
-        select(Medication).where(
-            Medication.id == med_id,
-            Medication.user_id == current_user.id
-        )
-    )
-    med = result.scalar_one_or_none()
+    med = await delete_entry(db, Medication, MedicationResponse, current_user.id, med_id)
 
     if not med:
         logger.warning(f"Delete failed — Medication ID {med_id} not found.")
         raise HTTPException(status_code=404, detail="Medication not found")
 
-    await db.delete(med)
-    await db.commit()
-
-    logger.info(f"Deleted Medication ID {med.id}: {med.medicine_name}")
-    return {"message": f"Medication '{med.medicine_name}' deleted successfully."}
+    logger.info(f"Deleted Medication ID {med['id']}: {med['medicine_name']}")
+    return {"message": f"Medication '{med['medicine_name']}' deleted successfully."}
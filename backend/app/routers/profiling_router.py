@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+from app.core.profiling import PROFILE_KINDS, list_profiles, profile_path, require_profiling_token
+
+router = APIRouter(
+    prefix="/debug/profiles",
+    tags=["Profiling"],
+    dependencies=[Depends(require_profiling_token)]
+)
+
+
+@router.get("/")
+async def get_profiles():
+    """Stored request profiles, newest first (requires X-Profile-Token)"""
+    return list_profiles()
+
+
+@router.get("/{profile_id}/{kind}")
+async def download_profile(profile_id: str, kind: str):
+    """
+    `cpu` and `mem` are collapsed-stack files for flamegraph.pl, inferno
+    or speedscope; `meta` is the request metadata.
+    """
+    if kind not in PROFILE_KINDS or not profile_id.isalnum():
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    path = profile_path(profile_id, kind)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    return FileResponse(path, media_type="text/plain", filename=path.name)
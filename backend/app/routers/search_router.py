@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.core.dependencies import get_current_user
+from app.core.responses import ORJSONModelResponse
+from app.models.user_model import User
+from app.services.search_service import SEARCH_SOURCES, search_user_data
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("")
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: str = Query(None, description="Comma-separated subset of: " + ", ".join(SEARCH_SOURCES)),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Searches food items, symptom and medicine names, notes and chat
+    messages of the logged-in user, best matches first.
+    """
+    selected = [t.strip() for t in types.split(",")] if types else list(SEARCH_SOURCES)
+    unknown = [t for t in selected if t not in SEARCH_SOURCES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown search types: {', '.join(unknown)}")
+
+    page = await search_user_data(db, current_user.id, q.strip(), selected, limit, offset)
+
+    return ORJSONModelResponse({
+        "query": q,
+        "limit": limit,
+        "offset": offset,
+        **page,
+    })
@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from typing import List
 from app.core.database import get_db
 from app.models.symptom_model import Symptom
-from app.schemas.symptom_schema import SymptomCreate, SymptomResponse
+from app.schemas.symptom_schema import SymptomCreate, SymptomUpdate, SymptomResponse
 from app.utils.logger import logger
 from app.core.dependencies import get_current_user
+from app.core.etag import user_etag, check_not_modified, etag_headers
+from app.core.responses import ORJSONModelResponse
 from app.models.user_model import User
+from app.repository.repository import fetch_user_rows
+from app.services.services import create_entry, update_entry, delete_entry
 
 router = APIRouter(prefix="/symptoms", tags=["Symptoms"])
 
@@ -15,17 +18,10 @@ router = APIRouter(prefix="/symptoms", tags=["Symptoms"])
 # POST → Add a new symptom
 @router.post("/", response_model=SymptomResponse)
 async def create_symptom(symptom: SymptomCreate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    new_symptom = Symptom(
-        user_id=current_user.id,
-        **symptom.dict()
-    )
-    db.add(new_symptom)
-
-    await db.commit()
-    await db.refresh(new_symptom)
+    new_symptom = await create_entry(db, Symptom, SymptomResponse, current_user.id, symptom)
 
     logger.info(
-        f"New symptom added: {new_symptom.symptom_name} (Severity: {new_symptom.severity})"
+        f"New symptom added: {new_symptom['symptom_name']} (Severity: {new_symptom['severity']})"
     )
 
     return new_symptom
@@ -33,63 +29,55 @@ async def create_symptom(symptom: SymptomCreate, db: AsyncSession = Depends(get_
 
 # GET → Fetch all symptoms
 @router.get("/me", response_model=List[SymptomResponse])
-async def get_my_symptoms(db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    result = await db.execute(
-        select(Symptom)
-        .where(Symptom.user_id == current_user.id)
-        .order_by(Symptom.created_at.desc())
-    )
-    symptoms = result.scalars().all()
+async def get_my_symptoms(request: Request, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+    etag = user_etag(current_user, "symptoms")
+    not_modified = check_not_modified(request, etag)
+    if not_modified:
+        return not_modified
+
+    symptoms = await fetch_user_rows(db, Symptom, SymptomResponse, current_user.id)
 
     logger.info(f"Fetched {len(symptoms)} symptoms from database.")
-    return symptoms
+    return ORJSONModelResponse(symptoms, headers=etag_headers(etag))
 
 
 # PUT → Update a symptom by ID
 @router.put("/{symptom_id}", response_model=SymptomResponse)
 async def update_symptom(symptom_id: int, updated_data: SymptomCreate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    result = await db.execute(
-        select(Symptom).where(
-            Symptom.id == symptom_id,
-            Symptom.user_id == current_user.id
-        )
-    )
-    symptom = result.scalar_one_or_none()
+    symptom = await update_entry(db, Symptom, SymptomResponse, current_user.id, symptom_id, updated_data)
 
     if not symptom:
         logger.warning(f"Update failed — Symptom ID {symptom_id} not found.")
         raise HTTPException(status_code=404, detail="Symptom not found")
 
-    for key, value in updated_data.dict().items():
-        setattr(symptom, key, value)
-
-    await db.commit()
-    await db.refresh(symptom)
-
     logger.info(
-        f"Updated Symptom ID {symptom.id}: {symptom.symptom_name} (Severity: {symptom.severity})"
+        f"Updated Symptom ID {symptom['id']}: {symptom['symptom_name']} (Severity: {symptom['severity']})"
     )
     return symptom
 
 
+# PATCH → Update only the given fields of a symptom
+@router.patch("/{symptom_id}", response_model=SymptomResponse)
+async def patch_symptom(symptom_id: int, updated_data: SymptomUpdate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+    symptom = await update_entry(db, Symptom, SymptomResponse, current_user.id, symptom_id, updated_data, partial=True)
+
+    if not symptom:
+        logger.warning(f"Patch failed — Symptom ID {symptom_id} not found.")
+        raise HTTPException(status_code=404, detail="Symptom not found")
+
+    logger.info(f"Patched Symptom ID {symptom['id']}: {symptom['symptom_name']}")
+    return symptom
+
+
 # DELETE → Remove a symptom by ID
 @router.delete("/{symptom_id}")
 async def delete_symptom(symptom_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    result = await db.execute(
-        select(Symptom).where(
-            Symptom.id == symptom_id,
-            Symptom.user_id == current_user.id
-        )
-    )
-    symptom = result.scalar_one_or_none()
+    # soft delete keeps a tombstone for /sync
+    symptom = await delete_entry(db, Symptom, SymptomResponse, current_user.id, symptom_id)
 
     if not symptom:
         logger.warning(f"Delete failed — Symptom ID {symptom_id} not found.")
         raise HTTPException(status_code=404, detail="Symptom not found")
 
-    # async delete
-    await db.delete(symptom)
-    await db.commit()
-
-    logger.info(f"Deleted Symptom ID {symptom.id}: {symptom.symptom_name}")
-    return {"message": f"Symptom '{symptom.symptom_name}' deleted successfully."}
+    logger.info(f"Deleted Symptom ID {symptom['id']}: {symptom['symptom_name']}")
+    return {"message": f"Symptom '{symptom['symptom_name']}' deleted successfully."}
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.core.dependencies import get_current_user
+from app.core.responses import ORJSONModelResponse
+from app.models.user_model import User
+from app.models.diet_model import Diet
+from app.models.symptom_model import Symptom
+from app.models.medication_model import Medication
+from app.models.lifestyle_model import Lifestyle
+from app.schemas.diet_schema import DietResponse
+from app.schemas.symptom_schema import SymptomResponse
+from app.schemas.medication_schema import MedicationResponse
+from app.schemas.lifestyle_schema import LifestyleResponse
+from app.repository.repository import fetch_user_changes
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+SYNCED_TYPES = {
+    "diets": (Diet, DietResponse),
+    "symptoms": (Symptom, SymptomResponse),
+    "medications": (Medication, MedicationResponse),
+    "lifestyles": (Lifestyle, LifestyleResponse),
+}
+
+
+@router.get("")
+async def sync_changes(
+    since: str = Query("0", description="Cursor from the previous /sync response; 0 for a full snapshot"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Returns diet, symptom, medication and lifestyle entries created,
+    updated or deleted since `since`, plus the cursor for the next call.
+
+    Entries are shaped like the matching `/me` responses; `upserted`
+    holds new and changed entries, `deleted` the ids of removed ones.
+    """
+    if not since.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid sync cursor")
+
+    cursor = int(since)
+    version = current_user.data_version or 0
+
+    # Already in sync: the counter is loaded with the user, so no queries
+    if cursor and cursor >= version:
+        return ORJSONModelResponse({"cursor": str(cursor), "changes": {}})
+
+    changes = {}
+    for name, (model, schema) in SYNCED_TYPES.items():
+        upserted, deleted = await fetch_user_changes(db, model, schema, current_user.id, cursor)
+        if upserted or deleted:
+            changes[name] = {"upserted": upserted, "deleted": deleted}
+
+    return ORJSONModelResponse({"cursor": str(version), "changes": changes})
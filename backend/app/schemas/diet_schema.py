@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from datetime import datetime
 from typing import Optional
 
@@ -8,6 +8,22 @@ class DietCreate(BaseModel):
     calories: Optional[int] = None
     notes: Optional[str] = None
 
+# PATCH: only the fields that are sent change; required ones may be
+# omitted but not nulled
+class DietUpdate(BaseModel):
+    meal_type: Optional[str] = None
+    food_items: Optional[str] = None
+    calories: Optional[int] = None
+    notes: Optional[str] = None
+
+    @field_validator("meal_type", "food_items")
+    @classmethod
+    def not_null(cls, value):
+        # Validators only run on fields that were sent
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
 class DietResponse(BaseModel):
     id: int
     meal_type: str
@@ -12,6 +12,11 @@ class LifestyleCreate(BaseModel):
     notes: Optional[str] = None
 
 
+# PATCH: every field is optional, so the same shape works
+class LifestyleUpdate(LifestyleCreate):
+    pass
+
+
 class LifestyleResponse(BaseModel):
     id: int
     sleep_hours: Optional[float] = None
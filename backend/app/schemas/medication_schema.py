@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from datetime import datetime
 from typing import Optional
 
@@ -9,6 +9,21 @@ class MedicationCreate(BaseModel):
     frequency: Optional[str] = None
     notes: Optional[str] = None
 
+# Request model (PATCH); omitted fields stay unchanged
+class MedicationUpdate(BaseModel):
+    medicine_name: Optional[str] = None
+    dosage: Optional[str] = None
+    frequency: Optional[str] = None
+    notes: Optional[str] = None
+
+    @field_validator("medicine_name")
+    @classmethod
+    def not_null(cls, value):
+        # Validators only run on fields that were sent
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
 # Response model
 class MedicationResponse(BaseModel):
     id: int
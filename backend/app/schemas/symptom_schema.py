@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from datetime import datetime
 from typing import Optional
 
@@ -8,6 +8,20 @@ class SymptomCreate(BaseModel):
     severity: Optional[str] = None
     notes: Optional[str] = None
 
+# Request model (for PATCH); omitted fields stay unchanged
+class SymptomUpdate(BaseModel):
+    symptom_name: Optional[str] = None
+    severity: Optional[str] = None
+    notes: Optional[str] = None
+
+    @field_validator("symptom_name")
+    @classmethod
+    def not_null(cls, value):
+        # Validators only run on fields that were sent
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
 # Response model (for GET)
 class SymptomResponse(BaseModel):
     id: int
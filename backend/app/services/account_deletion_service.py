@@ -0,0 +1,187 @@
+import asyncio
+import uuid
+from datetime import timedelta
+from typing import List, Optional
+from sqlalchemy import and_, or_, select, delete, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.user_model import User
+from app.models.chat_message_model import ChatMessage
+from app.models.chat_message_archive_model import ChatMessageArchive
+from app.models.diet_model import Diet
+from app.models.lifestyle_model import Lifestyle
+from app.models.medication_model import Medication
+from app.models.symptom_model import Symptom
+from app.models.account_deletion_job_model import AccountDeletionJob
+from app.services.trend_service import trend_cache_key
+from app.utils.logger import logger
+
+# Purge order; the user row itself goes last. Archives come after
+# messages, so rows archived by a retention pass meanwhile are purged too
+PURGE_MODELS = [ChatMessage, ChatMessageArchive, Diet, Lifestyle, Medication, Symptom]
+
+# Keeps running jobs referenced so they are not garbage-collected
+_running_jobs: set = set()
+
+
+async def mark_account_deleted(db: AsyncSession, user: User) -> AccountDeletionJob:
+    """
+    Soft-deletes the account right away and records a purge job in the
+    same transaction. The email is released so it can be registered again.
+    """
+    user.deleted_at = func.now()
+    user.email = f"deleted+{user.id}@deleted.invalid"
+
+    job = AccountDeletionJob(id=uuid.uuid4().hex, user_id=user.id, status="pending")
+    db.add(job)
+    await db.commit()
+
+    await get_cache().delete(trend_cache_key(user.id))
+    return job
+
+
+async def _delete_batch(db: AsyncSession, model, user_id: int, batch_size: int) -> int:
+    batch = (
+        select(model.id)
+        .where(model.user_id == user_id)
+        .limit(batch_size)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        delete(model).where(model.id.in_(batch)).execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def _claimable():
+    """
+    Jobs a worker may take: new ones, running ones whose lease expired
+    (their worker died) and failed ones due for a retry.
+    """
+    job = AccountDeletionJob
+    return or_(
+        job.status == "pending",
+        and_(
+            job.status == "running",
+            job.claimed_at < func.now() - timedelta(seconds=settings.ACCOUNT_DELETION_LEASE_SECONDS),
+        ),
+        and_(
+            job.status == "failed",
+            job.attempts < settings.ACCOUNT_DELETION_MAX_ATTEMPTS,
+            job.next_attempt_at <= func.now(),
+        ),
+    )
+
+
+async def claim_jobs(db: AsyncSession, job_id: Optional[str] = None) -> List[str]:
+    """
+    Marks claimable jobs (or just `job_id`) as running by this worker and
+    returns their ids. A single UPDATE, so two workers never claim the
+    same job: the second one re-checks the row after the first commits.
+    """
+    query = (
+        update(AccountDeletionJob)
+        .where(_claimable())
+        .values(
+            status="running",
+            claimed_at=func.now(),
+            attempts=AccountDeletionJob.attempts + 1,
+            error=None,
+        )
+        .returning(AccountDeletionJob.id)
+        .execution_options(synchronize_session=False)
+    )
+    if job_id is not None:
+        query = query.where(AccountDeletionJob.id == job_id)
+
+    job_ids = (await db.execute(query)).scalars().all()
+    await db.commit()
+    return list(job_ids)
+
+
+async def run_deletion_job(job_id: str, claimed: bool = False):
+    """
+    Purges the user's rows in bounded batches, committing after each batch
+    together with the job's progress and a renewed lease. Deleting "the
+    next N rows of this user" is idempotent, so a job interrupted by a
+    crash simply continues where it stopped when it is claimed again.
+    """
+    batch_size = settings.ACCOUNT_DELETION_BATCH_SIZE
+
+    async with AsyncSessionLocal() as db:
+        if not claimed and not await claim_jobs(db, job_id):
+            return
+
+        job = await db.get(AccountDeletionJob, job_id)
+        if not job:
+            return
+        attempts = job.attempts  # the rollback below expires `job`
+
+        try:
+            for model in PURGE_MODELS:
+                job.current_table = model.__tablename__
+                while True:
+                    deleted = await _delete_batch(db, model, job.user_id, batch_size)
+                    job.rows_deleted += deleted
+                    job.claimed_at = func.now()
+                    await db.commit()
+                    if deleted < batch_size:
+                        break
+                    # Let other requests use the connection pool between batches
+                    await asyncio.sleep(0)
+
+            job.current_table = User.__tablename__
+            await db.execute(delete(User).where(User.id == job.user_id))
+            job.status = "completed"
+            job.completed_at = func.now()
+            await db.commit()
+
+            logger.info(f"Account deletion job {job_id} completed ({job.rows_deleted} rows)")
+        except Exception as e:
+            await db.rollback()
+            retry_in = settings.ACCOUNT_DELETION_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+            await db.execute(
+                update(AccountDeletionJob)
+                .where(AccountDeletionJob.id == job_id)
+                .values(
+                    status="failed",
+                    error=str(e)[:500],
+                    next_attempt_at=func.now() + timedelta(seconds=retry_in),
+                )
+            )
+            await db.commit()
+            logger.error(f"Account deletion job {job_id} failed (attempt {attempts}, retry in {retry_in}s): {e}")
+
+
+def schedule_deletion_job(job_id: str, claimed: bool = False):
+    task = asyncio.create_task(run_deletion_job(job_id, claimed))
+    _running_jobs.add(task)
+    task.add_done_callback(_running_jobs.discard)
+
+
+async def resume_pending_jobs():
+    """
+    Claims and runs jobs that are pending, were left running by a dead
+    worker or are due for a retry. Safe to run from every worker.
+    """
+    async with AsyncSessionLocal() as db:
+        job_ids = await claim_jobs(db)
+
+    for job_id in job_ids:
+        logger.info(f"Resuming account deletion job {job_id}")
+        schedule_deletion_job(job_id, claimed=True)
+
+
+async def run_deletion_sweeper():
+    """
+    Runs resume_pending_jobs every ACCOUNT_DELETION_SWEEP_SECONDS.
+    Started from the app lifespan.
+    """
+    while True:
+        try:
+            await resume_pending_jobs()
+        except Exception as e:
+            logger.warning(f"Could not resume account deletion jobs: {e}")
+        await asyncio.sleep(settings.ACCOUNT_DELETION_SWEEP_SECONDS)
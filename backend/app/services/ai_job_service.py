@@ -0,0 +1,443 @@
+import asyncio
+import hashlib
+import itertools
+import json
+import time
+import uuid
+from dataclasses import dataclass, field, asdict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import get_cache, serialize
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.dependencies import get_ai_service
+from app.models.user_model import User
+from app.schemas.ai_insights_schema import AIWeeklyInsights
+from app.routers.health_router import weekly_summary
+from app.services.ai_service import AIService
+from app.services.insights_service import generate_rule_based_insights
+from app.services.trend_service import get_user_trends, describe_trends
+from app.utils.ai_parser import InsightsStreamParser
+from app.utils.async_iter import iterate_in_thread
+from app.utils.logger import logger
+
+# Lower runs first
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+PRIORITY_NAMES = {value: name for name, value in PRIORITIES.items()}
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+@dataclass
+class AIJob:
+    id: str
+    user_id: int
+    priority: int
+    data_version: int
+    status: str = "pending"
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    completed_at: Optional[float] = None
+
+
+async def stream_ai_insights(ai_service: AIService, **prompt_inputs) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Streams the model's JSON answer for the given prompt inputs and yields
+    (field, value) for each AIWeeklyInsights field as soon as it is
+    complete and valid, `summary` first, then ("result", AIWeeklyInsights
+    or None).
+
+    Fields that are missing or invalid when the stream ends are requested
+    again on their own (AI_REPAIR_ATTEMPTS), instead of regenerating the
+    whole answer. Complete results are cached by a digest of the inputs,
+    so the same signals, observations, risk level and trends never pay
+    for a second model call.
+    """
+    digest = hashlib.sha256(serialize(prompt_inputs)).hexdigest()
+    cache_key = f"ai_weekly:{digest}"
+    cache = get_cache()
+
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        for name, value in cached.model_dump().items():
+            yield name, value
+        yield "result", cached
+        return
+
+    parser = InsightsStreamParser()
+    async for chunk in iterate_in_thread(lambda: ai_service.stream_weekly_health_insights(**prompt_inputs)):
+        for name, value in parser.feed(chunk):
+            yield name, value
+
+    # Repair needs a valid part to build on; with nothing usable, fall back
+    attempts = settings.AI_REPAIR_ATTEMPTS
+    while parser.values and parser.missing_fields() and attempts > 0:
+        attempts -= 1
+        missing = parser.missing_fields()
+        logger.info(f"Repairing AI insights fields {missing} ({parser.errors or 'incomplete'})")
+
+        raw = await asyncio.to_thread(ai_service.repair_weekly_insights, dict(parser.values), missing)
+        repair = InsightsStreamParser()
+        repair.feed(raw)
+        for name in missing:
+            if name in repair.values:
+                parser.values[name] = repair.values[name]
+                yield name, repair.values[name]
+
+    result = parser.result()
+    if result is not None:
+        await cache.set(cache_key, result, settings.AI_INSIGHTS_CACHE_TTL_SECONDS)
+    yield "result", result
+
+
+async def generate_ai_insights(ai_service: AIService, **prompt_inputs) -> Optional[AIWeeklyInsights]:
+    result = None
+    async for name, value in stream_ai_insights(ai_service, **prompt_inputs):
+        if name == "result":
+            result = value
+    return result
+
+
+async def weekly_insights_context(db: AsyncSession, user: User) -> Tuple[Dict, Dict]:
+    """
+    Weekly summary → rule-based insights (ground truth) → rolling trends.
+    Returns the rule-based payload and the inputs for the AI prompt.
+    """
+    summary = await weekly_summary(db=db, current_user=user)
+
+    rule_insights = generate_rule_based_insights(summary)
+    trends = await get_user_trends(db, user)
+
+    payload = {
+        "period": summary["period"],
+        "user_id": user.id,
+
+        # Rule-based layer
+        "signals": rule_insights["signals"],
+        "observations": rule_insights["insights"],
+        "risk_level": rule_insights["risk_level"],
+        "risk_points": rule_insights["risk_points"],
+    }
+    prompt_inputs = {
+        "signals": rule_insights["signals"],
+        "observations": rule_insights["insights"],
+        "risk_level": rule_insights["risk_level"],
+        "trends": describe_trends(trends["metrics"]),
+    }
+    return payload, prompt_inputs
+
+
+async def build_weekly_ai_insights(db: AsyncSession, user: User, ai_service: AIService) -> Dict:
+    """
+    The weekly insights pipeline: rule-based context → AI explanation →
+    validated JSON. Shared by the synchronous endpoint and the job workers.
+    """
+    payload, prompt_inputs = await weekly_insights_context(db, user)
+    parsed_ai = await generate_ai_insights(ai_service, **prompt_inputs)
+
+    return {
+        **payload,
+
+        # AI layer (safe + structured)
+        "ai_insights": parsed_ai.dict() if parsed_ai else None,
+        "ai_fallback": parsed_ai is None,
+
+        "confidence": "rule-based + ai-assisted"
+    }
+
+
+async def run_insights_job(job: AIJob, ai_service: AIService) -> Dict:
+    async with AsyncSessionLocal() as db:
+        user = await db.get(User, job.user_id)
+        if not user or user.deleted_at is not None:
+            raise ValueError("User not found")
+        return await build_weekly_ai_insights(db, user, ai_service)
+
+
+class BaseJobQueue:
+    """
+    Worker pool shared by the queue backends. Subclasses provide
+    `_next()` (claim the next pending job) and `_finish(job)`.
+    """
+
+    def __init__(self):
+        self._workers: List[asyncio.Task] = []
+
+    def start(self, ai_service: AIService, workers: int):
+        self._workers = [
+            asyncio.create_task(self._work(ai_service)) for _ in range(workers)
+        ]
+
+    async def stop(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _renew_lease(self, job: AIJob):
+        """Keeps the claim on a running job alive; only shared queues need one"""
+
+    async def _work(self, ai_service: AIService):
+        while True:
+            try:
+                job = await self._next()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"AI job queue error: {e}")
+                await asyncio.sleep(1)
+                continue
+            if job is None:
+                continue
+
+            renewer = asyncio.create_task(self._renew_lease(job))
+            try:
+                job.result = await run_insights_job(job, ai_service)
+                job.status = "completed"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.status = "failed"
+                job.error = str(e)[:500]
+                logger.error(f"AI insights job {job.id} failed: {e}")
+            finally:
+                renewer.cancel()
+
+            job.completed_at = time.time()
+            await self._finish(job)
+
+
+class LocalJobQueue(BaseJobQueue):
+    """
+    In-process priority queue. Jobs live in this worker's memory, so
+    polling must reach the same process; use the Redis backend when
+    running several workers.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._seq = itertools.count()
+        self._jobs: Dict[str, AIJob] = {}
+        # (user_id, data_version) → id of the pending/running job for it
+        self._active: Dict[Tuple[int, int], str] = {}
+        self._done: Dict[str, asyncio.Event] = {}
+
+    def _expire(self):
+        cutoff = time.time() - settings.AI_JOB_TTL_SECONDS
+        for job_id in [j.id for j in self._jobs.values() if j.completed_at and j.completed_at < cutoff]:
+            del self._jobs[job_id]
+
+    async def submit(self, user_id: int, data_version: int, priority: int) -> Tuple[AIJob, bool]:
+        """
+        Enqueues a job, or returns the identical job already pending or
+        running for the same data. Returns (job, created).
+        """
+        self._expire()
+
+        existing = self._active.get((user_id, data_version))
+        if existing:
+            job = self._jobs[existing]
+            if job.status == "pending" and priority < job.priority:
+                # Re-queue at the higher priority; the old entry is skipped
+                job.priority = priority
+                self._queue.put_nowait((priority, next(self._seq), job.id))
+            return job, False
+
+        if len(self._active) >= settings.AI_JOB_MAX_PENDING:
+            raise JobQueueFull()
+
+        job = AIJob(id=uuid.uuid4().hex, user_id=user_id, priority=priority, data_version=data_version)
+        self._jobs[job.id] = job
+        self._active[(user_id, data_version)] = job.id
+        self._done[job.id] = asyncio.Event()
+        self._queue.put_nowait((priority, next(self._seq), job.id))
+        return job, True
+
+    async def get(self, job_id: str) -> Optional[AIJob]:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[AIJob]:
+        """
+        Returns the job once it is finished or `timeout` seconds passed.
+        """
+        event = self._done.get(job_id)
+        if event and timeout > 0:
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self._jobs.get(job_id)
+
+    async def _next(self) -> Optional[AIJob]:
+        _, _, job_id = await self._queue.get()
+        job = self._jobs.get(job_id)
+        if job is None or job.status != "pending":
+            return None
+        job.status = "running"
+        return job
+
+    async def _finish(self, job: AIJob):
+        self._active.pop((job.user_id, job.data_version), None)
+        event = self._done.pop(job.id, None)
+        if event:
+            event.set()
+
+
+# Moves the next job id from the queue to the lease set in one step, so
+# a worker that dies right after taking a job still leaves a lease behind.
+# Lease expiries use the Redis server clock, like the rate limiter, so
+# workers with skewed clocks agree on which leases have run out.
+CLAIM_JOB_LUA = """
+local popped = redis.call('ZPOPMIN', KEYS[1])
+if #popped == 0 then
+    return false
+end
+local t = redis.call('TIME')
+redis.call('ZADD', KEYS[2], tonumber(t[1]) + tonumber(ARGV[1]), popped[1])
+return popped[1]
+"""
+
+RENEW_LEASE_LUA = """
+local t = redis.call('TIME')
+return redis.call('ZADD', KEYS[1], 'XX', tonumber(t[1]) + tonumber(ARGV[1]), ARGV[2])
+"""
+
+
+class RedisJobQueue(BaseJobQueue):
+    """
+    Queue shared by every worker through a Redis-protocol server: pending
+    ids in a sorted set scored by (priority, arrival), job records as
+    JSON strings and a SET NX key per (user, data_version) for dedup.
+
+    Claimed jobs sit in a lease set scored by expiry, renewed while the
+    job runs. Jobs whose lease ran out (the worker died) are put back in
+    the queue by the next worker that looks.
+    """
+
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, client, prefix: str = "aijobs:"):
+        super().__init__()
+        self.client = client
+        self.prefix = prefix
+        self.queue_key = prefix + "queue"
+        self.lease_key = prefix + "leases"
+        self._claim = client.register_script(CLAIM_JOB_LUA)
+        self._renew = client.register_script(RENEW_LEASE_LUA)
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.prefix}job:{job_id}"
+
+    def _active_key(self, user_id: int, data_version: int) -> str:
+        return f"{self.prefix}active:{user_id}:{data_version}"
+
+    async def _save(self, job: AIJob):
+        await self.client.set(
+            self._job_key(job.id), json.dumps(asdict(job), default=str),
+            ex=settings.AI_JOB_TTL_SECONDS
+        )
+
+    async def get(self, job_id: str) -> Optional[AIJob]:
+        raw = await self.client.get(self._job_key(job_id))
+        return AIJob(**json.loads(raw)) if raw else None
+
+    async def submit(self, user_id: int, data_version: int, priority: int) -> Tuple[AIJob, bool]:
+        active_key = self._active_key(user_id, data_version)
+        job = AIJob(id=uuid.uuid4().hex, user_id=user_id, priority=priority, data_version=data_version)
+
+        if not await self.client.set(active_key, job.id, nx=True, ex=settings.AI_JOB_TTL_SECONDS):
+            existing_id = await self.client.get(active_key)
+            existing = await self.get(existing_id.decode()) if existing_id else None
+            if existing:
+                if existing.status == "pending" and priority < existing.priority:
+                    # XX: only if a worker has not claimed it meanwhile
+                    await self.client.zadd(self.queue_key, {existing.id: await self._score(priority)}, xx=True)
+                return existing, False
+            # The job record expired under its dedup key; take the key over
+            await self.client.set(active_key, job.id, ex=settings.AI_JOB_TTL_SECONDS)
+
+        if await self.client.zcard(self.queue_key) >= settings.AI_JOB_MAX_PENDING:
+            await self.client.delete(active_key)
+            raise JobQueueFull()
+
+        await self._save(job)
+        await self.client.zadd(self.queue_key, {job.id: await self._score(priority)})
+        return job, True
+
+    async def _score(self, priority: int) -> float:
+        # FIFO within a priority; stays well inside float precision
+        return priority * 1e12 + await self.client.incr(self.prefix + "seq")
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[AIJob]:
+        deadline = time.monotonic() + timeout
+        while True:
+            job = await self.get(job_id)
+            if job is None or job.completed_at or time.monotonic() >= deadline:
+                return job
+            await asyncio.sleep(min(self.POLL_INTERVAL, max(0.0, deadline - time.monotonic())))
+
+    async def _requeue_expired(self):
+        seconds, _ = await self.client.time()
+        expired = await self.client.zrangebyscore(self.lease_key, "-inf", seconds, start=0, num=10)
+        for raw_id in expired:
+            # ZREM decides which worker requeues it
+            if not await self.client.zrem(self.lease_key, raw_id):
+                continue
+            job = await self.get(raw_id.decode())
+            # Still "pending" when the worker died between the claim and saving the record
+            if job is None or job.status not in ("pending", "running"):
+                continue
+            job.status = "pending"
+            await self._save(job)
+            await self.client.zadd(self.queue_key, {job.id: await self._score(job.priority)})
+            logger.warning(f"AI insights job {job.id} lost its worker, requeued")
+
+    async def _next(self) -> Optional[AIJob]:
+        await self._requeue_expired()
+
+        job_id = await self._claim(keys=[self.queue_key, self.lease_key], args=[settings.AI_JOB_LEASE_SECONDS])
+        if not job_id:
+            await asyncio.sleep(self.POLL_INTERVAL)
+            return None
+
+        job = await self.get(job_id.decode())
+        if job is None or job.status != "pending":
+            await self.client.zrem(self.lease_key, job_id)
+            return None
+        job.status = "running"
+        await self._save(job)
+        return job
+
+    async def _renew_lease(self, job: AIJob):
+        while True:
+            await asyncio.sleep(settings.AI_JOB_LEASE_SECONDS / 3)
+            await self._renew(keys=[self.lease_key], args=[settings.AI_JOB_LEASE_SECONDS, job.id])
+
+    async def _finish(self, job: AIJob):
+        await self._save(job)
+        await self.client.zrem(self.lease_key, job.id)
+        active_key = self._active_key(job.user_id, job.data_version)
+        if await self.client.get(active_key) == job.id.encode():
+            await self.client.delete(active_key)
+
+
+def create_job_queue():
+    if settings.AI_JOB_BACKEND == "redis":
+        from app.core.redis import get_redis
+        return RedisJobQueue(get_redis())
+    return LocalJobQueue()
+
+
+def get_job_queue(request: Request):
+    queue = getattr(request.app.state, "ai_jobs", None)
+    if queue is None:
+        queue = request.app.state.ai_jobs = create_job_queue()
+        queue.start(get_ai_service(request), settings.AI_JOB_WORKERS)
+    return queue
@@ -1,9 +1,51 @@
-import vertexai
-from vertexai.preview.generative_models import GenerativeModel
-from typing import Dict, Any
+import json
+import threading
+from typing import Dict, Any, Iterator, List
 from app.core.config import settings
+from app.utils.logger import logger
 
-vertexai.init(project=settings.VERTEX_PROJECT_ID, location=settings.VERTEX_LOCATION)
+# Response schema for Gemini's constrained JSON mode. Properties are
+# ordered so `summary` is generated (and streamed) first.
+WEEKLY_INSIGHTS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "key_patterns": {"type": "array", "items": {"type": "string"}},
+        "suggestions": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["summary", "key_patterns", "suggestions"],
+    "property_ordering": ["summary", "key_patterns", "suggestions"],
+}
+
+
+def json_output_config(fields: List[str] | None = None):
+    """
+    GenerationConfig asking for JSON that matches WEEKLY_INSIGHTS_SCHEMA
+    (or just `fields` of it). None when structured output is disabled or
+    the installed SDK rejects the schema; callers then run in plain
+    mode and rely on the tolerant parser.
+    """
+    if not settings.AI_STRUCTURED_OUTPUT:
+        return None
+
+    schema = WEEKLY_INSIGHTS_SCHEMA
+    if fields:
+        schema = {
+            "type": "object",
+            "properties": {name: WEEKLY_INSIGHTS_SCHEMA["properties"][name] for name in fields},
+            "required": list(fields),
+            "property_ordering": list(fields),
+        }
+
+    # GenerationConfig converts the OpenAPI dict into the SDK's Schema
+    # (upper-case types etc.); a raw dict would be passed through as-is.
+    from vertexai.preview.generative_models import GenerationConfig
+
+    try:
+        return GenerationConfig(response_mime_type="application/json", response_schema=schema)
+    except Exception as e:
+        logger.warning(f"Structured output unavailable, using plain mode: {e}")
+        return None
 
 class AIService:
     """
@@ -11,23 +53,118 @@ class AIService:
     This class will be reused by:
     - Weekly AI insights
     - Health chatbot
+
+    One instance is shared per app (see `get_ai_service`). The Vertex SDK
+    is imported and initialized on first use, not at import time.
     """
 
     def __init__(self):
-        self.model = GenerativeModel(settings.VERTEX_MODEL_NAME)
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    # Heavy import (~1s); deferred so startup and /health stay fast
+                    import vertexai
+                    from vertexai.preview.generative_models import GenerativeModel
+
+                    vertexai.init(project=settings.VERTEX_PROJECT_ID, location=settings.VERTEX_LOCATION)
+                    self._model = GenerativeModel(settings.VERTEX_MODEL_NAME)
+        return self._model
+
+    @model.setter
+    def model(self, model):
+        self._model = model
 
     def generate_weekly_health_insights(
         self,
         signals: Dict[str, Any],
         observations: list[str],
-        risk_level: str
+        risk_level: str,
+        trends: list[str] | None = None
     ) -> Dict[str, Any]:
         """
         Generate AI-powered weekly health insights
-        using rule-based signals as grounding.
+        using rule-based signals (and rolling trends) as grounding.
         """
+        prompt = self.build_weekly_insights_prompt(signals, observations, risk_level, trends)
+        response = self.model.generate_content(prompt)
+
+        # Gemini returns text; frontend / router will parse JSON safely
+        return {
+            "raw_response": response.text
+        }
+
+    def stream_weekly_health_insights(
+        self,
+        signals: Dict[str, Any],
+        observations: list[str],
+        risk_level: str,
+        trends: list[str] | None = None
+    ) -> Iterator[str]:
+        """
+        Same prompt, streamed in schema-constrained JSON mode. Yields text
+        chunks as Gemini produces them.
+        """
+        prompt = self.build_weekly_insights_prompt(signals, observations, risk_level, trends)
+        config = json_output_config()
+        started = False
+        try:
+            for chunk in self.model.generate_content(prompt, generation_config=config, stream=True):
+                started = True
+                yield chunk.text
+        except Exception as e:
+            if config is None or started:
+                raise
+            logger.warning(f"Structured output rejected, retrying in plain mode: {e}")
+            for chunk in self.model.generate_content(prompt, stream=True):
+                yield chunk.text
+
+    def repair_weekly_insights(self, partial: Dict[str, Any], fields: List[str]) -> str:
+        """
+        Asks only for the `fields` that were missing or invalid, given
+        the valid part of the answer. Much shorter than a full retry.
+        """
+        prompt = self.build_repair_prompt(partial, fields)
+        config = json_output_config(fields)
+        try:
+            response = self.model.generate_content(prompt, generation_config=config)
+        except Exception as e:
+            if config is None:
+                raise
+            logger.warning(f"Structured output rejected, retrying in plain mode: {e}")
+            response = self.model.generate_content(prompt)
+        return response.text
+
+    @staticmethod
+    def build_repair_prompt(partial: Dict[str, Any], fields: List[str]) -> str:
+        example = {
+            name: "..." if WEEKLY_INSIGHTS_SCHEMA["properties"][name]["type"] == "string" else ["...", "..."]
+            for name in fields
+        }
+        return f"""
+You are a supportive wellness assistant. You are NOT a doctor: do not
+diagnose, do not suggest medicines or treatments.
+
+This is the valid part of a weekly wellness summary you wrote:
+{json.dumps(partial, ensure_ascii=False)}
 
-        prompt = f"""
+Complete it consistently. Return STRICT JSON with ONLY these keys:
+
+{json.dumps(example, indent=2)}
+"""
+
+    @staticmethod
+    def build_weekly_insights_prompt(
+        signals: Dict[str, Any],
+        observations: list[str],
+        risk_level: str,
+        trends: list[str] | None = None
+    ) -> str:
+        return f"""
 You are a supportive wellness assistant.
 
 IMPORTANT RULES:
@@ -46,6 +183,9 @@ Health signals (numeric summaries):
 Rule-based observations:
 {observations}
 
+Rolling trends (7 vs 30 days):
+{trends or "Not enough data"}
+
 TASK:
 1. Summarize the user's week in 2–3 sentences.
 2. Identify key contributing patterns.
@@ -60,21 +200,34 @@ Return your response in STRICT JSON with this format:
 }}
 """
 
+    def chat_about_health(
+        self,
+        user_message: str,
+        context: str,
+        memory: str
+    ) -> str:
+        prompt = self.build_chat_prompt(user_message, context, memory)
         response = self.model.generate_content(prompt)
+        return response.text
 
-        # Gemini returns text; frontend / router will parse JSON safely
-        return {
-            "raw_response": response.text
-        }
-
-
-    def chat_about_health(
+    def stream_chat_about_health(
         self,
         user_message: str,
         context: str,
         memory: str
+    ) -> Iterator[str]:
+        """Same prompt as chat_about_health; yields the reply in chunks"""
+        prompt = self.build_chat_prompt(user_message, context, memory)
+        for chunk in self.model.generate_content(prompt, stream=True):
+            yield chunk.text
+
+    @staticmethod
+    def build_chat_prompt(
+        user_message: str,
+        context: str,
+        memory: str
     ) -> str:
-        prompt = f"""
+        return f"""
 You are a practical AI health assistant named Amigo.
 
 STRICT BEHAVIOR RULES:
@@ -107,8 +260,3 @@ Response rules:
 - If question → structured, point-to-point answer
 - No unnecessary explanations
 """
-
-
-
-        response = self.model.generate_content(prompt)
-        return response.text
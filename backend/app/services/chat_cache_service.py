@@ -0,0 +1,164 @@
+import math
+import re
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+
+# Words that carry no topic; dropping them lets "how to sleep better" and
+# "tips for better sleep" map to the same vector
+STOP_WORDS = {
+    "a", "an", "the", "to", "for", "of", "in", "on", "at", "and", "or", "with", "about",
+    "how", "what", "why", "when", "which", "who", "is", "are", "was", "be", "do", "does",
+    "can", "could", "should", "would", "will", "i", "me", "my", "you", "your", "it",
+    "some", "any", "get", "give", "tell", "please", "tip", "tips", "way", "ways",
+    "advice", "suggest", "suggestions", "there", "that", "this", "more", "really",
+}
+
+HASH_DIMENSIONS = 1 << 20
+BIGRAM_WEIGHT = 0.5
+MIN_TERMS = 2  # shorter messages ("why?") depend on the conversation
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ing", "ed", "ly", "es", "s"):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+def _terms(text: str) -> list:
+    return [_stem(w) for w in _WORD_RE.findall(text.lower()) if w not in STOP_WORDS]
+
+
+def vectorize(text: str) -> Dict[int, float]:
+    """
+    Hashed bag of stemmed words plus (down-weighted) bigrams, with
+    sublinear term frequency and L2 normalization. Sparse: index → weight.
+    """
+    terms = _terms(text)
+    features = [(term, 1.0) for term in terms]
+    features += [(f"{a} {b}", BIGRAM_WEIGHT) for a, b in zip(terms, terms[1:])]
+
+    counts: Dict[int, float] = {}
+    weights: Dict[int, float] = {}
+    for feature, weight in features:
+        index = zlib.crc32(feature.encode()) % HASH_DIMENSIONS
+        counts[index] = counts.get(index, 0) + 1
+        weights[index] = weight
+
+    vector = {index: weights[index] * (1 + math.log(count)) for index, count in counts.items()}
+    norm = math.sqrt(sum(w * w for w in vector.values()))
+    return {index: w / norm for index, w in vector.items()} if norm else {}
+
+
+def cosine(a: Dict[int, float], b: Dict[int, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b.get(index, 0.0) for index, w in a.items())
+
+
+class SemanticCache:
+    """
+    Nearest-neighbour cache of chat replies. Entries are grouped by
+    bucket (the risk level, plus the user for replies grounded on their
+    own data), and a lookup returns the reply of the most similar
+    question in the bucket when the cosine similarity reaches
+    `threshold`. LRU eviction over all buckets and a TTL per entry.
+    """
+
+    def __init__(self, threshold: float, ttl_seconds: float, max_entries: int):
+        self.threshold = threshold
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[str, Dict[int, float], str, float]]" = OrderedDict()
+        self._buckets: Dict[str, set] = {}
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def cacheable(question: str) -> bool:
+        return len(set(_terms(question))) >= MIN_TERMS
+
+    def _remove(self, entry_id: int):
+        bucket = self._entries.pop(entry_id)[0]
+        ids = self._buckets[bucket]
+        ids.discard(entry_id)
+        if not ids:
+            del self._buckets[bucket]
+
+    def lookup(self, question: str, bucket: str) -> Optional[str]:
+        vector = vectorize(question)
+        now = time.monotonic()
+        best_id, best_score = None, self.threshold
+
+        for entry_id in list(self._buckets.get(bucket, ())):
+            _, entry_vector, _, expires_at = self._entries[entry_id]
+            if expires_at < now:
+                self._remove(entry_id)
+                continue
+            score = cosine(vector, entry_vector)
+            if score >= best_score:
+                best_id, best_score = entry_id, score
+
+        if best_id is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(best_id)
+        return self._entries[best_id][2]
+
+    def store(self, question: str, bucket: str, reply: str):
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = (bucket, vectorize(question), reply, time.monotonic() + self.ttl)
+        self._buckets.setdefault(bucket, set()).add(entry_id)
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "buckets": len(self._buckets),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "threshold": self.threshold,
+        }
+
+
+_chat_cache: Optional[SemanticCache] = None
+
+
+def get_chat_cache() -> SemanticCache:
+    global _chat_cache
+    if _chat_cache is None:
+        _chat_cache = SemanticCache(
+            settings.CHAT_CACHE_SIMILARITY,
+            settings.CHAT_CACHE_TTL_SECONDS,
+            settings.CHAT_CACHE_MAX_ENTRIES,
+        )
+    return _chat_cache
+
+
+def chat_cache_bucket(risk_level: Optional[str], user_id: Optional[int] = None) -> str:
+    """
+    General questions share one bucket across users. Replies grounded on
+    a user's own context stay with that user, per risk level. Cacheable
+    questions are answered without chat memory, so nothing in the shared
+    bucket comes from one user's conversation.
+    """
+    if risk_level is None:
+        return "general"
+    return f"{risk_level}:{user_id}"
@@ -0,0 +1,103 @@
+import random
+import re
+from typing import Optional
+
+# Small talk answered from templates, without context loading or the LLM.
+# A message qualifies only if every word is one of these phrases or filler.
+TRIVIAL_PHRASES = {
+    "thanks": [
+        "thank you", "thanks", "thank u", "thx", "ty", "tysm", "much appreciated",
+        "appreciate it", "cheers",
+    ],
+    "farewell": [
+        "good night", "see you", "see ya", "bye", "goodbye", "gn", "later", "take care",
+    ],
+    "greeting": [
+        "good morning", "good afternoon", "good evening", "hi", "hii", "hello", "hey",
+        "heya", "hiya", "yo", "namaste", "howdy", "sup",
+    ],
+    "acknowledgment": [
+        "got it", "sounds good", "makes sense", "will do", "ok", "okay", "k", "kk",
+        "cool", "great", "nice", "sure", "alright", "fine", "perfect", "awesome", "noted",
+    ],
+}
+
+FILLER_WORDS = {"there", "amigo", "so", "much", "a", "lot", "very", "again", "and", "then", "for", "now", "the", "info"}
+
+# First match wins when a message mixes intents ("ok thanks bye")
+INTENT_PRIORITY = ("thanks", "farewell", "greeting", "acknowledgment")
+
+TEMPLATES = {
+    "greeting": [
+        "Hi{name}! How can I help with your health today?",
+        "Hello{name}! What would you like to know?",
+    ],
+    "thanks": [
+        "You're welcome{name}! Ask me anytime.",
+        "Happy to help{name}!",
+    ],
+    "acknowledgment": [
+        "Great — I'm here if you need anything else.",
+        "Sounds good. Let me know if anything else comes up.",
+    ],
+    "farewell": [
+        "Take care{name}! Come back anytime.",
+        "Bye{name}, look after yourself!",
+    ],
+}
+
+# Words that point at the user's own logs; without one of them a
+# question is answered as general health advice, without the weekly context
+PERSONAL_WORDS = {
+    "i", "i'm", "im", "i've", "ive", "my", "me", "myself", "am", "mine",
+    "lately", "recently", "today", "yesterday", "tonight", "week", "weekly",
+    "month", "days", "trend", "trends", "progress", "data", "logs", "logged",
+}
+
+_PHRASES = sorted(
+    ((phrase.split(), intent) for intent, phrases in TRIVIAL_PHRASES.items() for phrase in phrases),
+    key=lambda item: -len(item[0])
+)
+_WORD_RE = re.compile(r"[a-z']+")
+MAX_TRIVIAL_WORDS = 6
+
+
+def _words(message: str) -> list:
+    return _WORD_RE.findall(message.lower())
+
+
+def classify_intent(message: str) -> Optional[str]:
+    """
+    Returns "greeting", "thanks", "acknowledgment" or "farewell" when the
+    whole message is small talk, otherwise None (a real question).
+    """
+    words = _words(message)
+    if not words or len(words) > MAX_TRIVIAL_WORDS:
+        return None
+
+    found, i = set(), 0
+    while i < len(words):
+        for phrase, intent in _PHRASES:
+            if words[i:i + len(phrase)] == phrase:
+                found.add(intent)
+                i += len(phrase)
+                break
+        else:
+            if words[i] not in FILLER_WORDS:
+                return None
+            i += 1
+
+    return next((intent for intent in INTENT_PRIORITY if intent in found), None)
+
+
+def template_reply(intent: str, full_name: Optional[str] = None) -> str:
+    first_name = full_name.split()[0] if full_name and full_name.strip() else ""
+    return random.choice(TEMPLATES[intent]).format(name=f" {first_name}" if first_name else "")
+
+
+def needs_health_context(message: str) -> bool:
+    """
+    True when the message refers to the user's own data or recent days,
+    so the weekly summary, rules and trends are worth loading.
+    """
+    return any(word in PERSONAL_WORDS for word in _words(message))
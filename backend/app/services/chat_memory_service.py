@@ -19,6 +19,19 @@ async def save_message(
     db.add(message)
     await db.commit()
 
+async def save_exchange(
+    db: AsyncSession,
+    user_id: int,
+    user_message: str,
+    reply: str
+):
+    """Stores a user message and its reply in one commit"""
+    db.add_all([
+        ChatMessage(user_id=user_id, role="user", content=user_message),
+        ChatMessage(user_id=user_id, role="assistant", content=reply),
+    ])
+    await db.commit()
+
 async def get_recent_messages(
     db: AsyncSession,
     user_id: int
@@ -26,7 +39,9 @@ async def get_recent_messages(
     result = await db.execute(
         select(ChatMessage)
         .where(ChatMessage.user_id == user_id)
-        .order_by(ChatMessage.created_at.desc())
+        # Matches ix_chat_messages_user_created; id orders a user message
+        # and its reply, which share a created_at
+        .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
         .limit(MAX_MEMORY)
     )
     messages = result.scalars().all()
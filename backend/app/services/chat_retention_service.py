@@ -0,0 +1,478 @@
+import asyncio
+import itertools
+import zlib
+from datetime import date, datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional
+
+import orjson
+from sqlalchemy import column, delete, distinct, select, table, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.models.chat_message_model import ChatMessage
+from app.models.chat_message_archive_model import ChatMessageArchive
+from app.models.user_model import User
+from app.utils.logger import logger
+
+PARTITION_PREFIX = "chat_messages_p"
+DEFAULT_PARTITION = "chat_messages_default"
+
+# pg_advisory_lock key, so only one worker runs the job at a time
+RETENTION_LOCK_ID = 0x63686174
+
+# How long DETACH waits for its lock on chat_messages (while chat queries
+# queue behind it) before the pass gives up and retries next time
+DETACH_LOCK_TIMEOUT = "5s"
+
+# What an archived message keeps: everything but user_id, which is on
+# the archive row
+ARCHIVE_COLUMNS = [column for column in ChatMessage.__table__.columns if column.name != "user_id"]
+
+
+def _next_month(month: date) -> date:
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y_%m}"
+
+
+def create_partition_sql(month: date) -> str:
+    """
+    Idempotent DDL for the partition holding `month` (UTC). Skipped with
+    a warning when the default partition already has rows for it.
+    """
+    return f"""
+DO $$
+BEGIN
+    CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF chat_messages
+        FOR VALUES FROM ('{month} 00:00+00') TO ('{_next_month(month)} 00:00+00');
+EXCEPTION WHEN check_violation THEN
+    RAISE WARNING '{DEFAULT_PARTITION} has rows for {month:%Y-%m}, partition not created';
+END $$"""
+
+
+def partition_months(today: Optional[date] = None) -> List[date]:
+    """
+    The months that should have a partition: the retention window (a
+    year when everything is kept) up to CHAT_PARTITION_MONTHS_AHEAD.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    window = settings.CHAT_RETENTION_DAYS or 365
+    month = (today - timedelta(days=window)).replace(day=1)
+    last = today.replace(day=1)
+    for _ in range(settings.CHAT_PARTITION_MONTHS_AHEAD):
+        last = _next_month(last)
+
+    months = []
+    while month <= last:
+        months.append(month)
+        month = _next_month(month)
+    return months
+
+
+# Run by app/migrate.py before the tables are created: an unpartitioned
+# chat_messages (created before partitioning) is moved out of the way,
+# with its indexes and sequence, so the partitioned table can be created
+# under the same names.
+PRE_PARTITIONING_SQL = """
+DO $$
+DECLARE
+    index_name text;
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_class WHERE relname = 'chat_messages' AND relkind = 'r') THEN
+        ALTER TABLE chat_messages RENAME TO chat_messages_unpartitioned;
+        FOR index_name IN
+            SELECT indexname FROM pg_indexes WHERE tablename = 'chat_messages_unpartitioned'
+        LOOP
+            EXECUTE format('ALTER INDEX %I RENAME TO %I', index_name, index_name || '_unpartitioned');
+        END LOOP;
+        ALTER SEQUENCE IF EXISTS chat_messages_id_seq RENAME TO chat_messages_unpartitioned_id_seq;
+    END IF;
+END $$"""
+
+# Copies the old rows into the partitioned table, creating a partition
+# for every month they cover, then drops the old table. Months older
+# than the retention window are archived by the next job run.
+COPY_UNPARTITIONED_SQL = f"""
+DO $$
+DECLARE
+    month date;
+BEGIN
+    IF to_regclass('chat_messages_unpartitioned') IS NULL THEN
+        RETURN;
+    END IF;
+
+    FOR month IN
+        SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC')::date
+        FROM chat_messages_unpartitioned
+        WHERE created_at IS NOT NULL
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF chat_messages FOR VALUES FROM (%L) TO (%L)',
+            '{PARTITION_PREFIX}' || to_char(month, 'YYYY_MM'),
+            month || ' 00:00+00',
+            (month + interval '1 month')::date || ' 00:00+00'
+        );
+    END LOOP;
+
+    INSERT INTO chat_messages (id, user_id, role, content, created_at)
+    SELECT id, user_id, role, content, coalesce(created_at, now())
+    FROM chat_messages_unpartitioned;
+
+    PERFORM setval(
+        pg_get_serial_sequence('chat_messages', 'id'),
+        coalesce((SELECT max(id) FROM chat_messages), 0) + 1,
+        false
+    );
+    DROP TABLE chat_messages_unpartitioned;
+END $$"""
+
+
+def partition_statements() -> List[str]:
+    """
+    DDL for the chat_messages partitions, applied by app/migrate.py.
+    """
+    return [
+        f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF chat_messages DEFAULT",
+        *(create_partition_sql(month) for month in partition_months()),
+        COPY_UNPARTITIONED_SQL,
+    ]
+
+
+def compress_messages(rows: List[Dict]) -> bytes:
+    return zlib.compress(b"".join(orjson.dumps(row, option=orjson.OPT_UTC_Z) + b"\n" for row in rows))
+
+
+def decompress_messages(payload: bytes) -> List[Dict]:
+    messages = [orjson.loads(line) for line in zlib.decompress(payload).splitlines()]
+    for message in messages:
+        message["created_at"] = datetime.fromisoformat(message["created_at"])
+    return messages
+
+
+def _archive_rows(db: AsyncSession, user_id: int, rows: List) -> int:
+    """
+    Adds archive rows for one user's messages (oldest first), in chunks
+    of CHAT_ARCHIVE_CHUNK_MESSAGES.
+    """
+    chunk_size = settings.CHAT_ARCHIVE_CHUNK_MESSAGES
+    for start in range(0, len(rows), chunk_size):
+        chunk = [
+            {column.name: getattr(row, column.name) for column in ARCHIVE_COLUMNS}
+            for row in rows[start:start + chunk_size]
+        ]
+        db.add(ChatMessageArchive(
+            user_id=user_id,
+            first_message_at=chunk[0]["created_at"],
+            last_message_at=chunk[-1]["created_at"],
+            message_count=len(chunk),
+            payload=compress_messages(chunk),
+        ))
+    return len(rows)
+
+
+async def archived_messages(db: AsyncSession, user_id: int) -> AsyncIterator[List[Dict]]:
+    """
+    The user's archived messages, oldest first, one archive row at a
+    time, as dicts of ARCHIVE_COLUMNS.
+    """
+    result = await db.stream(
+        select(ChatMessageArchive.payload)
+        .where(ChatMessageArchive.user_id == user_id)
+        .order_by(ChatMessageArchive.first_message_at, ChatMessageArchive.id)
+        .execution_options(yield_per=16)
+    )
+    async for payload in result.scalars():
+        yield decompress_messages(payload)
+
+
+async def ensure_partitions():
+    async with engine.begin() as conn:
+        for month in partition_months():
+            await conn.execute(text(create_partition_sql(month)))
+
+
+async def _expired_partitions(db: AsyncSession, cutoff: date) -> List[date]:
+    """
+    Months whose partition lies entirely before `cutoff`, including
+    partitions an interrupted run has already detached.
+    """
+    result = await db.execute(
+        text(
+            "SELECT relname FROM pg_class "
+            "WHERE relkind = 'r' AND starts_with(relname, :prefix) AND pg_table_is_visible(oid)"
+        ),
+        {"prefix": PARTITION_PREFIX},
+    )
+    months = []
+    for name in result.scalars():
+        try:
+            month = datetime.strptime(name[len(PARTITION_PREFIX):], "%Y_%m").date()
+        except ValueError:
+            continue
+        if _next_month(month) <= cutoff:
+            months.append(month)
+    return sorted(months)
+
+
+def _message_table(name: str):
+    """A chat_messages partition by name, usable once detached too"""
+    return table(name, *(column(c.name, c.type) for c in ChatMessage.__table__.columns))
+
+
+def _archive_select(messages):
+    """Rows to archive from `messages`, skipping accounts being deleted"""
+    return (
+        select(messages.c.user_id, *(messages.c[c.name] for c in ARCHIVE_COLUMNS))
+        .join(User, User.id == messages.c.user_id)
+        .where(User.deleted_at.is_(None))
+    )
+
+
+async def _detach_partition(name: str):
+    """
+    Detaches the partition from chat_messages so archiving and dropping
+    it happen outside the parent table, then drops its foreign key to
+    users (which would otherwise block account purges until the drop).
+
+    A plain DETACH takes ACCESS EXCLUSIVE on chat_messages for the
+    catalog update; chat traffic waits for it, at most DETACH_LOCK_TIMEOUT,
+    after which the pass fails and the next one retries.
+    DETACH ... CONCURRENTLY is not an option: PostgreSQL refuses it while
+    chat_messages has a default partition.
+    """
+    async with engine.begin() as conn:
+        await conn.execute(text(f"SET LOCAL lock_timeout = '{DETACH_LOCK_TIMEOUT}'"))
+        attached = await conn.scalar(
+            text("SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(:name)"), {"name": name}
+        )
+        if attached:
+            await conn.execute(text(f"ALTER TABLE chat_messages DETACH PARTITION {name}"))
+        foreign_keys = await conn.execute(
+            text("SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(:name) AND contype = 'f'"),
+            {"name": name},
+        )
+        for foreign_key in foreign_keys.scalars().all():
+            await conn.execute(text(f'ALTER TABLE {name} DROP CONSTRAINT "{foreign_key}"'))
+
+
+async def archive_partition(month: date) -> int:
+    """
+    Detaches the month's partition, archives its messages user by user
+    and drops it. Archiving and the drop share one transaction on the
+    detached table: a failed run leaves it in place and the next run
+    starts over. Dropping the table leaves no dead rows to vacuum.
+    """
+    name = partition_name(month)
+    await _detach_partition(name)
+
+    messages = _message_table(name)
+    batch_size = settings.CHAT_ARCHIVE_CHUNK_MESSAGES
+    key = (messages.c.user_id, messages.c.created_at, messages.c.id)
+    archived = 0
+
+    async with AsyncSessionLocal() as db:
+        last, user_id, pending = None, None, []
+        while True:
+            # Keyset pages in (user_id, created_at, id) index order
+            query = _archive_select(messages).order_by(*key).limit(batch_size)
+            if last is not None:
+                query = query.where(tuple_(*key) > tuple_(*last))
+            rows = (await db.execute(query)).all()
+
+            for row in rows:
+                if pending and (row.user_id != user_id or len(pending) >= batch_size):
+                    archived += _archive_rows(db, user_id, pending)
+                    pending = []
+                user_id = row.user_id
+                pending.append(row)
+
+            if len(rows) < batch_size:
+                break
+            last = (rows[-1].user_id, rows[-1].created_at, rows[-1].id)
+            await db.flush()
+
+        if pending:
+            archived += _archive_rows(db, user_id, pending)
+
+        await db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        await db.commit()
+
+    logger.info(f"Archived {archived} chat messages from {name}")
+    return archived
+
+
+async def archive_default_partition(cutoff: datetime) -> int:
+    """
+    Archives and deletes messages older than `cutoff` that landed in the
+    default partition (months that had no partition yet), one batch per
+    transaction.
+    """
+    messages = _message_table(DEFAULT_PARTITION)
+    batch_size = settings.CHAT_ARCHIVE_CHUNK_MESSAGES
+    key = (messages.c.user_id, messages.c.created_at, messages.c.id)
+    archived = 0
+
+    async with AsyncSessionLocal() as db:
+        last = None
+        while True:
+            query = (
+                _archive_select(messages)
+                .where(messages.c.created_at < cutoff)
+                .order_by(*key)
+                .limit(batch_size)
+            )
+            if last is not None:
+                query = query.where(tuple_(*key) > tuple_(*last))
+            rows = (await db.execute(query)).all()
+            if not rows:
+                break
+
+            for user_id, user_rows in itertools.groupby(rows, key=lambda row: row.user_id):
+                archived += _archive_rows(db, user_id, list(user_rows))
+            await db.execute(delete(messages).where(messages.c.id.in_([row.id for row in rows])))
+            await db.commit()
+
+            if len(rows) < batch_size:
+                break
+            last = (rows[-1].user_id, rows[-1].created_at, rows[-1].id)
+
+    if archived:
+        logger.info(f"Archived {archived} chat messages from {DEFAULT_PARTITION}")
+    return archived
+
+
+async def enforce_user_limit(user_id: int, limit: int) -> int:
+    """
+    Archives the user's messages beyond the newest `limit`, oldest first,
+    one batch per transaction (archive rows and DELETE together). Stops
+    as soon as the account is being deleted.
+    """
+    batch_size = settings.CHAT_ARCHIVE_CHUNK_MESSAGES
+    key = (ChatMessage.created_at, ChatMessage.id)
+    archived = 0
+
+    async with AsyncSessionLocal() as db:
+        boundary = (await db.execute(
+            select(*key)
+            .where(ChatMessage.user_id == user_id)
+            .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+            .offset(limit)
+            .limit(1)
+        )).first()
+        if boundary is None:
+            return 0
+
+        while True:
+            rows = (await db.execute(
+                select(*ARCHIVE_COLUMNS)
+                .join(User, User.id == ChatMessage.user_id)
+                .where(
+                    ChatMessage.user_id == user_id,
+                    User.deleted_at.is_(None),
+                    tuple_(*key) <= tuple_(*boundary),
+                )
+                .order_by(*key)
+                .limit(batch_size)
+            )).all()
+            if not rows:
+                break
+
+            archived += _archive_rows(db, user_id, rows)
+            await db.execute(
+                delete(ChatMessage)
+                .where(
+                    ChatMessage.user_id == user_id,
+                    tuple_(*key) <= tuple_(rows[-1].created_at, rows[-1].id),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+            if len(rows) < batch_size:
+                break
+            await asyncio.sleep(0)
+
+    return archived
+
+
+async def run_retention(now: Optional[datetime] = None) -> Dict:
+    """
+    One pass of the retention policy:
+    1. partitions exist for the coming months,
+    2. months older than CHAT_RETENTION_DAYS are archived and dropped,
+       and older rows in the default partition are archived,
+    3. users who chatted since the previous pass keep at most
+       CHAT_MAX_MESSAGES_PER_USER messages in chat_messages,
+    4. archives older than CHAT_ARCHIVE_RETENTION_DAYS are deleted.
+    """
+    now = now or datetime.now(timezone.utc)
+    stats = {"partitions_archived": 0, "messages_archived": 0, "users_trimmed": 0, "archives_deleted": 0}
+
+    await ensure_partitions()
+
+    if settings.CHAT_RETENTION_DAYS:
+        cutoff = (now - timedelta(days=settings.CHAT_RETENTION_DAYS)).date()
+        async with AsyncSessionLocal() as db:
+            months = await _expired_partitions(db, cutoff)
+        for month in months:
+            stats["messages_archived"] += await archive_partition(month)
+            stats["partitions_archived"] += 1
+        stats["messages_archived"] += await archive_default_partition(
+            now - timedelta(days=settings.CHAT_RETENTION_DAYS)
+        )
+
+    if settings.CHAT_MAX_MESSAGES_PER_USER:
+        # Only users who wrote since the previous pass can have gone over
+        since = now - timedelta(seconds=2 * settings.CHAT_RETENTION_INTERVAL_SECONDS)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(distinct(ChatMessage.user_id))
+                .join(User, User.id == ChatMessage.user_id)
+                .where(ChatMessage.created_at >= since, User.deleted_at.is_(None))
+            )
+            user_ids = result.scalars().all()
+        for user_id in user_ids:
+            archived = await enforce_user_limit(user_id, settings.CHAT_MAX_MESSAGES_PER_USER)
+            if archived:
+                stats["messages_archived"] += archived
+                stats["users_trimmed"] += 1
+
+    if settings.CHAT_ARCHIVE_RETENTION_DAYS:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                delete(ChatMessageArchive)
+                .where(ChatMessageArchive.last_message_at < now - timedelta(days=settings.CHAT_ARCHIVE_RETENTION_DAYS))
+                .execution_options(synchronize_session=False)
+            )
+            stats["archives_deleted"] = result.rowcount
+            await db.commit()
+
+    return stats
+
+
+async def run_retention_loop():
+    """
+    Runs the retention policy every CHAT_RETENTION_INTERVAL_SECONDS.
+    Started from the app lifespan; with several workers, an advisory
+    lock lets only one of them run each pass.
+    """
+    while True:
+        try:
+            async with engine.connect() as conn:
+                locked = await conn.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": RETENTION_LOCK_ID})
+                # Session-level lock: it outlives the transaction
+                await conn.commit()
+                if locked:
+                    try:
+                        stats = await run_retention()
+                        logger.info(f"Chat retention pass: {stats}")
+                    finally:
+                        await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": RETENTION_LOCK_ID})
+                        await conn.commit()
+        except Exception as e:
+            logger.error(f"Chat retention pass failed: {e}")
+
+        await asyncio.sleep(settings.CHAT_RETENTION_INTERVAL_SECONDS)
@@ -0,0 +1,151 @@
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.dependencies import get_active_user
+from app.models.chat_message_model import ChatMessage
+from app.models.user_model import User
+from app.routers.health_router import weekly_summary
+from app.services.chat_memory_service import MAX_MEMORY, get_recent_messages
+from app.services.insights_service import generate_rule_based_insights
+from app.services.trend_service import get_user_trends, describe_trends
+from app.utils.logger import logger
+
+
+async def build_health_context(db: AsyncSession, current_user: User) -> Tuple[str, str]:
+    """Prompt context from the weekly summary, rules and trends, plus the risk level"""
+    summary = await weekly_summary(db=db, current_user=current_user)
+    rules = generate_rule_based_insights(summary)
+    trends = await get_user_trends(db, current_user)
+
+    context = f"""
+Risk level: {rules['risk_level']}
+Signals: {rules['signals']}
+Observations: {rules['insights']}
+Trends: {describe_trends(trends['metrics'])}
+"""
+    return context, rules["risk_level"]
+
+
+class AccountGone(Exception):
+    pass
+
+
+class SessionExpired(Exception):
+    pass
+
+
+class ChatSession:
+    """
+    State of one /ai/chat/ws connection. The conversation memory is
+    loaded once and then kept in step with the messages of the session.
+    The health context is rebuilt only when the user has logged new data
+    (data_version changed) or the day has rolled over.
+
+    Messages are written by a background task, in order and in batches,
+    so a reply never waits for its INSERTs. `close()` flushes them.
+    """
+
+    def __init__(self, user: User, expires_at: Optional[float] = None):
+        self.user_id = user.id
+        self.full_name = user.full_name
+        self.expires_at = expires_at
+        self._checked_at = time.monotonic()
+        self.history: deque = deque(maxlen=MAX_MEMORY)
+        self._context: Optional[Tuple[str, str]] = None
+        self._context_key: Optional[Tuple[int, str]] = None
+        self._pending: asyncio.Queue = asyncio.Queue()
+        self._writer: Optional[asyncio.Task] = None
+
+    async def start(self, db: AsyncSession):
+        messages = await get_recent_messages(db, self.user_id)
+        self.history.extend((m.role, m.content) for m in messages)
+        self._writer = asyncio.create_task(self._write_loop(), name=f"chat-writer-{self.user_id}")
+
+    async def close(self):
+        if self._writer is None:
+            return
+        await self._pending.join()
+        self._writer.cancel()
+        await asyncio.gather(self._writer, return_exceptions=True)
+        self._writer = None
+
+    def memory_text(self) -> str:
+        return "\n".join(f"{role}: {content}" for role, content in self.history)
+
+    def record(self, role: str, content: str):
+        """Adds a message to the memory now and queues it for the database"""
+        self.history.append((role, content))
+        self._pending.put_nowait(ChatMessage(
+            user_id=self.user_id,
+            role=role,
+            content=content,
+            # Set here so batched rows keep their order
+            created_at=datetime.now(timezone.utc),
+        ))
+
+    def _check_token(self):
+        if self.expires_at is not None and time.time() >= self.expires_at:
+            raise SessionExpired()
+
+    async def ensure_active(self):
+        """
+        Raises SessionExpired once the access token has expired, and
+        AccountGone once the account is deleted. The account is looked up
+        at most every CHAT_WS_ACCOUNT_CHECK_SECONDS (health_context()
+        counts as a check); the writer also drops messages of deleted
+        accounts.
+        """
+        self._check_token()
+        if time.monotonic() - self._checked_at < settings.CHAT_WS_ACCOUNT_CHECK_SECONDS:
+            return
+        async with AsyncSessionLocal() as db:
+            if await get_active_user(db, self.user_id) is None:
+                raise AccountGone()
+        self._checked_at = time.monotonic()
+
+    async def health_context(self) -> Tuple[str, str]:
+        """
+        (context, risk_level), rebuilt only when stale. Raises AccountGone
+        or SessionExpired like ensure_active(), with the one user lookup
+        it needs anyway.
+        """
+        self._check_token()
+        async with AsyncSessionLocal() as db:
+            user = await get_active_user(db, self.user_id)
+            if user is None:
+                raise AccountGone()
+            self._checked_at = time.monotonic()
+
+            key = (user.data_version or 0, datetime.utcnow().date().isoformat())
+            if self._context is None or key != self._context_key:
+                self._context = await build_health_context(db, user)
+                self._context_key = key
+
+        return self._context
+
+    async def _write_loop(self):
+        while True:
+            batch: List[ChatMessage] = [await self._pending.get()]
+            while not self._pending.empty():
+                batch.append(self._pending.get_nowait())
+
+            try:
+                async with AsyncSessionLocal() as db:
+                    # Nothing may land after an account purge has started
+                    if await get_active_user(db, self.user_id) is None:
+                        logger.info(f"Dropped {len(batch)} chat messages of deleted user {self.user_id}")
+                    else:
+                        db.add_all(batch)
+                        await db.commit()
+            except Exception as e:
+                logger.error(f"Could not save {len(batch)} chat messages for user {self.user_id}: {e}")
+            finally:
+                for _ in batch:
+                    self._pending.task_done()
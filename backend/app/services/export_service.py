@@ -0,0 +1,122 @@
+import csv
+import io
+import zlib
+from typing import AsyncIterator, Iterable, List
+
+import orjson
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.diet_model import Diet
+from app.models.symptom_model import Symptom
+from app.models.medication_model import Medication
+from app.models.lifestyle_model import Lifestyle
+from app.models.chat_message_model import ChatMessage
+from app.repository.repository import data_columns
+from app.services.chat_retention_service import archived_messages
+
+EXPORT_MODELS = {
+    "diets": Diet,
+    "symptoms": Symptom,
+    "medications": Medication,
+    "lifestyles": Lifestyle,
+    "chat_messages": ChatMessage,
+}
+
+
+def export_columns(model) -> list:
+    # user_id is implied by the export itself
+    return [column for column in data_columns(model) if column.name != "user_id"]
+
+
+def csv_header() -> List[str]:
+    """
+    One CSV for every type: a `type` column followed by the union of all
+    exported columns; cells that don't apply to a row stay empty.
+    """
+    header = ["type"]
+    for model in EXPORT_MODELS.values():
+        for column in export_columns(model):
+            if column.name not in header:
+                header.append(column.name)
+    return header
+
+
+async def _stream_rows(user_id: int) -> AsyncIterator[tuple]:
+    """
+    Yields (type, rows) batches of dicts using server-side cursors, so
+    memory use stays at one batch regardless of history size. Archived
+    chat messages come first, they are older than the ones still in
+    chat_messages.
+    """
+    async with AsyncSessionLocal() as db:
+        for name, model in EXPORT_MODELS.items():
+            if model is ChatMessage:
+                async for rows in archived_messages(db, user_id):
+                    yield name, rows
+
+            query = (
+                select(*export_columns(model))
+                .where(model.user_id == user_id)
+                .order_by(model.created_at, model.id)
+                .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+            )
+            if hasattr(model, "deleted_at"):
+                query = query.where(model.deleted_at.is_(None))
+
+            result = await db.stream(query)
+            async for partition in result.partitions():
+                yield name, [row._asdict() for row in partition]
+
+
+def _ndjson_lines(name: str, rows: Iterable) -> bytes:
+    return b"".join(
+        orjson.dumps({"type": name, **row}, option=orjson.OPT_UTC_Z) + b"\n"
+        for row in rows
+    )
+
+
+def _csv_lines(writer: csv.DictWriter, buffer: io.StringIO, name: str, rows: Iterable) -> bytes:
+    for data in rows:
+        for key, value in data.items():
+            if hasattr(value, "isoformat"):
+                data[key] = value.isoformat()
+        writer.writerow({"type": name, **data})
+
+    chunk = buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate(0)
+    return chunk
+
+
+async def export_user_data(user_id: int, fmt: str, gzip: bool) -> AsyncIterator[bytes]:
+    """
+    Streams the user's full history as NDJSON or CSV, one chunk per
+    database batch, optionally gzip-compressed on the fly.
+    """
+    compressor = zlib.compressobj(wbits=31) if gzip else None  # 31 → gzip container
+
+    def emit(chunk: bytes) -> bytes:
+        return compressor.compress(chunk) if compressor else chunk
+
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=csv_header())
+        writer.writeheader()
+        yield emit(buffer.getvalue().encode("utf-8"))
+        buffer.seek(0)
+        buffer.truncate(0)
+
+    async for name, rows in _stream_rows(user_id):
+        if fmt == "csv":
+            chunk = _csv_lines(writer, buffer, name, rows)
+        else:
+            chunk = _ndjson_lines(name, rows)
+
+        chunk = emit(chunk)
+        if chunk:
+            yield chunk
+
+    if compressor:
+        yield compressor.flush()
@@ -0,0 +1,191 @@
+import asyncio
+import csv
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.diet_model import Diet
+from app.models.symptom_model import Symptom
+from app.models.medication_model import Medication
+from app.models.lifestyle_model import Lifestyle
+from app.schemas.diet_schema import DietCreate
+from app.schemas.symptom_schema import SymptomCreate
+from app.schemas.medication_schema import MedicationCreate
+from app.schemas.lifestyle_schema import LifestyleCreate
+from app.repository.repository import bump_data_version
+
+IMPORT_TYPES = {
+    "diets": (Diet, DietCreate),
+    "symptoms": (Symptom, SymptomCreate),
+    "medications": (Medication, MedicationCreate),
+    "lifestyles": (Lifestyle, LifestyleCreate),
+}
+
+# Common headers from other trackers → our field names
+COLUMN_ALIASES = {
+    "date": "created_at",
+    "datetime": "created_at",
+    "timestamp": "created_at",
+    "logged_at": "created_at",
+    "meal": "meal_type",
+    "food": "food_items",
+    "foods": "food_items",
+    "kcal": "calories",
+    "symptom": "symptom_name",
+    "medicine": "medicine_name",
+    "medication": "medicine_name",
+    "sleep": "sleep_hours",
+    "hours_slept": "sleep_hours",
+    "exercise": "exercise_minutes",
+    "workout_minutes": "exercise_minutes",
+    "activity": "exercise_type",
+    "stress": "stress_level",
+    "water": "water_intake",
+}
+
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportFormatError(ValueError):
+    """The upload cannot be read as a UTF-8 CSV file"""
+
+
+def _read_error(e: Exception) -> str:
+    if isinstance(e, UnicodeDecodeError):
+        return "File is not valid UTF-8 text"
+    return f"Malformed CSV: {e}"
+
+
+def _normalize_header(name: str, column_map: Dict[str, str]) -> str:
+    if name in column_map:
+        return column_map[name]
+    key = name.strip().lower().replace(" ", "_").replace("-", "_")
+    return COLUMN_ALIASES.get(key, key)
+
+
+def _parse_created_at(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _validate_row(schema, row: Dict[str, str]) -> Dict:
+    """
+    Converts one CSV row into insert values. Empty cells become None;
+    an optional `created_at` keeps the original date of historical logs.
+    Every row gets the same keys, as the chunk is sent as one executemany.
+    """
+    data = {key: (value.strip() or None) for key, value in row.items() if key and value is not None}
+    created_at = data.pop("created_at", None)
+
+    values = schema(**{key: value for key, value in data.items() if key in schema.model_fields}).model_dump()
+    values["created_at"] = _parse_created_at(created_at) if created_at else datetime.now(timezone.utc)
+    return values
+
+
+def _read_records(reader, limit: int) -> Tuple[List[Tuple[int, List[str]]], Optional[str]]:
+    """
+    Up to `limit` (line, cells) records, `line` being the physical line
+    the record starts on. Stops early with a message when the rest of
+    the file cannot be decoded or parsed.
+    """
+    records = []
+    for _ in range(limit):
+        line = reader.line_num + 1
+        try:
+            cells = next(reader, None)
+        except (UnicodeDecodeError, csv.Error) as e:
+            return records, _read_error(e)
+        if cells is None:
+            break
+        records.append((line, cells))
+    return records, None
+
+
+async def _write_chunk(db: AsyncSession, model, user_id: int, rows: List[Dict]):
+    # One round trip: executemany is sent as multi-row INSERT ... VALUES batches
+    version = await bump_data_version(db, user_id)
+    for row in rows:
+        row["user_id"] = user_id
+        row["change_version"] = version
+    await db.execute(insert(model), rows)
+    await db.commit()
+
+
+async def import_csv(
+    db: AsyncSession,
+    user_id: int,
+    kind: str,
+    source: TextIO,
+    column_map: Optional[Dict[str, str]] = None
+) -> Dict:
+    """
+    Streams a CSV file into the `kind` table. Rows are validated against
+    the matching *Create schema and written in chunks of
+    IMPORT_CHUNK_SIZE, one transaction per chunk, so memory stays bounded
+    by a single chunk. Invalid rows are skipped and reported by line.
+
+    Raises ImportFormatError when the header cannot be read. Past the
+    header, unreadable input ends the import: rows before it are kept
+    and the error is reported on the line where reading stopped.
+    """
+    model, schema = IMPORT_TYPES[kind]
+    column_map = column_map or {}
+
+    # The upload is a (possibly disk-backed) file: read it off the event loop
+    reader = csv.reader(source)
+    try:
+        header = await asyncio.to_thread(next, reader, None)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFormatError(_read_error(e))
+    if not header:
+        return {"kind": kind, "imported": 0, "failed": 0, "errors": [], "errors_truncated": False}
+    fields = [_normalize_header(name, column_map) for name in header]
+
+    imported, failed = 0, 0
+    errors: List[Dict] = []
+    chunk: List[Dict] = []
+
+    while True:
+        records, read_error = await asyncio.to_thread(_read_records, reader, settings.IMPORT_CHUNK_SIZE)
+        for line, cells in records:
+            if not any(cell.strip() for cell in cells):
+                continue
+            try:
+                chunk.append(_validate_row(schema, dict(zip(fields, cells))))
+            except (ValidationError, ValueError) as e:
+                failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    message = "; ".join(
+                        f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()
+                    ) if isinstance(e, ValidationError) else str(e)
+                    errors.append({"line": line, "error": message})
+                continue
+
+            if len(chunk) >= settings.IMPORT_CHUNK_SIZE:
+                await _write_chunk(db, model, user_id, chunk)
+                imported += len(chunk)
+                chunk = []
+
+        if read_error:
+            failed += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"line": reader.line_num + 1, "error": f"{read_error}; the rest of the file was not imported"})
+            break
+        if len(records) < settings.IMPORT_CHUNK_SIZE:
+            break
+
+    if chunk:
+        await _write_chunk(db, model, user_id, chunk)
+        imported += len(chunk)
+
+    return {
+        "kind": kind,
+        "imported": imported,
+        "failed": failed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+    }
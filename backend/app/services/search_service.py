@@ -0,0 +1,131 @@
+from typing import Dict, List
+
+from sqlalchemy import bindparam, func, literal_column, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.diet_model import Diet
+from app.models.symptom_model import Symptom
+from app.models.medication_model import Medication
+from app.models.lifestyle_model import Lifestyle
+from app.models.chat_message_model import ChatMessage
+
+SEARCH_CONFIG = "english"
+
+# Per source: the text that is searched (exactly the expression indexed in
+# app/migrate.py, so the planner can use the GIN index), the column shown
+# as the result title and whether that column also has a trigram index for
+# fuzzy name matches ("migrane" → "migraine").
+SEARCH_SOURCES = {
+    "diets": {
+        "model": Diet,
+        "document": "coalesce(food_items, '') || ' ' || coalesce(notes, '')",
+        "title": "food_items",
+        "trigram": True,
+    },
+    "symptoms": {
+        "model": Symptom,
+        "document": "coalesce(symptom_name, '') || ' ' || coalesce(notes, '')",
+        "title": "symptom_name",
+        "trigram": True,
+    },
+    "medications": {
+        "model": Medication,
+        "document": "coalesce(medicine_name, '') || ' ' || coalesce(notes, '')",
+        "title": "medicine_name",
+        "trigram": True,
+    },
+    "lifestyles": {
+        "model": Lifestyle,
+        "document": "coalesce(exercise_type, '') || ' ' || coalesce(notes, '')",
+        "title": "exercise_type",
+        "trigram": False,
+    },
+    "chat_messages": {
+        "model": ChatMessage,
+        "document": "coalesce(content, '')",
+        "title": "content",
+        "trigram": False,
+    },
+}
+
+
+def search_vector_sql(document: str) -> str:
+    return f"to_tsvector('{SEARCH_CONFIG}', {document})"
+
+
+def search_index_statements() -> List[str]:
+    """
+    DDL for the search indexes, applied by app/migrate.py.
+    """
+    statements = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"]
+    for source in SEARCH_SOURCES.values():
+        table = source["model"].__tablename__
+        statements.append(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_search "
+            f"ON {table} USING gin ({search_vector_sql(source['document'])})"
+        )
+        if source["trigram"]:
+            statements.append(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_{source['title']}_trgm "
+                f"ON {table} USING gin ({source['title']} gin_trgm_ops)"
+            )
+    return statements
+
+
+def _source_query(name: str, source: Dict, user_id: int, q):
+    model = source["model"]
+    title = getattr(model, source["title"])
+    document = literal_column(source["document"])
+
+    vector = literal_column(search_vector_sql(source["document"]))
+    tsquery = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'"), q)
+
+    match = vector.op("@@")(tsquery)
+    rank = func.ts_rank(vector, tsquery)
+    if source["trigram"]:
+        match = match | title.op("%")(q)
+        rank = rank + func.similarity(title, q)
+
+    query = select(
+        literal_column(f"'{name}'").label("type"),
+        model.id.label("id"),
+        func.left(title, 120).label("title"),
+        func.left(document, 200).label("snippet"),
+        model.created_at.label("created_at"),
+        rank.label("rank"),
+    ).where(model.user_id == user_id, match)
+
+    if hasattr(model, "deleted_at"):
+        query = query.where(model.deleted_at.is_(None))
+    return query
+
+
+async def search_user_data(
+    db: AsyncSession,
+    user_id: int,
+    text: str,
+    types: List[str],
+    limit: int,
+    offset: int
+) -> Dict:
+    """
+    Ranked full-text search over the user's logs and chat messages.
+    Fetches one extra row to report whether another page exists.
+    """
+    q = bindparam("q")
+    queries = [_source_query(name, SEARCH_SOURCES[name], user_id, q) for name in types]
+    combined = union_all(*queries).subquery()
+
+    result = await db.execute(
+        select(combined)
+        .order_by(combined.c.rank.desc(), combined.c.created_at.desc())
+        .limit(limit + 1)
+        .offset(offset),
+        {"q": text}
+    )
+    rows = [row._asdict() for row in result]
+
+    for row in rows:
+        row["rank"] = round(float(row["rank"]), 4)
+
+    return {"results": rows[:limit], "has_more": len(rows) > limit}
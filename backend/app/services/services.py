@@ -0,0 +1,55 @@
+from typing import Any, Dict, Optional, Type
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repository.repository import insert_user_row, update_user_row, soft_delete_user_row
+
+
+# Shared create/update/delete for the per-user tracker entries (diets,
+# symptoms, medications, lifestyles). Each write is one statement plus
+# the commit.
+
+async def create_entry(
+    db: AsyncSession,
+    model,
+    schema: Type[BaseModel],
+    user_id: int,
+    data: BaseModel
+) -> Dict[str, Any]:
+    row = await insert_user_row(db, model, schema, user_id, data.model_dump())
+    await db.commit()
+    return row
+
+
+async def update_entry(
+    db: AsyncSession,
+    model,
+    schema: Type[BaseModel],
+    user_id: int,
+    entry_id: int,
+    data: BaseModel,
+    partial: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    Full replace (PUT), or with `partial` only the fields the client sent
+    (PATCH). Returns None when the entry does not exist.
+    """
+    values = data.model_dump(exclude_unset=partial)
+    row = await update_user_row(db, model, schema, user_id, entry_id, values)
+    if row is not None:
+        await db.commit()
+    return row
+
+
+async def delete_entry(
+    db: AsyncSession,
+    model,
+    schema: Type[BaseModel],
+    user_id: int,
+    entry_id: int
+) -> Optional[Dict[str, Any]]:
+    row = await soft_delete_user_row(db, model, schema, user_id, entry_id)
+    if row is not None:
+        await db.commit()
+    return row
@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import get_cache
+from app.models.user_model import User
+from app.services.summary_service import bucketed_summary
+
+WINDOWS = (7, 30)
+HISTORY_DAYS = max(WINDOWS)
+
+# Daily series: metric name → (bucket field, ignore days where this count is 0)
+METRICS = {
+    "sleep_hours": ("avg_sleep_hours", None),
+    "stress_level": ("avg_stress_level", None),
+    "exercise_minutes": ("exercise_minutes", "lifestyle_logs"),
+    "water_intake": ("avg_water_intake", None),
+    "calories": ("calories", "meals"),
+}
+
+# Slope (units per day) below which a metric counts as stable
+STABLE_SLOPES = {
+    "sleep_hours": 0.03,
+    "stress_level": 0.03,
+    "exercise_minutes": 1.0,
+    "water_intake": 0.02,
+    "calories": 15.0,
+}
+
+TREND_CACHE_TTL_SECONDS = 24 * 3600
+
+
+def trend_cache_key(user_id: int) -> str:
+    return f"trends:{user_id}"
+
+
+def compute_trends(days: List[Dict]) -> Dict:
+    """
+    Rolling statistics over a user's daily series (oldest first). For each
+    metric and window: mean, least-squares slope per day, standard
+    deviation and the number of days with data. Missing days are NaN and
+    excluded, all with vectorized NumPy.
+    """
+    import numpy as np  # deferred: keeps it off the startup import path
+
+    trends: Dict[str, Dict] = {}
+    for metric, (field, presence) in METRICS.items():
+        series = np.array(
+            [
+                np.nan if row[field] is None or (presence and not row[presence]) else float(row[field])
+                for row in days
+            ],
+            dtype=float,
+        )
+
+        windows = {}
+        for window in WINDOWS:
+            values = series[-window:]
+            mask = ~np.isnan(values)
+            count = int(mask.sum())
+
+            stats = {"mean": None, "slope_per_day": None, "std": None, "days_with_data": count}
+            if count:
+                present = values[mask]
+                stats["mean"] = round(float(present.mean()), 2)
+                stats["std"] = round(float(present.std()), 2)
+            if count >= 3:
+                x = np.arange(len(values), dtype=float)[mask]
+                stats["slope_per_day"] = round(float(np.polyfit(x, present, 1)[0]), 3)
+            windows[f"{window}d"] = stats
+
+        trends[metric] = windows
+    return trends
+
+
+def describe_trends(trends: Dict) -> List[str]:
+    """
+    One short line per metric with enough data, used as extra grounding
+    for the AI prompts.
+    """
+    lines = []
+    for metric, windows in trends.items():
+        recent, longer = windows["7d"], windows["30d"]
+        if recent["mean"] is None:
+            continue
+
+        line = f"{metric.replace('_', ' ')}: 7-day mean {recent['mean']}"
+        if longer["mean"] is not None and longer["days_with_data"] > recent["days_with_data"]:
+            line += f" vs 30-day mean {longer['mean']}"
+
+        slope = recent["slope_per_day"]
+        if slope is not None:
+            if abs(slope) < STABLE_SLOPES[metric]:
+                line += ", stable"
+            else:
+                line += f", trending {'up' if slope > 0 else 'down'} ({slope:+}/day)"
+        lines.append(line)
+    return lines
+
+
+async def get_user_trends(db: AsyncSession, user: User) -> Dict:
+    """
+    Trend statistics for the last 30 days, cached per user until the
+    user writes new data (data_version changes) or the day rolls over.
+    """
+    today = datetime.utcnow().date()
+    version = user.data_version or 0
+    cache = get_cache()
+
+    # Entries are only valid for the same data_version, so any write by
+    # the user invalidates them
+    cached = await cache.get(trend_cache_key(user.id))
+    if cached and cached["version"] == version and cached["day"] == today.isoformat():
+        return cached["trends"]
+
+    days = await bucketed_summary(db, user.id, today - timedelta(days=HISTORY_DAYS - 1), today, "day")
+    trends = {
+        "window_end": today.isoformat(),
+        "metrics": compute_trends(days),
+    }
+
+    await cache.set(
+        trend_cache_key(user.id),
+        {"version": version, "day": today.isoformat(), "trends": trends},
+        TREND_CACHE_TTL_SECONDS
+    )
+
+    return trends
+
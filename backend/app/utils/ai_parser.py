@@ -1,5 +1,6 @@
 import json
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import TypeAdapter, ValidationError
 from app.schemas.ai_insights_schema import AIWeeklyInsights
 
 def parse_ai_json(raw_text: str) -> Optional[AIWeeklyInsights]:
@@ -22,3 +23,125 @@ def parse_ai_json(raw_text: str) -> Optional[AIWeeklyInsights]:
 
     except Exception:
         return None
+
+
+_decoder = json.JSONDecoder()
+_INCOMPLETE = object()
+_INVALID = object()
+_WHITESPACE = " \t\r\n"
+
+
+def _skip(text: str, pos: int, chars: str) -> int:
+    while pos < len(text) and text[pos] in chars:
+        pos += 1
+    return pos
+
+
+def _decode_at(text: str, pos: int):
+    """
+    (value, end) for the JSON value starting at `pos`, _INCOMPLETE when
+    the text stops before the value does, or _INVALID.
+    """
+    try:
+        return _decoder.raw_decode(text, pos)
+    except json.JSONDecodeError as e:
+        # Errors at the very end (including a cut-off escape) mean "wait for more"
+        if e.msg.startswith("Unterminated string") or e.pos >= len(text.rstrip()) - 6:
+            return _INCOMPLETE
+        return _INVALID
+
+
+class InsightsStreamParser:
+    """
+    Incremental parser for streamed AIWeeklyInsights JSON. `feed` takes
+    the next chunk of model output and returns the top-level fields that
+    just became complete, each validated against the schema, so
+    `summary` can be shown before the lists have finished streaming.
+
+    Text before the first `{` (prose, code fences) is skipped. Once the
+    JSON turns invalid, parsing stops and the remaining fields are
+    reported by `missing_fields()` for a targeted repair.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = None
+        self.values: Dict[str, Any] = {}
+        self.errors: Dict[str, str] = {}
+        self.done = False
+        self.broken = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        self.buffer += chunk
+        completed: List[Tuple[str, Any]] = []
+
+        if self.pos is None:
+            start = self.buffer.find("{")
+            if start == -1:
+                return completed
+            self.pos = start + 1
+
+        while not (self.done or self.broken):
+            pos = _skip(self.buffer, self.pos, _WHITESPACE + ",")
+            if pos >= len(self.buffer):
+                break
+            if self.buffer[pos] == "}":
+                self.done = True
+                break
+            if self.buffer[pos] != '"':
+                self.broken = True
+                break
+
+            decoded = _decode_at(self.buffer, pos)
+            if decoded is _INCOMPLETE:
+                break
+            if decoded is _INVALID:
+                self.broken = True
+                break
+            key, pos = decoded
+
+            pos = _skip(self.buffer, pos, _WHITESPACE)
+            if pos >= len(self.buffer):
+                break
+            if self.buffer[pos] != ":":
+                self.broken = True
+                break
+
+            pos = _skip(self.buffer, pos + 1, _WHITESPACE)
+            if pos >= len(self.buffer):
+                break
+            decoded = _decode_at(self.buffer, pos)
+            if decoded is _INCOMPLETE:
+                break
+            if decoded is _INVALID:
+                self.broken = True
+                break
+            value, end = decoded
+            if end >= len(self.buffer) and self.buffer[pos] not in '"[{':
+                break  # a bare number or literal may still be growing
+
+            self.pos = end
+            if key in AIWeeklyInsights.model_fields and self._validate(key, value):
+                completed.append((key, self.values[key]))
+
+        return completed
+
+    def _validate(self, field: str, value: Any) -> bool:
+        try:
+            validated = TypeAdapter(AIWeeklyInsights.model_fields[field].annotation).validate_python(value)
+        except ValidationError as e:
+            self.errors[field] = str(e.errors()[0]["msg"])
+            return False
+        if field == "summary" and not validated.strip():
+            self.errors[field] = "summary is empty"
+            return False
+
+        self.errors.pop(field, None)
+        self.values[field] = validated
+        return True
+
+    def missing_fields(self) -> List[str]:
+        return [field for field in AIWeeklyInsights.model_fields if field not in self.values]
+
+    def result(self) -> Optional[AIWeeklyInsights]:
+        return None if self.missing_fields() else AIWeeklyInsights(**self.values)
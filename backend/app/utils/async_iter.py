@@ -0,0 +1,30 @@
+import asyncio
+from typing import AsyncIterator, Callable, Iterator
+
+
+async def iterate_in_thread(make_iterator: Callable[[], Iterator]) -> AsyncIterator:
+    """
+    Runs a blocking iterator (a streaming model call) in a worker
+    thread and yields its items on the event loop as they arrive.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    def produce():
+        try:
+            for item in make_iterator():
+                loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+            loop.call_soon_threadsafe(queue.put_nowait, (done, None))
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, (done, e))
+
+    producer = loop.run_in_executor(None, produce)
+    while True:
+        item, error = await queue.get()
+        if item is done:
+            break
+        yield item
+    await producer
+    if error:
+        raise error
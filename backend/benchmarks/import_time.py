@@ -0,0 +1,81 @@
+"""
+Cold-start budget check for `import app.main`.
+
+Run from `backend/`:
+
+    python -m benchmarks.import_time               # default 1500 ms budget
+    python -m benchmarks.import_time --budget-ms 800 --top 15
+
+Imports the app in a fresh interpreter with `-X importtime`, prints the
+slowest top-level imports and exits 1 when the total exceeds the budget
+or when a module that must stay lazy (the Vertex AI SDK) was imported.
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Heavy modules that must only be imported on first use
+LAZY_MODULES = ("vertexai", "google.cloud.aiplatform")
+
+
+def measure_imports(target: str) -> List[Tuple[str, int, int]]:
+    """
+    Returns (module, self_us, cumulative_us) for every module imported
+    while importing `target` in a clean interpreter.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"❌ import {target} failed:\n{proc.stderr[-2000:]}")
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        entries.append((module.rstrip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def top_level_totals(entries: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    # Nesting is encoded as indentation; depth-0 entries carry the totals
+    return {
+        module.strip(): cumulative
+        for module, _, cumulative in entries
+        if module.startswith(" ") and not module.startswith("  ")
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check app import time against a budget")
+    parser.add_argument("--target", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    entries = measure_imports(args.target)
+    totals = top_level_totals(entries)
+    total_ms = sum(totals.values()) / 1000
+
+    for module, cumulative in sorted(totals.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{module:<50} {cumulative / 1000:>10.1f} ms")
+    print(f"{'TOTAL':<50} {total_ms:>10.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    imported = {module.strip() for module, _, _ in entries}
+    eager = [name for name in LAZY_MODULES if name in imported]
+
+    if eager:
+        print(f"\n⚠️ Imported eagerly, must stay lazy: {', '.join(eager)}")
+    if total_ms > args.budget_ms:
+        print(f"\n⚠️ Import time {total_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+    if eager or total_ms > args.budget_ms:
+        raise SystemExit(1)
+    print("\n✅ Cold start within budget")
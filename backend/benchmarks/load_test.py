@@ -0,0 +1,310 @@
+"""
+End-to-end load test for the MyHealthSense API.
+
+Seeds synthetic users, drives a weighted mix of CRUD, `/me` list,
+insights and AI chat requests with a fixed concurrency, and writes
+per-endpoint throughput and p50/p95/p99 latencies to a JSON file.
+
+Run from `backend/`:
+
+    python -m benchmarks.load_test --users 50 --requests 2000 --concurrency 20
+    python -m benchmarks.load_test --compare benchmarks/results/previous.json
+
+By default the app runs in-process (httpx ASGI transport) with the
+Gemini model replaced by a stub, so results measure our code and the
+database, not Vertex AI. Pass `--base-url` to hit a running server.
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.loop_monitor import LoopMonitor
+from app.core.security import create_access_token
+from benchmarks.seed import seed
+from benchmarks.stats import (
+    compare_metric,
+    latency_stats,
+    load_results,
+    run_metadata,
+    save_results,
+)
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# (name, weight) — roughly what the dashboard does per session
+WORKLOAD = [
+    ("GET /diets/me", 12),
+    ("GET /symptoms/me", 8),
+    ("GET /medications/me", 8),
+    ("GET /lifestyles/me", 10),
+    ("GET /auth/profile", 6),
+    ("GET /insights/weekly", 10),
+    ("GET /health/weekly-summary", 4),
+    ("POST /diets/", 6),
+    ("POST /lifestyles/", 4),
+    ("POST /symptoms/", 3),
+    ("PUT /diets/{id}", 3),
+    ("DELETE /diets/{id}", 2),
+    ("POST /ai/chat", 4),
+]
+
+
+class StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubModel:
+    """
+    Stand-in for the Gemini model. Sleeps for a fixed latency so the
+    event loop sees a realistic (blocking) model call.
+    """
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        if "STRICT JSON" in prompt:
+            text = (
+                '{"summary": "A steady week.", '
+                '"key_patterns": ["Consistent sleep"], '
+                '"suggestions": ["Keep a regular bedtime"]}'
+            )
+        else:
+            text = "1. Keep a regular sleep schedule.\n2. Drink water."
+        if stream:
+            return iter([StubResponse(text[i:i + 16]) for i in range(0, len(text), 16)])
+        return StubResponse(text)
+
+
+def install_stub_model(app, latency_ms: float):
+    from app.services.ai_service import AIService
+
+    # ASGITransport does not run the lifespan, so set the shared client here
+    app.state.ai_service = AIService()
+    app.state.ai_service.model = StubModel(latency_ms)
+
+
+def build_client(base_url: Optional[str], stub_latency_ms: float) -> httpx.AsyncClient:
+    if base_url:
+        return httpx.AsyncClient(base_url=base_url, timeout=60)
+
+    from app.core.config import settings
+    from app.main import app
+
+    # Synthetic users would hit the per-user AI buckets within seconds
+    settings.RATE_LIMIT_ENABLED = False
+    install_stub_model(app, stub_latency_ms)
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://bench",
+        timeout=60
+    )
+
+
+async def prepare_operation(
+    client: httpx.AsyncClient, name: str, headers: Dict, rng: random.Random
+) -> Tuple[str, str, Optional[Dict]]:
+    """
+    (method, path, body) for one planned request. Fixture rows it needs
+    are created here, before the caller starts timing.
+    """
+    method, path = name.split(" ", 1)
+
+    if name == "POST /diets/":
+        body = {"meal_type": "lunch", "food_items": "rice, dal", "calories": rng.randint(200, 900)}
+    elif name == "POST /lifestyles/":
+        body = {"sleep_hours": round(rng.uniform(4, 9), 1), "stress_level": rng.randint(1, 5),
+                "exercise_minutes": rng.choice([0, 30, 45])}
+    elif name == "POST /symptoms/":
+        body = {"symptom_name": "headache", "severity": "mild"}
+    elif name == "POST /ai/chat":
+        body = {"message": rng.choice(["hi", "How can I sleep better?", "Why am I tired?"])}
+    else:
+        body = None
+
+    if "{id}" in path:
+        # Update/delete need an entry owned by this user; create one first
+        created = await client.post(
+            "/diets/", headers=headers,
+            json={"meal_type": "snack", "food_items": "apple", "calories": 95}
+        )
+        path = path.replace("{id}", str(created.json()["id"]))
+        if method == "PUT":
+            body = {"meal_type": "snack", "food_items": "apple, nuts", "calories": 250}
+
+    return method, path, body
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    user_ids: List[int],
+    total_requests: int,
+    concurrency: int,
+    rng_seed: int
+) -> Dict:
+    rng = random.Random(rng_seed)
+    names = [name for name, _ in WORKLOAD]
+    weights = [weight for _, weight in WORKLOAD]
+    plan = [
+        (rng.choice(user_ids), name)
+        for name in rng.choices(names, weights=weights, k=total_requests)
+    ]
+    tokens = {user_id: create_access_token(str(user_id)) for user_id in set(user_ids)}
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in plan:
+        queue.put_nowait(item)
+
+    async def worker(worker_id: int):
+        worker_rng = random.Random(rng_seed + worker_id)
+        while not queue.empty():
+            user_id, name = queue.get_nowait()
+            headers = {"Authorization": f"Bearer {tokens[user_id]}"}
+            try:
+                method, path, body = await prepare_operation(client, name, headers, worker_rng)
+            except Exception:
+                errors[name] += 1
+                continue
+
+            start = time.perf_counter()
+            try:
+                status_code = (await client.request(method, path, headers=headers, json=body)).status_code
+            except Exception:
+                status_code = 599
+            latencies[name].append((time.perf_counter() - start) * 1000)
+            if status_code >= 400:
+                errors[name] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for name, samples in sorted(latencies.items()):
+        endpoints[name] = {
+            "requests": len(samples),
+            "errors": errors[name],
+            "throughput_rps": round(len(samples) / elapsed, 2),
+            **latency_stats(samples),
+        }
+
+    all_samples = [s for samples in latencies.values() for s in samples]
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "total": {
+            "requests": len(all_samples),
+            "errors": sum(errors.values()),
+            "throughput_rps": round(len(all_samples) / elapsed, 2),
+            **latency_stats(all_samples),
+        },
+        "endpoints": endpoints,
+    }
+
+
+def print_report(results: Dict):
+    print(f"{'endpoint':<28} {'reqs':>6} {'err':>4} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    rows = list(results["endpoints"].items()) + [("TOTAL", results["total"])]
+    for name, r in rows:
+        print(
+            f"{name:<28} {r['requests']:>6} {r['errors']:>4} {r['throughput_rps']:>8.1f} "
+            f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f}"
+        )
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    regressions = []
+    for name, now in current["endpoints"].items():
+        before = baseline["endpoints"].get(name)
+        if not before:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            message = compare_metric(f"{name} {metric}", before[metric], now[metric], threshold)
+            if message:
+                regressions.append(message)
+
+    if "event_loop" in baseline and "event_loop" in current:
+        message = compare_metric(
+            "event loop max lag", baseline["event_loop"]["max_lag_ms"],
+            current["event_loop"]["max_lag_ms"], threshold
+        )
+        if message:
+            regressions.append(message)
+    return regressions
+
+
+async def main(args):
+    user_ids = await seed(args.users, args.days)
+
+    async with build_client(args.base_url, args.stub_latency_ms) as client:
+        if args.warmup:
+            await run_load(client, user_ids, args.warmup, args.concurrency, args.seed + 1)
+
+        # In-process runs share our event loop, so blocking calls in the
+        # app show up as lag here
+        monitor = None if args.base_url else LoopMonitor(threshold_ms=args.stall_threshold_ms)
+        if monitor:
+            monitor.start()
+        results = await run_load(client, user_ids, args.requests, args.concurrency, args.seed)
+        if monitor:
+            await monitor.stop()
+            results["event_loop"] = monitor.snapshot(include_stacks=False)
+
+    payload = {
+        "meta": run_metadata(
+            users=args.users, days=args.days, requests=args.requests,
+            concurrency=args.concurrency, stub_latency_ms=args.stub_latency_ms,
+            base_url=args.base_url, seed=args.seed,
+        ),
+        "results": results,
+    }
+    print_report(results)
+    if "event_loop" in results:
+        loop_stats = results["event_loop"]
+        print(
+            f"\nEvent loop: mean lag {loop_stats['mean_lag_ms']:.1f}ms, max {loop_stats['max_lag_ms']:.1f}ms, "
+            f"{loop_stats['stall_count']} stalls over {loop_stats['threshold_ms']:.0f}ms"
+        )
+
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"load_{payload['meta']['git_revision'] or 'local'}_{int(time.time())}.json"
+    )
+    save_results(output, payload)
+    print(f"\n📄 Results saved to {output}")
+
+    if args.compare:
+        regressions = compare(load_results(Path(args.compare))["results"], results, args.threshold)
+        if regressions:
+            print("\n⚠️ Regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            raise SystemExit(1)
+        print("\n✅ No regressions beyond threshold")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MyHealthSense load test")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--days", type=int, default=90, help="days of history per seeded user")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50, help="requests sent before measuring")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0)
+    parser.add_argument("--stall-threshold-ms", type=float, default=100,
+                        help="event-loop lag reported as a stall (in-process runs)")
+    parser.add_argument("--base-url", default=None, help="hit a running server instead of in-process")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--compare", default=None, help="previous results JSON to diff against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown (0.2 == 20%%)")
+    asyncio.run(main(parser.parse_args()))
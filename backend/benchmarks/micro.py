@@ -0,0 +1,213 @@
+"""
+Microbenchmarks for the pure functions on the request hot path.
+
+Run from `backend/`:
+
+    python -m benchmarks.micro                    # compare against the stored baseline
+    python -m benchmarks.micro --save-baseline    # record a new baseline
+    python -m benchmarks.micro --only parse_ai_json
+
+Every case runs over fixed synthetic inputs, so numbers are comparable
+between runs on the same machine. A case that is slower than the
+baseline by more than `--threshold` is reported and the command exits 1.
+"""
+import argparse
+import json
+import random
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.stats import compare_metric, load_results, run_metadata, save_results
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "micro.json"
+
+
+# ---- Synthetic inputs ----
+
+def synthetic_week(meals_per_day: int, lifestyle_per_day: int, symptoms: int, medications: int) -> Dict:
+    """
+    A weekly summary shaped like `weekly_summary` output. Entries are
+    plain attribute objects, which is all the insights engine needs.
+    """
+    rng = random.Random(meals_per_day * 31 + lifestyle_per_day)
+    now = datetime(2025, 1, 8)
+
+    diets = [
+        SimpleNamespace(id=i, meal_type="lunch", food_items="rice, dal",
+                        calories=rng.randint(150, 1100), notes=None,
+                        created_at=now - timedelta(hours=i))
+        for i in range(7 * meals_per_day)
+    ]
+    lifestyle = [
+        SimpleNamespace(id=i, sleep_hours=round(rng.uniform(4, 9), 1), sleep_quality=3,
+                        exercise_minutes=rng.choice([0, 0, 30, 45]), exercise_type="walking",
+                        stress_level=rng.randint(1, 5), water_intake=2.0, notes=None,
+                        created_at=now - timedelta(hours=i))
+        for i in range(7 * lifestyle_per_day)
+    ]
+    symptom_rows = [
+        SimpleNamespace(id=i, symptom_name="headache", severity="mild", notes=None,
+                        created_at=now - timedelta(hours=i))
+        for i in range(symptoms)
+    ]
+    medication_rows = [
+        SimpleNamespace(id=i, medicine_name="Vitamin D", dosage="1000 IU", frequency="daily",
+                        notes=None, created_at=now - timedelta(hours=i))
+        for i in range(medications)
+    ]
+    return {
+        "period": "last_7_days",
+        "user_id": 1,
+        "diet_entries": diets,
+        "symptoms": symptom_rows,
+        "medications": medication_rows,
+        "lifestyle": lifestyle,
+    }
+
+
+WEEKS = {
+    "small": synthetic_week(meals_per_day=1, lifestyle_per_day=0, symptoms=0, medications=0),
+    "median": synthetic_week(meals_per_day=3, lifestyle_per_day=1, symptoms=2, medications=7),
+    "heavy": synthetic_week(meals_per_day=8, lifestyle_per_day=4, symptoms=30, medications=28),
+}
+
+VALID_AI_OUTPUT = json.dumps({
+    "summary": "Your week showed shorter sleep and elevated stress on several days.",
+    "key_patterns": ["Sleep under 6 hours on 4 days", "Stress at 4+ on 3 days"],
+    "suggestions": ["Keep a consistent bedtime", "Take short walks", "Limit late caffeine"],
+})
+
+AI_OUTPUTS = {
+    "fenced": f"```json\n{VALID_AI_OUTPUT}\n```",
+    "malformed": '{"summary": "Your week was',
+    "no_json": "I'm sorry, I can't help with that request.",
+    "large": "Here is your summary:\n" + json.dumps({
+        "summary": "A long week. " * 200,
+        "key_patterns": [f"Pattern {i}: " + "detail " * 20 for i in range(50)],
+        "suggestions": [f"Suggestion {i}: " + "detail " * 20 for i in range(50)],
+    }) + "\nHope this helps!",
+}
+
+MEMORY = "\n".join(
+    f"{role}: {text}" for role, text in [
+        ("user", "hi"), ("assistant", "Hello! How can I help?"),
+        ("user", "How can I sleep better?"),
+        ("assistant", "1. Keep a fixed bedtime.\n2. Avoid screens late.\n3. Limit caffeine."),
+    ] * 3
+)
+
+
+CHAT_MESSAGES = {
+    "greeting": "Hi there!",
+    "question": "Why do I feel so tired in the afternoons lately, even after sleeping 8 hours?",
+}
+
+
+# ---- Cases ----
+
+def build_cases() -> Dict[str, Callable[[], object]]:
+    from app.core.security import create_access_token, decode_access_token
+    from app.services.ai_service import AIService
+    from app.services.chat_cache_service import SemanticCache
+    from app.services.chat_intent_service import classify_intent
+    from app.services.insights_service import generate_rule_based_insights
+    from app.utils.ai_parser import parse_ai_json
+
+    cases: Dict[str, Callable[[], object]] = {}
+
+    for name, week in WEEKS.items():
+        cases[f"generate_rule_based_insights[{name}]"] = (
+            lambda week=week: generate_rule_based_insights(week)
+        )
+
+    for name, raw in AI_OUTPUTS.items():
+        cases[f"parse_ai_json[{name}]"] = lambda raw=raw: parse_ai_json(raw)
+
+    token = create_access_token("12345")
+    cases["create_access_token"] = lambda: create_access_token("12345")
+    cases["decode_access_token[valid]"] = lambda: decode_access_token(token)
+    cases["decode_access_token[invalid]"] = lambda: decode_access_token(token[:-4] + "abcd")
+
+    rules = generate_rule_based_insights(WEEKS["heavy"])
+    context = (
+        f"\nRisk level: {rules['risk_level']}\n"
+        f"Signals: {rules['signals']}\n"
+        f"Observations: {rules['insights']}\n"
+    )
+    cases["build_weekly_insights_prompt"] = lambda: AIService.build_weekly_insights_prompt(
+        rules["signals"], rules["insights"], rules["risk_level"]
+    )
+    cases["build_chat_prompt"] = lambda: AIService.build_chat_prompt(
+        "Why do I feel tired lately?", context, MEMORY
+    )
+
+    for name, message in CHAT_MESSAGES.items():
+        cases[f"classify_intent[{name}]"] = lambda message=message: classify_intent(message)
+
+    # Lookup in a bucket of 500 cached questions
+    cache = SemanticCache(threshold=0.85, ttl_seconds=3600, max_entries=1000)
+    for i in range(500):
+        cache.store(f"question {i} about sleep stress and diet number {i}", "general", "reply")
+    cases["semantic_cache_lookup[500]"] = lambda: cache.lookup(CHAT_MESSAGES["question"], "general")
+
+    return cases
+
+
+def time_case(func: Callable[[], object], repeat: int) -> float:
+    """
+    Returns the best observed time per call in microseconds.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number * 1_000_000
+
+
+def run(only: str | None, repeat: int) -> Dict[str, float]:
+    results = {}
+    for name, func in build_cases().items():
+        if only and only not in name:
+            continue
+        results[name] = round(time_case(func, repeat), 3)
+        print(f"{name:<45} {results[name]:>12.3f} µs")
+    return results
+
+
+def find_regressions(baseline: Dict[str, float], current: Dict[str, float], threshold: float) -> List[str]:
+    regressions = []
+    for name, value in current.items():
+        if name in baseline:
+            message = compare_metric(name, baseline[name], value, threshold)
+            if message:
+                regressions.append(message)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MyHealthSense hot-path microbenchmarks")
+    parser.add_argument("--only", default=None, help="run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown (0.15 == 15%%)")
+    args = parser.parse_args()
+
+    results = run(args.only, args.repeat)
+    baseline_path = Path(args.baseline)
+
+    if args.save_baseline:
+        save_results(baseline_path, {"meta": run_metadata(repeat=args.repeat), "results_us": results})
+        print(f"\n📄 Baseline saved to {baseline_path}")
+    elif baseline_path.exists():
+        regressions = find_regressions(load_results(baseline_path)["results_us"], results, args.threshold)
+        if regressions:
+            print("\n⚠️ Regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            raise SystemExit(1)
+        print("\n✅ No regressions beyond threshold")
+    else:
+        print(f"\nNo baseline at {baseline_path}; run with --save-baseline to create one")
@@ -0,0 +1,179 @@
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import insert, select
+
+from app.core.database import engine
+from app.core.security import hash_password
+from app.models.user_model import User
+from app.models.diet_model import Diet
+from app.models.symptom_model import Symptom
+from app.models.medication_model import Medication
+from app.models.lifestyle_model import Lifestyle
+from app.models.chat_message_model import ChatMessage
+
+BENCH_EMAIL_DOMAIN = "bench.myhealthsense.local"
+BENCH_PASSWORD = "bench-password"
+BATCH_SIZE = 1000
+
+MEALS = ["breakfast", "lunch", "dinner", "snack"]
+FOODS = [
+    "oatmeal, banana", "chicken salad", "rice, dal, curd", "pasta",
+    "paneer wrap", "fruit bowl", "burger, fries", "idli, sambar",
+    "grilled fish, vegetables", "pizza", "eggs, toast", "poha",
+]
+SYMPTOMS = ["headache", "fatigue", "migraine", "back pain", "nausea", "cough", "insomnia"]
+SEVERITIES = ["mild", "moderate", "severe"]
+MEDICINES = [("Vitamin D", "1000 IU", "daily"), ("Metformin", "500 mg", "twice daily"),
+             ("Ibuprofen", "200 mg", "as needed"), ("Cetirizine", "10 mg", "daily")]
+EXERCISES = ["walking", "yoga", "gym", "cycling", "running", None]
+CHAT_QUESTIONS = [
+    "hi", "How can I sleep better?", "Why do I feel tired lately?",
+    "What should I eat before a workout?", "thanks", "How do I reduce stress?",
+]
+
+
+def _user_rows(n_users: int) -> List[Dict]:
+    # bcrypt is slow on purpose; every synthetic user shares one hash
+    hashed = hash_password(BENCH_PASSWORD)
+    return [
+        {
+            "email": f"user{i}@{BENCH_EMAIL_DOMAIN}",
+            "hashed_password": hashed,
+            "full_name": f"Bench User {i}",
+            "age": 20 + i % 50,
+        }
+        for i in range(n_users)
+    ]
+
+
+def _history_rows(rng: random.Random, user_id: int, days: int, now: datetime) -> Dict[str, List[Dict]]:
+    """
+    Builds a realistic-looking history for one user. Some users are
+    light loggers, some log every meal and every night.
+    """
+    diligence = rng.choice([0.3, 0.6, 0.9])
+    rows = {"diets": [], "symptoms": [], "medications": [], "lifestyles": [], "chat": []}
+    meds = rng.sample(MEDICINES, k=rng.randint(0, 2))
+
+    for day in range(days):
+        day_start = now - timedelta(days=day)
+
+        for meal in MEALS:
+            if rng.random() < diligence:
+                rows["diets"].append({
+                    "user_id": user_id,
+                    "meal_type": meal,
+                    "food_items": rng.choice(FOODS),
+                    "calories": rng.randint(150, 1100),
+                    "notes": None,
+                    "created_at": day_start - timedelta(hours=rng.randint(0, 23)),
+                })
+
+        if rng.random() < diligence:
+            rows["lifestyles"].append({
+                "user_id": user_id,
+                "sleep_hours": round(rng.uniform(4, 9), 1),
+                "sleep_quality": rng.randint(1, 5),
+                "exercise_minutes": rng.choice([0, 0, 15, 30, 45, 60]),
+                "exercise_type": rng.choice(EXERCISES),
+                "stress_level": rng.randint(1, 5),
+                "water_intake": round(rng.uniform(0.5, 3.5), 1),
+                "notes": None,
+                "created_at": day_start,
+            })
+
+        if rng.random() < diligence * 0.3:
+            rows["symptoms"].append({
+                "user_id": user_id,
+                "symptom_name": rng.choice(SYMPTOMS),
+                "severity": rng.choice(SEVERITIES),
+                "notes": None,
+                "created_at": day_start,
+            })
+
+        for name, dosage, frequency in meds:
+            if rng.random() < diligence:
+                rows["medications"].append({
+                    "user_id": user_id,
+                    "medicine_name": name,
+                    "dosage": dosage,
+                    "frequency": frequency,
+                    "notes": None,
+                    "created_at": day_start,
+                })
+
+        if rng.random() < diligence * 0.5:
+            question = rng.choice(CHAT_QUESTIONS)
+            rows["chat"].append({
+                "user_id": user_id, "role": "user",
+                "content": question, "created_at": day_start,
+            })
+            rows["chat"].append({
+                "user_id": user_id, "role": "assistant",
+                "content": f"Synthetic reply to: {question}",
+                "created_at": day_start + timedelta(seconds=2),
+            })
+
+    return rows
+
+
+async def _bulk_insert(conn, model, rows: List[Dict]):
+    for i in range(0, len(rows), BATCH_SIZE):
+        await conn.execute(insert(model), rows[i:i + BATCH_SIZE])
+
+
+async def seed(n_users: int, days: int, seed_value: int = 42) -> List[int]:
+    """
+    Seeds `n_users` synthetic users with `days` of history each and
+    returns their ids. Existing benchmark users are reused, so the
+    command is safe to run against the same database twice.
+    """
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            select(User.id).where(User.email.like(f"%@{BENCH_EMAIL_DOMAIN}"))
+        )
+        existing = [row[0] for row in result]
+        if len(existing) >= n_users:
+            return existing[:n_users]
+
+        result = await conn.execute(
+            insert(User).returning(User.id),
+            _user_rows(n_users)[len(existing):]
+        )
+        user_ids = [row[0] for row in result]
+
+        tables = {"diets": Diet, "symptoms": Symptom, "medications": Medication,
+                  "lifestyles": Lifestyle, "chat": ChatMessage}
+        pending = {key: [] for key in tables}
+
+        for user_id in user_ids:
+            for key, rows in _history_rows(rng, user_id, days, now).items():
+                pending[key].extend(rows)
+
+            if sum(len(rows) for rows in pending.values()) >= BATCH_SIZE * 5:
+                for key, model in tables.items():
+                    await _bulk_insert(conn, model, pending[key])
+                    pending[key] = []
+
+        for key, model in tables.items():
+            await _bulk_insert(conn, model, pending[key])
+
+    return existing + user_ids
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed synthetic benchmark users.")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    ids = asyncio.run(seed(args.users, args.days, args.seed))
+    print(f"✅ Seeded {len(ids)} benchmark users with {args.days} days of history")
@@ -0,0 +1,75 @@
+import json
+import platform
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an unsorted list of samples.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def latency_stats(samples_ms: List[float]) -> Dict[str, float]:
+    return {
+        "p50_ms": round(percentile(samples_ms, 50), 3),
+        "p95_ms": round(percentile(samples_ms, 95), 3),
+        "p99_ms": round(percentile(samples_ms, 99), 3),
+        "mean_ms": round(sum(samples_ms) / len(samples_ms), 3) if samples_ms else 0.0,
+        "max_ms": round(max(samples_ms), 3) if samples_ms else 0.0,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL,
+            text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def run_metadata(**params) -> Dict:
+    return {
+        "git_revision": git_revision(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": params,
+    }
+
+
+def save_results(path: Path, payload: Dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True))
+
+
+def load_results(path: Path) -> Dict:
+    return json.loads(path.read_text())
+
+
+def compare_metric(
+    name: str,
+    baseline: float,
+    current: float,
+    threshold: float
+) -> Optional[str]:
+    """
+    Returns a regression message when `current` is slower than
+    `baseline` by more than `threshold` (0.2 == 20%), otherwise None.
+    """
+    if baseline <= 0:
+        return None
+    change = (current - baseline) / baseline
+    if change > threshold:
+        return f"{name}: {baseline:.3f} -> {current:.3f} (+{change * 100:.1f}%)"
+    return None
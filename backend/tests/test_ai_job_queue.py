@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.services.ai_job_service import RedisJobQueue
+
+
+def test_job_claimed_by_a_dead_worker_is_requeued():
+    async def scenario():
+        queue = RedisJobQueue(fakeredis.FakeAsyncRedis())
+        job, created = await queue.submit(user_id=1, data_version=1, priority=5)
+        assert created
+
+        # A worker claims the job with an already expired lease and dies
+        # before it marks the record as running
+        claimed = await queue._claim(keys=[queue.queue_key, queue.lease_key], args=[-1])
+        assert claimed.decode() == job.id
+        assert (await queue.get(job.id)).status == "pending"
+
+        next_job = await queue._next()
+        assert next_job is not None and next_job.id == job.id
+        assert next_job.status == "running"
+        assert await queue.client.zscore(queue.lease_key, job.id) is not None
+
+    asyncio.run(scenario())
@@ -0,0 +1,102 @@
+import json
+
+import pytest
+
+from app.utils.ai_parser import InsightsStreamParser, parse_ai_json
+
+FULL = {
+    "summary": "A calm week with steady sleep.",
+    "key_patterns": ["Sleep was regular", "Fewer \"bad\" days"],
+    "suggestions": ["Keep a fixed bedtime", "Walk after lunch"],
+}
+
+
+def feed_all(parser, chunks):
+    completed = []
+    for chunk in chunks:
+        completed.extend(parser.feed(chunk))
+    return completed
+
+
+def test_parse_ai_json_extracts_block():
+    result = parse_ai_json("Here you go:\n" + json.dumps(FULL) + "\nThanks")
+    assert result.summary == FULL["summary"]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+def test_stream_split_at_every_position(size):
+    text = json.dumps(FULL, indent=2)
+    parser = InsightsStreamParser()
+
+    completed = feed_all(parser, [text[i:i + size] for i in range(0, len(text), size)])
+
+    assert [field for field, _ in completed] == ["summary", "key_patterns", "suggestions"]
+    assert parser.done and not parser.broken
+    assert parser.result().model_dump() == FULL
+
+
+def test_field_reported_as_soon_as_complete():
+    parser = InsightsStreamParser()
+
+    assert parser.feed('{"summ') == []
+    assert parser.feed('ary": "Good \\') == []  # split inside a key, then an escape
+    assert parser.feed('"week\\"", "key_pat') == [("summary", 'Good "week"')]
+    assert parser.feed('terns": ["a"]') == [("key_patterns", ["a"])]
+
+
+def test_bare_value_waits_until_terminated():
+    parser = InsightsStreamParser()
+
+    assert parser.feed('{"extra": 1') == []
+    assert parser.feed('2, "summary": "ok"') == [("summary", "ok")]
+    assert "extra" not in parser.values
+
+
+@pytest.mark.parametrize("prefix", ["Sure! Here is the JSON:\n", "```json\n", "Result:\n```json\n"])
+def test_prose_and_code_fences_are_skipped(prefix):
+    parser = InsightsStreamParser()
+
+    feed_all(parser, [prefix, json.dumps(FULL), "\n```\nHope it helps"])
+
+    assert parser.done
+    assert parser.result().model_dump() == FULL
+
+
+def test_invalid_field_value_is_missing():
+    parser = InsightsStreamParser()
+
+    completed = parser.feed('{"summary": 12, "key_patterns": "not a list", "suggestions": ["x"]}')
+
+    assert completed == [("suggestions", ["x"])]
+    assert set(parser.errors) == {"summary", "key_patterns"}
+    assert parser.missing_fields() == ["summary", "key_patterns"]
+    assert parser.result() is None
+
+
+def test_empty_summary_is_invalid():
+    parser = InsightsStreamParser()
+
+    parser.feed('{"summary": "  ", "key_patterns": [], "suggestions": []}')
+
+    assert parser.missing_fields() == ["summary"]
+    assert "summary" in parser.errors
+
+
+def test_stream_cut_mid_field_leaves_fields_for_repair():
+    parser = InsightsStreamParser()
+
+    feed_all(parser, ['{"summary": "Fine week", ', '"key_patterns": ["Slept', ' well", "Wa'])
+
+    assert parser.values == {"summary": "Fine week"}
+    assert not parser.done and not parser.broken
+    assert parser.missing_fields() == ["key_patterns", "suggestions"]
+
+
+def test_malformed_json_stops_parsing():
+    parser = InsightsStreamParser()
+
+    feed_all(parser, ['{"summary": "ok", key_patterns: ["a"]', ', "suggestions": ["b"]}'])
+
+    assert parser.broken
+    assert parser.values == {"summary": "ok"}
+    assert parser.missing_fields() == ["key_patterns", "suggestions"]
@@ -0,0 +1,135 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.cache import MemoryCache, RedisCache, SharedMemoryCache
+from app.schemas.ai_insights_schema import AIWeeklyInsights
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def make_pair(backend, tmp_path):
+    """Two cache instances that share storage, as two workers would"""
+    if backend == "memory":
+        cache = MemoryCache()
+        return cache, cache
+    if backend == "shm":
+        path = str(tmp_path / "cache.sqlite3")
+        return SharedMemoryCache(path), SharedMemoryCache(path)
+
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    return (
+        RedisCache(fakeredis.FakeAsyncRedis(server=server), local_ttl=5),
+        RedisCache(fakeredis.FakeAsyncRedis(server=server), local_ttl=5),
+    )
+
+
+async def started(*caches):
+    for cache in caches:
+        await cache.start()
+    # Let the Redis listeners subscribe before anything is published
+    await asyncio.sleep(0.05)
+
+
+async def closed(*caches):
+    for cache in {id(cache): cache for cache in caches}.values():
+        await cache.close()
+
+
+BACKENDS = ["memory", "shm", "redis"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_set_get_delete(backend, tmp_path):
+    async def scenario():
+        cache, _ = make_pair(backend, tmp_path)
+        await started(cache)
+        try:
+            insights = AIWeeklyInsights(summary="ok", key_patterns=["a"], suggestions=["b"])
+            await cache.set("ai:1:v1", {"insights": insights, "risk": "low"}, ttl=60)
+
+            value = await cache.get("ai:1:v1")
+            assert value == {"insights": insights, "risk": "low"}
+            assert isinstance(value["insights"], AIWeeklyInsights)
+
+            await cache.delete("ai:1:v1")
+            assert await cache.get("ai:1:v1") is None
+            assert await cache.get("missing") is None
+        finally:
+            await closed(cache)
+
+    run(scenario())
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_entries_expire(backend, tmp_path):
+    async def scenario():
+        cache, _ = make_pair(backend, tmp_path)
+        await started(cache)
+        try:
+            await cache.set("short", 1, ttl=0.05)
+            await cache.set("long", 2, ttl=60)
+            await asyncio.sleep(0.1)
+
+            assert await cache.get("short") is None
+            assert await cache.get("long") == 2
+        finally:
+            await closed(cache)
+
+    run(scenario())
+
+
+@pytest.mark.parametrize("backend", ["shm", "redis"])
+def test_delete_is_seen_by_other_instances(backend, tmp_path):
+    async def scenario():
+        writer, reader = make_pair(backend, tmp_path)
+        await started(writer, reader)
+        try:
+            await writer.set("summary:1", {"week": 1}, ttl=60)
+            assert await reader.get("summary:1") == {"week": 1}  # now in the reader's local copy
+
+            await writer.delete("summary:1")
+            deadline = time.monotonic() + 2
+            while await reader.get("summary:1") is not None and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+            assert await reader.get("summary:1") is None
+        finally:
+            await closed(writer, reader)
+
+    run(scenario())
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+    cache.set_raw("a", b"1", 60)
+    cache.set_raw("b", b"2", 60)
+    cache.get_raw("a")
+    cache.set_raw("c", b"3", 60)
+
+    assert cache.get_raw("b") is None
+    assert cache.get_raw("a") == b"1"
+    assert cache.get_raw("c") == b"3"
+
+
+def test_redis_backend_accepts_fakeredis_url(monkeypatch):
+    pytest.importorskip("fakeredis")
+    from app.core import redis as redis_module
+    from app.core.cache import create_cache
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "redis")
+    monkeypatch.setattr(settings, "REDIS_URL", "fakeredis://")
+    monkeypatch.setattr(redis_module, "_client", None)
+
+    async def scenario():
+        cache = create_cache()
+        assert isinstance(cache, RedisCache)
+        await cache.set("k", [1, 2], ttl=60)
+        assert await cache.get("k") == [1, 2]
+        await redis_module.close_redis()
+
+    run(scenario())
@@ -0,0 +1,101 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.routers import ai_chat_router
+from app.schemas.chat_schema import ChatRequest
+from app.services import chat_cache_service
+from app.services.chat_session_service import ChatSession
+
+FIRST = "How to improve sleep quality?"
+NEAR_DUPLICATE = "Any tips to improve sleep quality?"
+
+
+class StubAIService:
+    def __init__(self):
+        self.memories = []
+
+    def chat_about_health(self, user_message, context, memory):
+        self.memories.append(memory)
+        return f"reply to {user_message}"
+
+    def stream_chat_about_health(self, user_message, context, memory):
+        self.memories.append(memory)
+        yield f"reply to {user_message}"
+
+
+class StubWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(chat_cache_service, "_chat_cache", None)
+    monkeypatch.setattr(ai_chat_router.settings, "CHAT_CACHE_ENABLED", True)
+
+
+def test_rest_near_duplicate_is_a_hit_for_user_with_history(monkeypatch):
+    saved = []
+
+    async def save_message(db, user_id, role, content):
+        saved.append((role, content))
+
+    async def save_exchange(db, user_id, message, reply):
+        saved.extend([("user", message), ("assistant", reply)])
+
+    async def get_recent_messages(db, user_id):
+        return [SimpleNamespace(role="user", content="I slept badly"), SimpleNamespace(role="assistant", content="Sorry")]
+
+    monkeypatch.setattr(ai_chat_router, "save_message", save_message)
+    monkeypatch.setattr(ai_chat_router, "save_exchange", save_exchange)
+    monkeypatch.setattr(ai_chat_router, "get_recent_messages", get_recent_messages)
+    user = SimpleNamespace(id=1, full_name="Asha")
+    ai_service = StubAIService()
+
+    async def ask(message):
+        return await ai_chat_router.health_chat(
+            ChatRequest(message=message), db=None, current_user=user, ai_service=ai_service
+        )
+
+    first = asyncio.run(ask(FIRST))
+    second = asyncio.run(ask(NEAR_DUPLICATE))
+
+    assert first["confidence"] == "ai-assisted"
+    assert second == {"reply": first["reply"], "confidence": "ai-assisted (cached)"}
+    assert ai_service.memories == [""]
+    assert ("assistant", first["reply"]) in saved
+
+
+def test_websocket_near_duplicate_is_a_hit_for_session_with_history():
+    session = ChatSession(SimpleNamespace(id=2, full_name="Ravi"))
+    session.history.extend([("user", "I slept badly"), ("assistant", "Sorry to hear that")])
+    websocket = StubWebSocket()
+    ai_service = StubAIService()
+
+    async def scenario():
+        await ai_chat_router._answer(websocket, session, ai_service, FIRST)
+        await ai_chat_router._answer(websocket, session, ai_service, NEAR_DUPLICATE)
+
+    asyncio.run(scenario())
+
+    done = [frame for frame in websocket.sent if frame["type"] == "done"]
+    assert [frame["confidence"] for frame in done] == ["ai-assisted", "ai-assisted (cached)"]
+    assert done[1]["reply"] == done[0]["reply"]
+    assert ai_service.memories == [""]
+
+
+def test_conversational_follow_up_uses_memory_and_is_not_cached():
+    session = ChatSession(SimpleNamespace(id=3, full_name="Mei"))
+    session.history.extend([("user", "How to improve sleep quality?"), ("assistant", "Keep a schedule")])
+    memory = session.memory_text()
+    ai_service = StubAIService()
+
+    asyncio.run(ai_chat_router._answer(StubWebSocket(), session, ai_service, "Why?"))
+
+    assert ai_service.memories == [memory]
+    assert chat_cache_service.get_chat_cache().stats()["entries"] == 0
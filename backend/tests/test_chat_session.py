@@ -0,0 +1,63 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import chat_session_service
+from app.services.chat_session_service import AccountGone, ChatSession, SessionExpired
+
+USER = SimpleNamespace(id=7, full_name="Lee")
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Replaces the user lookup; records the looked-up ids"""
+    calls = SimpleNamespace(ids=[], active=True)
+
+    async def get_active_user(db, user_id):
+        calls.ids.append(user_id)
+        return USER if calls.active else None
+
+    class NoSession:
+        async def __aenter__(self):
+            return None
+
+        async def __aexit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(chat_session_service, "get_active_user", get_active_user)
+    monkeypatch.setattr(chat_session_service, "AsyncSessionLocal", NoSession)
+    return calls
+
+
+def test_account_checked_at_most_once_per_interval(lookups, monkeypatch):
+    monkeypatch.setattr(chat_session_service.settings, "CHAT_WS_ACCOUNT_CHECK_SECONDS", 30)
+    session = ChatSession(USER)
+
+    async def scenario():
+        for _ in range(5):
+            await session.ensure_active()
+        session._checked_at -= 31
+        await session.ensure_active()
+        await session.ensure_active()
+
+    asyncio.run(scenario())
+    assert lookups.ids == [USER.id]
+
+
+def test_deleted_account_is_detected(lookups):
+    session = ChatSession(USER)
+    session._checked_at -= 3600
+    lookups.active = False
+
+    with pytest.raises(AccountGone):
+        asyncio.run(session.ensure_active())
+
+
+def test_expired_token_closes_session_without_lookup(lookups):
+    session = ChatSession(USER, expires_at=time.time() - 1)
+
+    with pytest.raises(SessionExpired):
+        asyncio.run(session.ensure_active())
+    assert lookups.ids == []
@@ -0,0 +1,28 @@
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.diet_schema import DietUpdate
+from app.schemas.medication_schema import MedicationUpdate
+from app.schemas.symptom_schema import SymptomUpdate
+
+
+def test_omitted_fields_are_not_set():
+    update = DietUpdate(calories=300)
+
+    assert update.model_fields_set == {"calories"}
+    assert update.model_dump(exclude_unset=True) == {"calories": 300}
+
+
+def test_optional_fields_can_be_cleared():
+    assert DietUpdate(notes=None).model_dump(exclude_unset=True) == {"notes": None}
+
+
+@pytest.mark.parametrize("schema, field", [
+    (DietUpdate, "meal_type"),
+    (DietUpdate, "food_items"),
+    (SymptomUpdate, "symptom_name"),
+    (MedicationUpdate, "medicine_name"),
+])
+def test_required_fields_cannot_be_nulled(schema, field):
+    with pytest.raises(ValidationError):
+        schema(**{field: None})